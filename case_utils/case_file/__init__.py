@@ -33,6 +33,8 @@ import rdflib
 from cdo_local_uuid import local_uuid
 
 import case_utils.inherent_uuid
+from case_utils.file_compression import guess_format, open_file
+from case_utils.jsonld_serialization import serialize_jsonld
 from case_utils.namespace import (
     NS_RDF,
     NS_UCO_CORE,
@@ -283,12 +285,16 @@ def main() -> None:
         help="Use UUIDs computed using the case_utils.inherent_uuid module.",
     )
     parser.add_argument(
-        "--output-format", help="Override extension-based format guesser."
+        "--output-format",
+        help='Override extension-based format guesser.  An output graph of "-" is written to standard output, as Turtle unless this flag is given.',
     )
     parser.add_argument("out_graph")
     parser.add_argument("in_file")
     args = parser.parse_args()
 
+    if args.in_file == "-":
+        parser.error("Standard input cannot be described as a file.")
+
     logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
 
     cdo_local_uuid.configure()
@@ -305,14 +311,16 @@ def main() -> None:
 
     output_format = None
     if args.output_format is None:
-        output_format = rdflib.util.guess_format(args.out_graph)
+        output_format = guess_format(args.out_graph)
+        if output_format is None and args.out_graph == "-":
+            # This is rdflib's default serialization format.
+            output_format = "turtle"
     else:
         output_format = args.output_format
 
     serialize_kwargs: typing.Dict[str, typing.Any] = {"format": output_format}
     if output_format == "json-ld":
         context_dictionary = {k: v for (k, v) in graph.namespace_manager.namespaces()}
-        serialize_kwargs["context"] = context_dictionary
 
     node_iri = NS_BASE["File-" + local_uuid()]
     create_file_node(
@@ -325,7 +333,11 @@ def main() -> None:
         use_deterministic_uuids=args.use_deterministic_uuids,
     )
 
-    graph.serialize(args.out_graph, **serialize_kwargs)
+    if output_format == "json-ld":
+        serialize_jsonld(graph, args.out_graph, context_dictionary)
+    else:
+        with open_file(args.out_graph, "wb") as out_fh:
+            graph.serialize(out_fh, **serialize_kwargs)
 
 
 if __name__ == "__main__":
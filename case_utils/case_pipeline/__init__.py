@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This script runs a pipeline of SPARQL CONSTRUCT queries, SHACL validations, and SPARQL SELECT queries in one process.  Input graphs are loaded once, CONSTRUCT results are kept as in-memory graphs for later steps, and the ontology is prepared once for all validations, so graphs are only serialized when a step writes an output file.
+
+A pipeline is defined in a JSON file, or a YAML file (.yaml or .yml) if the PyYAML package is installed.  E.g.:
+
+{
+  "graphs": {
+    "evidence": ["evidence.json", "supplement.ttl"]
+  },
+  "validation": {
+    "allow_warnings": true
+  },
+  "steps": [
+    {"type": "construct", "graph": "evidence", "query": "enrich.sparql", "name": "enriched", "output": "enriched.ttl"},
+    {"type": "validate", "graph": "enriched", "output": "report.txt"},
+    {"type": "select", "graph": "enriched", "query": "files.sparql", "output": "files.csv"}
+  ]
+}
+
+Top-level keys:
+
+* graphs - Required.  Maps graph names to an input file path, or a list of input file paths to pool together.
+* steps - Required.  The steps, run in order.
+* built_version - The CASE ontology version, as with the --built-version flag of the other command line tools.  Default is most recent CASE release.
+* input_format - The RDF format of all input files, overriding the formats guessed from their file extensions.
+* validation - Keyword arguments of case_utils.case_validate.Validator, e.g. allow_warnings, inference, or supplemental_graphs.  case_version defaults to built_version.
+
+Step keys:
+
+* construct - graph, query, and name (the name of the constructed graph, for later steps) are required.  output and output_format are optional, as with case_sparql_construct.
+* validate - graph is required.  output (a report file) and format (as with case_validate's --format, excluding jsonl; default "human"), max_results, and max_results_per_shape are optional.
+* select - graph, query, and output are required.  output_format, disallow_empty_results, header, index, json_indent, json_orient, stream, and use_prefixes are optional, as with case_sparql_select.  Streamed steps, and steps writing JSON Lines, do not keep a data frame.
+
+Relative file paths are resolved against the directory of the pipeline file.  The exit status is 0 if every validation step's graph conforms, and 1 otherwise.  Every step runs regardless of earlier validation results.
+"""
+
+__version__ = "0.1.0"
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import sys
+import typing
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+import rdflib
+
+from case_utils.case_sparql_construct import graph_and_query_to_graph, write_graph
+from case_utils.case_sparql_select import (
+    STREAMING_OUTPUT_MODES,
+    data_frame_to_table_text,
+    graph_and_query_to_data_frame,
+    graph_and_query_to_records,
+    query_text_to_variables,
+    table_output_mode,
+    write_records,
+    write_table_text,
+)
+from case_utils.case_validate import Validator
+from case_utils.case_validate.validate_types import ValidationResult
+from case_utils.file_compression import open_file
+from case_utils.graph_loading import parse_graphs
+from case_utils.ontology.version_info import CURRENT_CASE_VERSION
+
+if typing.TYPE_CHECKING:
+    # pandas is only imported by select steps that build data frames.
+    import pandas as pd  # type: ignore
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+_TOP_LEVEL_KEYS = {"built_version", "graphs", "input_format", "steps", "validation"}
+
+# Step keys, by step type: required keys, then optional keys.
+_STEP_KEYS = {
+    "construct": ({"graph", "name", "query"}, {"output", "output_format"}),
+    "select": (
+        {"graph", "output", "query"},
+        {
+            "disallow_empty_results",
+            "header",
+            "index",
+            "json_indent",
+            "json_orient",
+            "output_format",
+            "stream",
+            "use_prefixes",
+        },
+    ),
+    "validate": (
+        {"graph"},
+        {"format", "max_results", "max_results_per_shape", "output"},
+    ),
+}
+
+
+class PipelineResult:
+    """
+    The results of the steps of a pipeline.  The graphs include the input graphs and the constructed graphs, by name.  The data frames are those of the select steps that were not streamed, and the validation results are those of the validate steps, in step order.
+    """
+
+    def __init__(self) -> None:
+        self.graphs: Dict[str, rdflib.Graph] = dict()
+        self.data_frames: List[pd.DataFrame] = []
+        self.validation_results: List[ValidationResult] = []
+
+    @property
+    def conforms(self) -> bool:
+        return all(x.conforms for x in self.validation_results)
+
+
+def load_pipeline(filename: str) -> Dict[str, Any]:
+    """
+    :param filename: A JSON file, or a YAML file (.yaml or .yml), defining a pipeline.
+    :return: The pipeline definition.
+    """
+    with open(filename, "r") as in_fh:
+        if filename.endswith((".yaml", ".yml")):
+            try:
+                yaml = importlib.import_module("yaml")
+            except ImportError:
+                raise ImportError(
+                    "Reading YAML pipeline definition %r requires the PyYAML package."
+                    % filename
+                )
+            definition = yaml.safe_load(in_fh)
+        else:
+            definition = json.load(in_fh)
+    if not isinstance(definition, dict):
+        raise ValueError("Expected pipeline definition %r to be a map." % filename)
+    return definition
+
+
+def _check_pipeline(definition: Mapping[str, Any]) -> None:
+    """
+    Check the keys of the pipeline definition, and the graphs its steps use, so a mistake is found before any step runs.
+
+    :raises ValueError: If the definition is not runnable.
+    """
+    unrecognized_keys = set(definition.keys()) - _TOP_LEVEL_KEYS
+    if len(unrecognized_keys) > 0:
+        raise ValueError(
+            "Unrecognized pipeline keys: %s." % ", ".join(sorted(unrecognized_keys))
+        )
+    for key in ["graphs", "steps"]:
+        if key not in definition:
+            raise ValueError("Pipeline definition requires %r." % key)
+
+    graph_names: Set[str] = set(definition["graphs"].keys())
+    for step_no, step in enumerate(definition["steps"]):
+        step_type = step.get("type")
+        if step_type not in _STEP_KEYS:
+            raise ValueError(
+                "Step %d: Expected type construct, select, or validate, received %r."
+                % (step_no, step_type)
+            )
+        (required_keys, optional_keys) = _STEP_KEYS[step_type]
+        missing_keys = required_keys - set(step.keys())
+        if len(missing_keys) > 0:
+            raise ValueError(
+                "Step %d: Missing keys: %s."
+                % (step_no, ", ".join(sorted(missing_keys)))
+            )
+        unrecognized_keys = set(step.keys()) - required_keys - optional_keys - {"type"}
+        if len(unrecognized_keys) > 0:
+            raise ValueError(
+                "Step %d: Unrecognized keys: %s."
+                % (step_no, ", ".join(sorted(unrecognized_keys)))
+            )
+        if step["graph"] not in graph_names:
+            raise ValueError("Step %d: Unknown graph %r." % (step_no, step["graph"]))
+        if step_type == "construct":
+            if step["name"] in graph_names:
+                raise ValueError(
+                    "Step %d: Graph %r already exists." % (step_no, step["name"])
+                )
+            graph_names.add(step["name"])
+        elif step_type == "select":
+            output_mode = step.get("output_format") or table_output_mode(step["output"])
+            if step.get("stream") and output_mode not in STREAMING_OUTPUT_MODES:
+                raise ValueError(
+                    "Step %d: Streaming requires CSV, TSV, or JSON Lines output."
+                    % step_no
+                )
+        elif step_type == "validate":
+            if step.get("format") == "jsonl":
+                raise ValueError(
+                    "Step %d: The jsonl format is not supported in pipelines." % step_no
+                )
+
+
+def _write_report(
+    validation_result: ValidationResult, output: str, report_format: str
+) -> None:
+    """
+    Write the validation report, as case_validate does without streaming or summarizing.
+    """
+    if report_format == "human":
+        with open_file(output, "w") as out_fh:
+            out_fh.write(validation_result.text)
+        return
+
+    validation_graph = validation_result.graph
+    if isinstance(validation_graph, rdflib.Graph):
+        with open_file(output, "wb") as out_fh:
+            validation_graph.serialize(out_fh, format=report_format)
+    elif isinstance(validation_graph, bytes):
+        with open_file(output, "wb") as out_fh:
+            out_fh.write(validation_graph)
+    elif isinstance(validation_graph, str):
+        with open_file(output, "w") as out_fh:
+            out_fh.write(validation_graph)
+    else:
+        raise NotImplementedError(
+            "Unexpected result type returned from validate: %r."
+            % type(validation_graph)
+        )
+
+
+def run_pipeline(
+    definition: Mapping[str, Any], *args: Any, base_dir: Optional[str] = None
+) -> PipelineResult:
+    """
+    Run the steps of a pipeline.
+
+    :param definition: The pipeline definition, as described in this module's documentation, e.g. as returned by load_pipeline.
+    :param base_dir: The directory against which relative file paths in the definition are resolved.  Default is the current working directory.
+    :return: The graphs, data frames, and validation results of the pipeline.
+    """
+    _check_pipeline(definition)
+
+    def _path(filename: str) -> str:
+        if base_dir is None or filename == "-":
+            return filename
+        return os.path.join(base_dir, filename)
+
+    built_version: str = definition.get("built_version", "case-" + CURRENT_CASE_VERSION)
+    input_format: Optional[str] = definition.get("input_format")
+
+    pipeline_result = PipelineResult()
+    for graph_name, filenames in definition["graphs"].items():
+        if isinstance(filenames, str):
+            filenames = [filenames]
+        _logger.debug("Loading graph %r.", graph_name)
+        pipeline_result.graphs[graph_name] = parse_graphs(
+            rdflib.Graph(), [_path(x) for x in filenames], format=input_format
+        )
+
+    # The ontology is prepared on the first validation step, and reused
+    # by the others.
+    validator: Optional[Validator] = None
+
+    for step_no, step in enumerate(definition["steps"]):
+        _logger.debug(
+            "Running step %d, %s of graph %r.", step_no, step["type"], step["graph"]
+        )
+        graph = pipeline_result.graphs[step["graph"]]
+
+        if step["type"] == "construct":
+            with open(_path(step["query"]), "r") as in_fh:
+                construct_query_text = in_fh.read().strip()
+            out_graph = graph_and_query_to_graph(
+                graph, construct_query_text, built_version=built_version
+            )
+            pipeline_result.graphs[step["name"]] = out_graph
+            if "output" in step:
+                write_graph(out_graph, _path(step["output"]), step.get("output_format"))
+
+        elif step["type"] == "select":
+            with open(_path(step["query"]), "r") as in_fh:
+                select_query_text = in_fh.read().strip()
+            output_mode = step.get("output_format") or table_output_mode(step["output"])
+            if step.get("stream") or output_mode == "jsonl":
+                records = graph_and_query_to_records(
+                    graph,
+                    select_query_text,
+                    built_version=built_version,
+                    disallow_empty_results=step.get("disallow_empty_results", False),
+                    use_prefixes=step.get("use_prefixes", False),
+                )
+                write_records(
+                    query_text_to_variables(select_query_text),
+                    records,
+                    _path(step["output"]),
+                    output_mode=output_mode,
+                    use_header=step.get("header", True),
+                    use_index=step.get("index", True),
+                )
+            else:
+                df = graph_and_query_to_data_frame(
+                    graph,
+                    select_query_text,
+                    built_version=built_version,
+                    disallow_empty_results=step.get("disallow_empty_results", False),
+                    use_prefixes=step.get("use_prefixes", False),
+                )
+                pipeline_result.data_frames.append(df)
+                table_text = data_frame_to_table_text(
+                    df,
+                    json_indent=step.get("json_indent"),
+                    json_orient=step.get("json_orient", "columns"),
+                    output_mode=output_mode,
+                    use_header=step.get("header", True),
+                    use_index=step.get("index", True),
+                )
+                write_table_text(table_text, _path(step["output"]))
+
+        elif step["type"] == "validate":
+            if validator is None:
+                validator_kwargs: Dict[str, Any] = dict(
+                    definition.get("validation", dict())
+                )
+                validator_kwargs.setdefault("case_version", built_version)
+                if "supplemental_graphs" in validator_kwargs:
+                    validator_kwargs["supplemental_graphs"] = [
+                        _path(x) for x in validator_kwargs["supplemental_graphs"]
+                    ]
+                validator = Validator(**validator_kwargs)
+            validation_result = validator.validate(
+                graph,
+                max_results=step.get("max_results"),
+                max_results_per_shape=step.get("max_results_per_shape"),
+            )
+            pipeline_result.validation_results.append(validation_result)
+            _logger.debug(
+                "Step %d: Graph %r conforms: %r.",
+                step_no,
+                step["graph"],
+                validation_result.conforms,
+            )
+            if "output" in step:
+                _write_report(
+                    validation_result,
+                    _path(step["output"]),
+                    step.get("format", "human"),
+                )
+
+    return pipeline_result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+
+    # Configure debug logging before running parse_args, because there could be an error raised before the construction of the argument parser.
+    logging.basicConfig(
+        level=logging.DEBUG
+        if ("--debug" in sys.argv or "-d" in sys.argv)
+        else logging.INFO
+    )
+
+    parser.add_argument("-d", "--debug", action="store_true")
+    parser.add_argument(
+        "in_pipeline",
+        help="Pipeline definition file, in JSON, or in YAML (.yaml or .yml) if the PyYAML package is installed.  Relative file paths in the definition are resolved against the directory of this file.",
+    )
+    args = parser.parse_args()
+
+    definition = load_pipeline(args.in_pipeline)
+    pipeline_result = run_pipeline(
+        definition, base_dir=os.path.dirname(os.path.abspath(args.in_pipeline))
+    )
+
+    sys.exit(0 if pipeline_result.conforms else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,10 @@ import typing
 import rdflib.plugins.sparql
 
 import case_utils.ontology
+import case_utils.query_rewriting
+from case_utils.file_compression import guess_format, open_file
+from case_utils.graph_loading import parse_graphs
+from case_utils.jsonld_serialization import serialize_jsonld
 from case_utils.ontology.version_info import (
     CURRENT_CASE_VERSION,
     built_version_choices_list,
@@ -37,6 +41,77 @@ from case_utils.ontology.version_info import (
 _logger = logging.getLogger(os.path.basename(__file__))
 
 
+def graph_and_query_to_graph(
+    graph: rdflib.Graph,
+    construct_query_text: str,
+    *args: typing.Any,
+    built_version: str = "case-" + CURRENT_CASE_VERSION,
+    **kwargs: typing.Any,
+) -> rdflib.Graph:
+    """
+    :param graph: The graph to query.  It is not modified.
+    :param construct_query_text: The text of a SPARQL CONSTRUCT query.  Prefixes not mapped with a PREFIX statement are mapped according to the graph's prefixes.
+    :param built_version: The CASE ontology version whose subclass hierarchy supplements the graph, if the query mentions rdfs:subClassOf.
+    :return: A new graph of the constructed triples, with the prefixes of the queried graph.
+    """
+    out_graph = rdflib.Graph()
+
+    # Inherit prefixes defined in input context dictionary.
+    nsdict = {k: v for (k, v) in graph.namespace_manager.namespaces()}
+    for prefix in sorted(nsdict.keys()):
+        out_graph.bind(prefix, nsdict[prefix])
+
+    # Avoid side-effects on input parameter.
+    if "subClassOf" in construct_query_text:
+        _graph = case_utils.ontology.subclass_hierarchy_view(
+            graph, built_version=built_version
+        )
+    else:
+        _graph = graph
+
+    construct_query_object = rdflib.plugins.sparql.processor.prepareQuery(
+        construct_query_text, initNs=nsdict
+    )
+    if "subClassOf" in construct_query_text:
+        case_utils.query_rewriting.rewrite_subclass_paths(
+            construct_query_object, graph, built_version=built_version
+        )
+
+    # https://rdfextras.readthedocs.io/en/latest/working_with.html
+    construct_query_result = _graph.query(construct_query_object)
+    _logger.debug("type(construct_query_result) = %r." % type(construct_query_result))
+    _logger.debug("len(construct_query_result) = %d." % len(construct_query_result))
+    for row_no, row in enumerate(construct_query_result):
+        assert isinstance(row, tuple)
+        if row_no == 0:
+            _logger.debug("row[0] = %r." % (row,))
+        out_graph.add((row[0], row[1], row[2]))
+
+    return out_graph
+
+
+def write_graph(
+    graph: rdflib.Graph, out_graph: str, output_format: typing.Optional[str] = None
+) -> None:
+    """
+    :param out_graph: The output file path, which can have a compression extension (see case_utils.file_compression), or "-" for standard output.
+    :param output_format: The RDF format to write.  If None, the format is guessed from the file extension, and standard output is written as Turtle.
+    """
+    if output_format is None:
+        output_format = guess_format(out_graph)
+        if output_format is None and out_graph == "-":
+            # This is rdflib's default serialization format.
+            output_format = "turtle"
+
+    if output_format == "json-ld":
+        context_dictionary = {k: v for (k, v) in graph.namespace_manager.namespaces()}
+        serialize_jsonld(graph, out_graph, context_dictionary)
+    else:
+        with open_file(out_graph, "wb") as out_fh:
+            serialize_kwargs: typing.Dict[str, typing.Any] = {"format": output_format}
+            graph.serialize(out_fh, **serialize_kwargs)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
 
@@ -60,7 +135,12 @@ def main() -> None:
         help="Raise error if no results are returned for query.",
     )
     parser.add_argument(
-        "--output-format", help="Override extension-based format guesser."
+        "--input-format",
+        help='Override extension-based format guesser for input graphs.  An input graph of "-" is read from standard input, as Turtle (which includes N-Triples) unless this flag is given.',
+    )
+    parser.add_argument(
+        "--output-format",
+        help='Override extension-based format guesser.  An output graph of "-" is written to standard output, as Turtle unless this flag is given.',
     )
     parser.add_argument("out_graph")
     parser.add_argument(
@@ -70,17 +150,11 @@ def main() -> None:
     parser.add_argument("in_graph", nargs="+")
     args = parser.parse_args()
 
-    in_graph = rdflib.Graph()
-    for in_graph_filename in args.in_graph:
-        in_graph.parse(in_graph_filename)
-        _logger.debug("len(in_graph) = %d.", len(in_graph))
-
-    out_graph = rdflib.Graph()
+    if args.in_graph.count("-") > 1:
+        parser.error("Standard input can only be read once.")
 
-    # Inherit prefixes defined in input context dictionary.
-    nsdict = {k: v for (k, v) in in_graph.namespace_manager.namespaces()}
-    for prefix in sorted(nsdict.keys()):
-        out_graph.bind(prefix, nsdict[prefix])
+    in_graph = parse_graphs(rdflib.Graph(), args.in_graph, format=args.input_format)
+    _logger.debug("len(in_graph) = %d.", len(in_graph))
 
     _logger.debug("Running query in %r." % args.in_sparql)
     construct_query_text = None
@@ -88,39 +162,11 @@ def main() -> None:
         construct_query_text = in_fh.read().strip()
     assert construct_query_text is not None
 
-    if "subClassOf" in construct_query_text:
-        case_utils.ontology.load_subclass_hierarchy(
-            in_graph, built_version=args.built_version
-        )
-
-    construct_query_object = rdflib.plugins.sparql.processor.prepareQuery(
-        construct_query_text, initNs=nsdict
+    out_graph = graph_and_query_to_graph(
+        in_graph, construct_query_text, built_version=args.built_version
     )
 
-    # https://rdfextras.readthedocs.io/en/latest/working_with.html
-    construct_query_result = in_graph.query(construct_query_object)
-    _logger.debug("type(construct_query_result) = %r." % type(construct_query_result))
-    _logger.debug("len(construct_query_result) = %d." % len(construct_query_result))
-    for row_no, row in enumerate(construct_query_result):
-        assert isinstance(row, tuple)
-        if row_no == 0:
-            _logger.debug("row[0] = %r." % (row,))
-        out_graph.add((row[0], row[1], row[2]))
-
-    output_format = None
-    if args.output_format is None:
-        output_format = rdflib.util.guess_format(args.out_graph)
-    else:
-        output_format = args.output_format
-
-    serialize_kwargs: typing.Dict[str, typing.Any] = {"format": output_format}
-    if output_format == "json-ld":
-        context_dictionary = {
-            k: v for (k, v) in out_graph.namespace_manager.namespaces()
-        }
-        serialize_kwargs["context"] = context_dictionary
-
-    out_graph.serialize(args.out_graph, **serialize_kwargs)
+    write_graph(out_graph, args.out_graph, args.output_format)
 
 
 if __name__ == "__main__":
@@ -33,24 +33,38 @@ __version__ = "0.5.2"
 
 import argparse
 import binascii
+import csv
+import itertools
+import json
 import logging
 import os
 import sys
 import typing
 
-import pandas as pd  # type: ignore
 import rdflib.plugins.sparql
+from rdflib.plugins.stores.memory import Memory
 
 import case_utils.ontology
+import case_utils.query_rewriting
+from case_utils.file_compression import open_file, uncompressed_name
+from case_utils.graph_loading import parse_graphs
 from case_utils.ontology.version_info import (
     CURRENT_CASE_VERSION,
     built_version_choices_list,
 )
 
+if typing.TYPE_CHECKING:
+    # pandas is only imported to build data frames, so streamed tables
+    # are written without it.
+    import pandas as pd  # type: ignore
+
 NS_XSD = rdflib.XSD
 
 _logger = logging.getLogger(os.path.basename(__file__))
 
+# Output modes that can be written one row at a time.
+STREAMING_OUTPUT_MODES = {"csv", "jsonl", "tsv"}
+
 
 def query_text_to_variables(select_query_text: str) -> typing.List[str]:
     # Build columns list from SELECT line.
@@ -62,7 +76,30 @@ def query_text_to_variables(select_query_text: str) -> typing.List[str]:
     return variables
 
 
-def graph_and_query_to_data_frame(
+def _result_rows(
+    graph: rdflib.Graph, query: rdflib.plugins.sparql.sparql.Query
+) -> typing.Iterator[rdflib.query.ResultRow]:
+    """
+    :return: The rows of the results of a SELECT query against the graph, as they are found.  For graphs in memory, unlike iterating over the result of Graph.query, this does not retain the rows.
+    """
+    if not isinstance(graph.store, Memory):
+        # Other stores might answer queries themselves.
+        for row in graph.query(query):
+            assert isinstance(row, rdflib.query.ResultRow)
+            yield row
+        return
+
+    # The in-memory store does not answer queries itself, so this is
+    # the evaluation Graph.query would run.
+    result = rdflib.plugins.sparql.evaluate.evalQuery(graph, query)
+    variables = result["vars_"]
+    for bindings in result["bindings"]:
+        # rdflib does not report empty bindings as rows.
+        if bindings:
+            yield rdflib.query.ResultRow(bindings, variables)
+
+
+def graph_and_query_to_records(
     graph: rdflib.Graph,
     select_query_text: str,
     *args: typing.Any,
@@ -70,27 +107,32 @@ def graph_and_query_to_data_frame(
     disallow_empty_results: bool = False,
     use_prefixes: bool = False,
     **kwargs: typing.Any,
-) -> pd.DataFrame:
+) -> typing.Iterator[typing.List[typing.Any]]:
+    """
+    Run the query, yielding the table values of each result row as it is found.  See graph_and_query_to_data_frame for the parameters.
+
+    :raises ValueError: If disallow_empty_results is True and there are no result rows, when the iterator is exhausted.
+    """
     # Inherit prefixes defined in input context dictionary.
     nsdict = {k: v for (k, v) in graph.namespace_manager.namespaces()}
 
     # Avoid side-effects on input parameter.
     if "subClassOf" in select_query_text:
-        _graph = rdflib.Graph()
-        _graph += graph
-        case_utils.ontology.load_subclass_hierarchy(_graph, built_version=built_version)
+        _graph = case_utils.ontology.subclass_hierarchy_view(
+            graph, built_version=built_version
+        )
     else:
         _graph = graph
 
-    variables = query_text_to_variables(select_query_text)
-
     tally = 0
-    records = []
     select_query_object = rdflib.plugins.sparql.processor.prepareQuery(
         select_query_text, initNs=nsdict
     )
-    for row_no, row in enumerate(_graph.query(select_query_object)):
-        assert isinstance(row, rdflib.query.ResultRow)
+    if "subClassOf" in select_query_text:
+        case_utils.query_rewriting.rewrite_subclass_paths(
+            select_query_object, graph, built_version=built_version
+        )
+    for row_no, row in enumerate(_result_rows(_graph, select_query_object)):
         tally = row_no + 1
         record = []
         for column_no, column in enumerate(row):
@@ -114,18 +156,42 @@ def graph_and_query_to_data_frame(
             if row_no == 0:
                 _logger.debug("row[0]column[%d] = %r." % (column_no, column_value))
             record.append(column_value)
-        records.append(record)
+        yield record
 
     if tally == 0:
         if disallow_empty_results:
             raise ValueError("Failed to return any results.")
 
+
+def graph_and_query_to_data_frame(
+    graph: rdflib.Graph,
+    select_query_text: str,
+    *args: typing.Any,
+    built_version: str = "case-" + CURRENT_CASE_VERSION,
+    disallow_empty_results: bool = False,
+    use_prefixes: bool = False,
+    **kwargs: typing.Any,
+) -> "pd.DataFrame":
+    import pandas as pd
+
+    variables = query_text_to_variables(select_query_text)
+
+    records = list(
+        graph_and_query_to_records(
+            graph,
+            select_query_text,
+            built_version=built_version,
+            disallow_empty_results=disallow_empty_results,
+            use_prefixes=use_prefixes,
+        )
+    )
+
     df = pd.DataFrame(records, columns=variables)
     return df
 
 
 def data_frame_to_table_text(
-    df: pd.DataFrame,
+    df: "pd.DataFrame",
     *args: typing.Any,
     json_indent: typing.Optional[int] = None,
     json_orient: str,
@@ -192,6 +258,104 @@ def data_frame_to_table_text(
     return table_text
 
 
+def _json_default(value: typing.Any) -> typing.Any:
+    """
+    :return: A JSON value for a table value the json module cannot encode, e.g. a date or decimal.
+    """
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def write_records(
+    variables: typing.List[str],
+    records: typing.Iterable[typing.List[typing.Any]],
+    out_table: str,
+    *args: typing.Any,
+    output_mode: str,
+    use_header: bool,
+    use_index: bool,
+    **kwargs: typing.Any,
+) -> None:
+    """
+    Write a table one row at a time, without building it in memory.
+
+    CSV and TSV tables are written as data_frame_to_table_text renders them.  JSON Lines tables have one JSON object per row, mapping each variable to its value, as with pandas' "records" JSON orientation; use_header and use_index do not apply to them.
+
+    :param variables: The column labels, e.g. from query_text_to_variables.
+    :param records: The values of each row, e.g. from graph_and_query_to_records.  The first row is read before the output file is opened, so an error running the query leaves no output file.
+    :param out_table: The output table file path, which can have a compression extension (see case_utils.file_compression), or "-" for standard output.
+    :param output_mode: One of STREAMING_OUTPUT_MODES.
+    """
+    if output_mode not in STREAMING_OUTPUT_MODES:
+        raise NotImplementedError(
+            "Unimplemented streaming output mode: %r." % output_mode
+        )
+
+    record_iterator = iter(records)
+    first_record = next(record_iterator, None)
+
+    with open_file(out_table, "w") as out_fh:
+        if first_record is None:
+            record_iterator = iter([])
+        else:
+            record_iterator = itertools.chain([first_record], record_iterator)
+
+        if output_mode == "jsonl":
+            for record in record_iterator:
+                out_fh.write(
+                    json.dumps(
+                        dict(zip(variables, record)),
+                        default=_json_default,
+                        ensure_ascii=False,
+                    )
+                )
+                out_fh.write("\n")
+            return
+
+        writer = csv.writer(
+            out_fh,
+            delimiter="," if output_mode == "csv" else "\t",
+            lineterminator="\n",
+        )
+        if use_header:
+            writer.writerow(([""] if use_index else []) + variables)
+        for row_no, record in enumerate(record_iterator):
+            writer.writerow(([row_no] if use_index else []) + record)
+
+
+def table_output_mode(out_table: str) -> str:
+    """
+    :param out_table: The output table file path, which can have a compression extension (see case_utils.file_compression).
+    :return: The output mode of data_frame_to_table_text or write_records, from the file extension.
+    """
+    out_table_name = uncompressed_name(out_table)
+    if out_table_name.endswith(".csv"):
+        return "csv"
+    elif out_table_name.endswith(".html"):
+        return "html"
+    elif out_table_name.endswith(".json"):
+        return "json"
+    elif out_table_name.endswith(".jsonl"):
+        return "jsonl"
+    elif out_table_name.endswith(".md"):
+        return "md"
+    elif out_table_name.endswith(".tsv"):
+        return "tsv"
+    raise NotImplementedError("Output file extension not implemented.")
+
+
+def write_table_text(table_text: str, out_table: str) -> None:
+    """
+    :param out_table: The output table file path, which can have a compression extension (see case_utils.file_compression), or "-" for standard output.
+    """
+    with open_file(out_table, "w") as out_fh:
+        out_fh.write(table_text)
+        if table_text[-1] != "\n":
+            # End file with newline.  CSV and TSV modes end with a built-in newline.
+            out_fh.write("\n")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
 
@@ -214,6 +378,10 @@ def main() -> None:
         action="store_true",
         help="Raise error if no results are returned for query.",
     )
+    parser.add_argument(
+        "--input-format",
+        help='Override extension-based format guesser for input graphs.  An input graph of "-" is read from standard input, as Turtle (which includes N-Triples) unless this flag is given.',
+    )
     parser.add_argument(
         "--json-indent",
         type=int,
@@ -230,9 +398,19 @@ def main() -> None:
         action="store_true",
         help="Abbreviate node IDs according to graph's encoded prefixes.  (This will use prefixes in the graph, not the query.)",
     )
+    parser.add_argument(
+        "--output-format",
+        choices=("csv", "html", "json", "jsonl", "md", "tsv"),
+        help='Override extension-based output format determination.  Required if the output table is "-", which is written to standard output.',
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write each result row as soon as it is found, rather than building the whole table in memory.  Requires CSV, TSV, or JSON Lines output.  (JSON Lines output is always streamed.)",
+    )
     parser.add_argument(
         "out_table",
-        help="Expected extensions are .html for HTML tables, .json for JSON tables, .md for Markdown tables, .csv for comma-separated values, and .tsv for tab-separated values.  Note that JSON is a Pandas output JSON format (chosen by '--json-orient'), and not JSON-LD.",
+        help="Expected extensions are .html for HTML tables, .json for JSON tables, .jsonl for JSON Lines (one JSON object per row), .md for Markdown tables, .csv for comma-separated values, and .tsv for tab-separated values.  Note that JSON is a Pandas output JSON format (chosen by '--json-orient'), and not JSON-LD.  A compression extension (.bz2, .gz, .xz, or .zst) can follow, to compress the table.  \"-\" writes the table to standard output, in the format given by --output-format.",
     )
     parser.add_argument(
         "in_sparql",
@@ -266,23 +444,20 @@ def main() -> None:
     parser.add_argument("in_graph", nargs="+")
     args = parser.parse_args()
 
+    if args.in_graph.count("-") > 1:
+        parser.error("Standard input can only be read once.")
+
     output_mode: str
-    if args.out_table.endswith(".csv"):
-        output_mode = "csv"
-    elif args.out_table.endswith(".html"):
-        output_mode = "html"
-    elif args.out_table.endswith(".json"):
-        output_mode = "json"
-    elif args.out_table.endswith(".md"):
-        output_mode = "md"
-    elif args.out_table.endswith(".tsv"):
-        output_mode = "tsv"
+    if args.output_format is not None:
+        output_mode = args.output_format
+    elif args.out_table == "-":
+        parser.error("Writing to standard output requires --output-format.")
     else:
-        raise NotImplementedError("Output file extension not implemented.")
+        output_mode = table_output_mode(args.out_table)
+    if args.stream and output_mode not in STREAMING_OUTPUT_MODES:
+        parser.error("--stream requires CSV, TSV, or JSON Lines output.")
 
-    graph = rdflib.Graph()
-    for in_graph_filename in args.in_graph:
-        graph.parse(in_graph_filename)
+    graph = parse_graphs(rdflib.Graph(), args.in_graph, format=args.input_format)
 
     select_query_text: typing.Optional[str] = None
     with open(args.in_sparql, "r") as in_fh:
@@ -318,6 +493,24 @@ def main() -> None:
             "For JSON output, --no-index flag requires --json-orient to be either 'split' or 'table'."
         )
 
+    if args.stream or output_mode == "jsonl":
+        records = graph_and_query_to_records(
+            graph,
+            select_query_text,
+            built_version=args.built_version,
+            disallow_empty_results=args.disallow_empty_results is True,
+            use_prefixes=args.use_prefixes is True,
+        )
+        write_records(
+            query_text_to_variables(select_query_text),
+            records,
+            args.out_table,
+            output_mode=output_mode,
+            use_header=use_header,
+            use_index=use_index,
+        )
+        return
+
     df = graph_and_query_to_data_frame(
         graph,
         select_query_text,
@@ -334,11 +527,7 @@ def main() -> None:
         use_header=use_header,
         use_index=use_index,
     )
-    with open(args.out_table, "w") as out_fh:
-        out_fh.write(table_text)
-        if table_text[-1] != "\n":
-            # End file with newline.  CSV and TSV modes end with a built-in newline.
-            out_fh.write("\n")
+    write_table_text(table_text, args.out_table)
 
 
 if __name__ == "__main__":
@@ -35,25 +35,73 @@ details.)
 __version__ = "0.5.0"
 
 import argparse
+import concurrent.futures
+import contextlib
+import json
 import logging
+import multiprocessing
 import os
 import sys
+import threading
 import warnings
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple, Union
 
 import pyshacl  # type: ignore
+import pyshacl.shapes_graph
 import rdflib
 from rdflib import Graph
 
+import case_utils.file_compression
+from case_utils.case_validate.validate_cache import (
+    DEFAULT_MAX_SIZE,
+    ValidationCache,
+    get_cache_key,
+)
+from case_utils.case_validate.validate_comparison import VersionComparison
+from case_utils.case_validate.validate_hooks import shape_validation_hook
+from case_utils.case_validate.validate_limits import ResultLimiter, result_limits
+from case_utils.case_validate.validate_precheck import constraint_prechecks
+from case_utils.case_validate.validate_profiling import (
+    shape_profiling,
+    sort_shape_profiles,
+    write_shape_profiles,
+)
+from case_utils.case_validate.validate_rdfs import RDFSClosure
+from case_utils.case_validate.validate_reporting import (
+    JSONLinesResultWriter,
+    NTriplesResultWriter,
+    ResultSummarizer,
+    ResultWriter,
+    result_streaming,
+    write_report_results,
+)
+from case_utils.case_validate.validate_sampling import (
+    FocusNodeSampler,
+    shape_samples_to_text,
+    sort_shape_samples,
+)
+from case_utils.case_validate.validate_store import disk_backed_graph
 from case_utils.case_validate.validate_types import (
     NonExistentCDOConceptWarning,
+    ShapeProfile,
+    ShapeSample,
     ValidationResult,
 )
 from case_utils.case_validate.validate_utils import (
     disable_tbox_review,
-    get_invalid_cdo_concepts,
+    get_bundled_superclass_closure_table,
+    get_cdo_concepts,
+    get_class_hierarchy_graph,
+    get_data_cdo_concepts,
     get_ontology_graph,
+    get_pruned_shapes_graph,
+    get_shapes_graph,
+    get_superclass_closure_table,
+    materialize_type_closure,
+    normalize_case_version,
 )
+from case_utils.graph_loading import parse_graph, parse_graphs
+from case_utils.namespace import NS_RDF, NS_RDFS
 from case_utils.ontology.version_info import (
     CURRENT_CASE_VERSION,
     built_version_choices_list,
@@ -62,94 +110,809 @@ from case_utils.ontology.version_info import (
 _logger = logging.getLogger(os.path.basename(__file__))
 
 
+class Validator:
+    """
+    This class prepares the ontology graph, the shapes graph, and the CDO concept index of a CASE version and supplemental graphs once, so that many data graphs can be validated against them.
+
+    The prepared graphs are not modified after construction, so the validate method can be called repeatedly, and from multiple threads at once.  Each call loads its own data graph, and any validation hooks a call activates (e.g. for profile_shapes or max_results) only observe that call.
+
+    :param *args: The positional arguments to pass to the underlying pyshacl.validate function.
+    :param case_version: See validate.
+    :param data_store_dir: See validate.
+    :param input_format: See validate.
+    :param materialize_types: See validate.
+    :param native_rdfs: See validate.
+    :param precheck_constraints: See validate.
+    :param prune_shapes: See validate.
+    :param review_tbox: See validate.
+    :param supplemental_graphs: See validate.
+    :param **kwargs: The keyword arguments to pass to the underlying pyshacl.validate function, e.g. allow_warnings or inference.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        case_version: Optional[str] = None,
+        data_store_dir: Optional[str] = None,
+        input_format: Optional[str] = None,
+        materialize_types: bool = False,
+        native_rdfs: bool = False,
+        precheck_constraints: bool = False,
+        prune_shapes: bool = False,
+        review_tbox: bool = False,
+        supplemental_graphs: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._args = args
+        self.data_store_dir = data_store_dir
+        self.input_format = input_format
+        self._kwargs = kwargs
+        self.precheck_constraints = precheck_constraints
+        self.prune_shapes = prune_shapes
+        self.review_tbox = review_tbox
+
+        # Get the ontology graph from the case_version and supplemental_graphs arguments
+        # Unless the TBox is under review, the bundled ontology is loaded
+        # from its ABox-only variant, which omits the TBox-review shapes.
+        self.ontology_graph: Graph = get_ontology_graph(
+            case_version, supplemental_graphs, abox_only=not review_tbox
+        )
+
+        if not review_tbox:
+            # This is done because, at the time of pyshacl 0.20.0, the
+            # entirety of the ontology graph is mixed into the data graph.
+            # UCO 1.0.0 includes some mechanisms to cross-check SHACL
+            # PropertyShapes versus OWL property definitions.  Because of
+            # the mix-in, all of the ontology graph (.validate ont_graph
+            # kwarg) is reviewed by the SHACL graph (.validate shacl_graph
+            # kwarg), so for UCO 1.0.0 that adds around 30 seconds to each
+            # case_validate call, redundantly reviewing UCO.  The bundled
+            # ABox-only variants omit those shapes, but supplemental graphs
+            # (e.g. UCO itself, with case_version "none") can include them.
+            disable_tbox_review(self.ontology_graph)
+
+        self._cdo_concepts: FrozenSet[rdflib.URIRef] = frozenset(
+            get_cdo_concepts(self.ontology_graph)
+        )
+
+        # pySHACL mixes the entirety of the ontology graph (.validate
+        # ont_graph kwarg) into a copy of the data graph.  Unless the TBox
+        # is under review, or OWL inferencing needs the full set of axioms,
+        # only the class hierarchy and concept typing are needed for that
+        # mix-in, and only the shapes are needed for the SHACL graph.
+        self._mix_in_graph: Graph
+        self._shapes_graph: Graph
+        if review_tbox or kwargs.get("inference") not in {None, "none"}:
+            self._mix_in_graph = self.ontology_graph
+            self._shapes_graph = self.ontology_graph
+        else:
+            self._mix_in_graph = get_class_hierarchy_graph(self.ontology_graph)
+            self._shapes_graph = get_shapes_graph(self.ontology_graph)
+            _logger.debug(
+                "Partitioned %d-triple ontology graph into %d-triple class hierarchy graph and %d-triple shapes graph.",
+                len(self.ontology_graph),
+                len(self._mix_in_graph),
+                len(self._shapes_graph),
+            )
+
+        # pySHACL adds a few statements to each shapes graph it reads.
+        # Adding them now keeps validation runs from writing to the
+        # shared graph.
+        for triple in pyshacl.shapes_graph.ShapesGraph.system_triples:
+            self._shapes_graph.add(triple)
+
+        self.materialize_types = False
+        self._superclass_closure_table: Optional[
+            Mapping[rdflib.term.Node, FrozenSet[rdflib.term.Node]]
+        ] = None
+        if materialize_types:
+            if review_tbox:
+                _logger.debug("Not materializing types, due to TBox review.")
+            elif kwargs.get("inference") not in {None, "none"}:
+                _logger.debug("Not materializing types, due to inferencing.")
+            elif kwargs.get("do_owl_imports"):
+                _logger.debug("Not materializing types, due to owl:imports.")
+            else:
+                self.materialize_types = True
+                if case_version != "none" and not supplemental_graphs:
+                    self._superclass_closure_table = (
+                        get_bundled_superclass_closure_table(
+                            normalize_case_version(case_version)
+                        )
+                    )
+                else:
+                    self._superclass_closure_table = get_superclass_closure_table(
+                        [self._mix_in_graph]
+                    )
+
+        self._rdfs_closure: Optional[RDFSClosure] = None
+        if native_rdfs:
+            if kwargs.get("inference") != "rdfs":
+                _logger.debug(
+                    "Not using native RDFS inference, as RDFS inference was not requested."
+                )
+            elif kwargs.get("do_owl_imports"):
+                _logger.debug("Not using native RDFS inference, due to owl:imports.")
+            elif kwargs.get("sparql_mode"):
+                _logger.debug("Not using native RDFS inference, due to SPARQL mode.")
+            else:
+                self._rdfs_closure = RDFSClosure(self._mix_in_graph)
+
+    def _load_data_graph(
+        self,
+        data_graph: Union[rdflib.Graph, List[str], str],
+        exit_stack: contextlib.ExitStack,
+    ) -> rdflib.Graph:
+        loaded_graph: rdflib.Graph
+        if self.data_store_dir is not None:
+            loaded_graph = exit_stack.enter_context(
+                disk_backed_graph(self.data_store_dir)
+            )
+        elif isinstance(data_graph, rdflib.Graph):
+            if not self.materialize_types and self._rdfs_closure is None:
+                return data_graph
+            loaded_graph = rdflib.Graph()
+
+        if isinstance(data_graph, rdflib.Graph):
+            # Materialization, native inference, and in-place validation
+            # modify the data graph, so the caller's graph is copied.
+            for triple in data_graph:
+                loaded_graph.add(triple)
+            return loaded_graph
+
+        # Convert the data graph string to a rdflib.Graph object.
+        if self.data_store_dir is None:
+            loaded_graph = rdflib.Graph()
+        if isinstance(data_graph, str):
+            parse_graph(loaded_graph, data_graph, self.input_format)
+        elif isinstance(data_graph, list):
+            for _data_graph_file in data_graph:
+                _logger.debug("_data_graph_file = %r.", _data_graph_file)
+                if not isinstance(_data_graph_file, str):
+                    raise TypeError(
+                        "Expected str, received %s." % type(_data_graph_file)
+                    )
+            parse_graphs(loaded_graph, data_graph, format=self.input_format)
+        else:
+            raise TypeError(
+                "Expected rdflib.Graph, str, or list, received %s." % type(data_graph)
+            )
+        return loaded_graph
+
+    def _run(
+        self,
+        data_graph: Union[rdflib.Graph, List[str], str],
+        *,
+        max_results: Optional[int],
+        max_results_per_shape: Optional[int],
+        profile_shapes: bool,
+        result_writers: Optional[List[ResultWriter]],
+        focus_node_sampler: Optional[FocusNodeSampler] = None,
+    ) -> Tuple[
+        Tuple[bool, Union[Exception, bytes, str, rdflib.Graph], str],
+        Set[rdflib.URIRef],
+        Optional[List[ShapeProfile]],
+        Optional[ResultLimiter],
+    ]:
+        """
+        Run validation, without adjusting conformance for undefined CDO concepts.
+
+        :param focus_node_sampler: If not None, top-level shapes are evaluated against the sample of their focus nodes this hook draws, and it records the samples.
+
+        :return: The result tuple from pyshacl.validate, the undefined CDO concepts, the shape profiles (if requested), and the result limiter (if caps were requested).
+        """
+        with contextlib.ExitStack() as data_exit_stack:
+            _data_graph = self._load_data_graph(data_graph, data_exit_stack)
+            run_result = self._run_loaded(
+                _data_graph,
+                max_results=max_results,
+                max_results_per_shape=max_results_per_shape,
+                profile_shapes=profile_shapes,
+                result_writers=result_writers,
+                focus_node_sampler=focus_node_sampler,
+            )
+            # Relieve RAM of the data graph after validation has run.
+            del _data_graph
+        return run_result
+
+    def _run_loaded(
+        self,
+        _data_graph: rdflib.Graph,
+        *,
+        max_results: Optional[int],
+        max_results_per_shape: Optional[int],
+        profile_shapes: bool,
+        result_writers: Optional[List[ResultWriter]],
+        focus_node_sampler: Optional[FocusNodeSampler] = None,
+    ) -> Tuple[
+        Tuple[bool, Union[Exception, bytes, str, rdflib.Graph], str],
+        Set[rdflib.URIRef],
+        Optional[List[ShapeProfile]],
+        Optional[ResultLimiter],
+    ]:
+        """
+        See _run.  The data graph might be modified.
+        """
+        # Get the undefined CDO concepts.
+        undefined_cdo_concepts = get_data_cdo_concepts(_data_graph) - self._cdo_concepts
+
+        # Warn about typo'd concepts before performing SHACL review.
+        for undefined_cdo_concept in sorted(undefined_cdo_concepts):
+            warnings.warn(undefined_cdo_concept, NonExistentCDOConceptWarning)
+
+        mix_in_graph: Optional[Graph] = self._mix_in_graph
+        shapes_graph: Graph = self._shapes_graph
+
+        if self.materialize_types:
+            # The precomputed closure only suffices if the data graph
+            # does not extend the class hierarchy.
+            if (None, NS_RDFS.subClassOf, None) not in _data_graph:
+                superclass_closure_table = self._superclass_closure_table
+            else:
+                superclass_closure_table = None
+            n_materialized = materialize_type_closure(
+                _data_graph, self._mix_in_graph, superclass_closure_table
+            )
+            _logger.debug("Materialized %d rdf:type statements.", n_materialized)
+            # With no ontology graph, pySHACL validates the data graph
+            # in place rather than a copy.  Typed blank nodes still
+            # need the class hierarchy, as they are not materialized.
+            if any(
+                isinstance(n_node, rdflib.BNode)
+                for n_node in _data_graph.subjects(NS_RDF.type)
+            ):
+                _logger.debug(
+                    "Retaining class hierarchy graph, due to typed blank nodes."
+                )
+            else:
+                mix_in_graph = None
+
+        if self.prune_shapes:
+            if self._kwargs.get("inference") not in {None, "none"}:
+                _logger.debug("Not pruning shapes graph, due to inferencing.")
+            elif self._kwargs.get("do_owl_imports"):
+                _logger.debug("Not pruning shapes graph, due to owl:imports.")
+            elif self._kwargs.get("meta_shacl"):
+                _logger.debug("Not pruning shapes graph, due to meta-SHACL review.")
+            elif self._kwargs.get("advanced"):
+                _logger.debug(
+                    "Not pruning shapes graph, due to SHACL advanced features."
+                )
+            else:
+                shapes_graph = get_pruned_shapes_graph(
+                    _data_graph, shapes_graph, mix_in_graph
+                )
+
+        pyshacl_kwargs = self._kwargs
+        if self._rdfs_closure is not None:
+            # The data graph then holds the ontology graph and all RDFS
+            # entailments, so pySHACL need neither mix in the ontology
+            # graph nor infer, and validates the data graph in place.
+            self._rdfs_closure.expand(_data_graph)
+            mix_in_graph = None
+            pyshacl_kwargs = dict(pyshacl_kwargs, inference="none")
+        if self.data_store_dir is not None:
+            # The disk-backed data graph is a private copy, so pySHACL
+            # need not copy it into memory to mix in the ontology.
+            pyshacl_kwargs = dict(pyshacl_kwargs, inplace=True)
+
+        # Validate data graph against ontology graph.
+        shape_profiles: Optional[List[ShapeProfile]] = None
+        result_limiter: Optional[ResultLimiter] = None
+        results_streamed = False
+        with contextlib.ExitStack() as exit_stack:
+            # Hooks entered first see results after later hooks, e.g. so
+            # streamed results are capped.
+            if result_writers is not None:
+                results_streamed = exit_stack.enter_context(
+                    result_streaming(result_writers)
+                )
+            if profile_shapes:
+                shape_profiles_dict = exit_stack.enter_context(shape_profiling())
+            if focus_node_sampler is not None:
+                exit_stack.enter_context(shape_validation_hook(focus_node_sampler))
+            if max_results is not None or max_results_per_shape is not None:
+                result_limiter = exit_stack.enter_context(
+                    result_limits(
+                        max_results=max_results,
+                        max_results_per_shape=max_results_per_shape,
+                    )
+                )
+            if self.precheck_constraints:
+                if self._kwargs.get("advanced"):
+                    _logger.debug(
+                        "Not pre-checking constraints, due to SHACL advanced features."
+                    )
+                elif self._kwargs.get("js"):
+                    _logger.debug(
+                        "Not pre-checking constraints, due to SHACL-JS features."
+                    )
+                elif self._kwargs.get("sparql_mode"):
+                    _logger.debug("Not pre-checking constraints, due to SPARQL mode.")
+                else:
+                    # Entered last, so other hooks see the focus nodes
+                    # they would without pre-checks.
+                    exit_stack.enter_context(constraint_prechecks())
+            validate_result: Tuple[
+                bool, Union[Exception, bytes, str, rdflib.Graph], str
+            ] = pyshacl.validate(
+                _data_graph,
+                *self._args,
+                ont_graph=mix_in_graph,
+                shacl_graph=shapes_graph,
+                **pyshacl_kwargs,
+            )
+        if profile_shapes:
+            shape_profiles = sort_shape_profiles(shape_profiles_dict)
+        if result_writers is not None:
+            if not results_streamed and isinstance(validate_result[1], rdflib.Graph):
+                write_report_results(validate_result[1], result_writers)
+            for result_writer in result_writers:
+                result_writer.finish(validate_result[0])
+
+        return validate_result, undefined_cdo_concepts, shape_profiles, result_limiter
+
+    def validate(
+        self,
+        data_graph: Union[rdflib.Graph, List[str], str],
+        *,
+        max_results: Optional[int] = None,
+        max_results_per_shape: Optional[int] = None,
+        profile_shapes: bool = False,
+        result_writers: Optional[List[ResultWriter]] = None,
+        sample_fraction: Optional[float] = None,
+        sample_seed: int = 0,
+        sample_size: Optional[int] = None,
+    ) -> ValidationResult:
+        """
+        Validate a data graph against the prepared ontology graph and shapes graph.
+
+        :param data_graph: The data graph to validate, or the path to the file containing it, or a list of paths to files containing data graphs to pool together.  A given rdflib.Graph is not modified.
+        :param max_results: See validate.
+        :param max_results_per_shape: See validate.
+        :param profile_shapes: See validate.
+        :param result_writers: See validate.
+        :param sample_fraction: See validate.
+        :param sample_seed: See validate.
+        :param sample_size: See validate.
+        :return: The validation result object containing the defined properties.
+        """
+        focus_node_sampler = _make_focus_node_sampler(
+            sample_size,
+            sample_fraction,
+            sample_seed,
+            max_results=max_results,
+            max_results_per_shape=max_results_per_shape,
+        )
+        (
+            validate_result,
+            undefined_cdo_concepts,
+            shape_profiles,
+            result_limiter,
+        ) = self._run(
+            data_graph,
+            max_results=max_results,
+            max_results_per_shape=max_results_per_shape,
+            profile_shapes=profile_shapes,
+            result_writers=result_writers,
+            focus_node_sampler=focus_node_sampler,
+        )
+        results_capped_counts: Optional[Tuple[int, int]] = None
+        if result_limiter is not None and result_limiter.capped:
+            results_capped_counts = (
+                result_limiter.n_results,
+                len(result_limiter.capped_shapes),
+            )
+        return _make_validation_result(
+            validate_result,
+            undefined_cdo_concepts,
+            shape_profiles,
+            results_capped_counts,
+            bool(self._kwargs.get("allow_warnings")),
+            None
+            if focus_node_sampler is None
+            else sort_shape_samples(focus_node_sampler.shape_samples),
+        )
+
+
+def _make_focus_node_sampler(
+    sample_size: Optional[int],
+    sample_fraction: Optional[float],
+    sample_seed: int,
+    *,
+    max_results: Optional[int],
+    max_results_per_shape: Optional[int],
+) -> Optional[FocusNodeSampler]:
+    """
+    :return: The hook to sample focus nodes, if sampling was requested.
+    """
+    if sample_size is None and sample_fraction is None:
+        return None
+    if max_results is not None or max_results_per_shape is not None:
+        # Result caps count the results of each top-level shape's focus
+        # nodes, which the sampler would pass on as nested evaluations.
+        raise ValueError("Sampling cannot be combined with result caps.")
+    return FocusNodeSampler(
+        sample_size=sample_size, sample_fraction=sample_fraction, seed=sample_seed
+    )
+
+
+def _make_validation_result(
+    validate_result: Tuple[bool, Union[Exception, bytes, str, rdflib.Graph], str],
+    undefined_cdo_concepts: Set[rdflib.URIRef],
+    shape_profiles: Optional[List[ShapeProfile]],
+    results_capped_counts: Optional[Tuple[int, int]],
+    allow_warnings: bool,
+    shape_samples: Optional[List[ShapeSample]] = None,
+) -> ValidationResult:
+    """
+    Issue the warnings that follow SHACL review, and adjust conformance for undefined CDO concepts.
+
+    :param results_capped_counts: If results were capped, the number of results kept and the number of shapes capped.
+    :param shape_samples: If focus nodes were sampled, the samples of each shape.
+    """
+    conforms = validate_result[0]
+
+    results_capped = False
+    if results_capped_counts is not None:
+        results_capped = True
+        warnings.warn(
+            "Validation results were capped after %d results, so the report may omit results of %d shapes.  Conformance is unaffected."
+            % results_capped_counts
+        )
+
+    if shape_samples is not None:
+        warnings.warn(
+            "Shapes were evaluated against a sample of %d of %d focus nodes, so conformance only covers the sampled focus nodes."
+            % (
+                sum(x.n_sampled for x in shape_samples),
+                sum(x.n_focus_nodes for x in shape_samples),
+            )
+        )
+
+    if len(undefined_cdo_concepts) > 0:
+        undefined_cdo_concepts_message = (
+            "There were %d concepts with CDO IRIs in the data graph that are not in the ontology graph."
+            % len(undefined_cdo_concepts)
+        )
+        warnings.warn(undefined_cdo_concepts_message)
+        if not allow_warnings:
+            undefined_cdo_concepts_alleviation_message = "The data graph is SHACL-conformant with the CDO ontologies, but nonexistent-concept references raise Warnings with this tool.  Please either correct the concept names in the data graph; use the --ontology-graph flag to pass a corrected CDO ontology file, also using --built-version none; or, use the --allow-warnings flag."
+            warnings.warn(undefined_cdo_concepts_alleviation_message)
+            conforms = False
+
+    return ValidationResult(
+        conforms,
+        validate_result[1],
+        validate_result[2],
+        undefined_cdo_concepts,
+        shape_profiles,
+        results_capped,
+        shape_samples,
+    )
+
+
 def validate(
     input_file: Union[List[str], str],
     *args: Any,
+    cache_dir: Optional[str] = None,
+    cache_max_size: int = DEFAULT_MAX_SIZE,
     case_version: Optional[str] = None,
+    data_store_dir: Optional[str] = None,
+    input_format: Optional[str] = None,
+    materialize_types: bool = False,
+    max_results: Optional[int] = None,
+    max_results_per_shape: Optional[int] = None,
+    native_rdfs: bool = False,
+    precheck_constraints: bool = False,
+    profile_shapes: bool = False,
+    prune_shapes: bool = False,
+    result_writers: Optional[List[ResultWriter]] = None,
     review_tbox: bool = False,
+    sample_fraction: Optional[float] = None,
+    sample_seed: int = 0,
+    sample_size: Optional[int] = None,
     supplemental_graphs: Optional[List[str]] = None,
     **kwargs: Any,
 ) -> ValidationResult:
     """
     Validate the given data graph against the given CASE ontology version and supplemental graphs.
 
+    This prepares the ontology graph on each call.  To validate many data graphs against the same ontology graph, construct a Validator once and call its validate method instead.
+
     :param *args: The positional arguments to pass to the underlying pyshacl.validate function.
-    :param input_file: The path to the file containing the data graph to validate.  This can also be a list of paths to files containing data graphs to pool together.
+    :param input_file: The path to the file containing the data graph to validate.  This can also be a list of paths to files containing data graphs to pool together.  The path "-" reads standard input (see case_utils.graph_loading.parse_graphs).
+    :param cache_dir: If not None, validation results are looked up in, and stored in, a content-addressed cache in this directory.  Entries are keyed on the contents of the input files and supplemental graphs, the CASE version, and the arguments that affect validation results.  The cache is not used if profile_shapes, result_writers, or sampling are requested, as their effects cannot be replayed.
+    :param cache_max_size: The size limit of the cache directory, in bytes.  Least recently used entries are removed to stay within the limit.
     :param case_version: The version of the CASE ontology to use (e.g. 1.2.0).  If None, the most recent version will be used.
+    :param data_store_dir: If not None, the data graph is loaded into a temporary SQLite database in this directory, rather than into memory, and validated there without pySHACL's in-memory copy (see case_utils.case_validate.validate_store).  This bounds memory use for large data graphs, at the cost of run time.  The database file is removed after validation.
+    :param input_format: The RDF format of the input files, overriding the formats guessed from their file extensions.  Standard input is read as Turtle if no format is given.
+    :param materialize_types: If True, the rdf:type statements entailed by the class hierarchy are added to the data graph before validation, and the class hierarchy is not mixed into a copy of the data graph.  The validation results are unaffected.  For the CASE versions shipped with this package, the class hierarchy closure is computed once per version per process.  Materialization is skipped if the TBox is under review, or if inferencing or owl:imports are requested.
+    :param max_results: If not None, at most this many validation results will be reported.  Once the cap is reached, shapes are only evaluated as far as needed to determine conformance, so conformance is the same as without the cap.  The results_capped property of the returned result records whether any results were omitted.
+    :param max_results_per_shape: If not None, at most this many validation results will be reported for each top-level shape, counting results of shapes nested under it (e.g. by sh:property).  Conformance is unaffected, as with max_results.
+    :param native_rdfs: If True, and inference is "rdfs", the RDFS entailments of the data graph and ontology graph are computed by case_validate (see case_utils.case_validate.validate_rdfs), rather than by pySHACL with the OWL-RL library.  The entailments of the ontology graph are computed once per Validator.  The validation results are unaffected.  Native inference is skipped if owl:imports or SPARQL mode are requested.
+    :param precheck_constraints: If True, shapes constrained only by sh:datatype, sh:class, sh:minCount, sh:maxCount, and sh:nodeKind on a simple predicate path are first checked in bulk, and pySHACL evaluates them only for focus nodes that might not conform (see case_utils.case_validate.validate_precheck).  The validation results are unaffected.  Pre-checks are skipped if SHACL advanced features, SHACL-JS, or SPARQL mode are requested.
+    :param profile_shapes: If True, the wall time, number of focus nodes, and number of validation results of each evaluated SHACL shape will be recorded in the shape_profiles property of the returned result, sorted by descending self time.  Profiling adds a small overhead to each shape evaluation.
+    :param prune_shapes: If True, SHACL shapes that cannot have any focus nodes in the data graph will be removed from the shapes graph before running validation.  The validation results are unaffected.  Pruning is skipped if inferencing, owl:imports, meta-SHACL, or SHACL advanced features are requested, as those can change the data graph or the shapes graph in ways the pruning does not anticipate.
+    :param result_writers: If not None, each validation result is passed to these writers as soon as it is found (see case_utils.case_validate.validate_reporting), and each writer's finish method is called with the SHACL conformance after validation.  The graph and text of the returned result then include at most one validation result, as the results are not retained.
     :param review_tbox: If True, SHACL shapes that review OWL Classes, OWL Properties, and SHACL shapes that constrain those classes and properties will be used in the review.  Otherwise, those shapes will be deactivated before running validation.  Be aware that these shapes are known to significantly increase the validation run time.
+    :param sample_fraction: If not None, each top-level shape is evaluated against a random sample of this fraction of its focus nodes, rounded up (see case_utils.case_validate.validate_sampling).  Shapes nested under a top-level shape are evaluated for the sampled focus nodes.  The validation report, and conformance, then only cover the sampled focus nodes, so they are an estimate for the data graph.  The samples are recorded in the shape_samples property of the returned result, sorted by descending rate of focus nodes with results.  Sampling cannot be combined with max_results or max_results_per_shape.
+    :param sample_seed: The seed of the random samples of sample_size and sample_fraction.  The same seed draws the same samples from the same data graph.
+    :param sample_size: If not None, each top-level shape is evaluated against a random sample of at most this many of its focus nodes, as with sample_fraction.  At most one of sample_size and sample_fraction can be given.
     :param supplemental_graphs: File paths to supplemental graphs to use.  If None, no supplemental graphs will be used.
     :param allow_warnings: In addition to affecting the conformance of SHACL validation, this will affect conformance based on unrecognized CDO concepts (likely, misspelled or miscapitalized) in the data graph.  If allow_warnings is not True, any unrecognized concept using a CDO IRI prefix will cause conformance to be False.
     :param inference: The type of inference to use.  If "none" (type str), no inference will be used.  If None (type NoneType), pyshacl defaults will be used.  Note that at the time of this writing (pySHACL 0.23.0), pyshacl defaults are no inferencing for the data graph, and RDFS inferencing for the SHACL graph, which for case_utils.validate includes the SHACL and OWL graphs.
     :param **kwargs: The keyword arguments to pass to the underlying pyshacl.validate function.
     :return: The validation result object containing the defined properties.
     """
-    # Convert the data graph string to a rdflib.Graph object.
-    data_graph = rdflib.Graph()
-    if isinstance(input_file, str):
-        data_graph.parse(input_file)
-    elif isinstance(input_file, list):
-        for _data_graph_file in input_file:
-            _logger.debug("_data_graph_file = %r.", _data_graph_file)
-            if not isinstance(_data_graph_file, str):
-                raise TypeError("Expected str, received %s." % type(_data_graph_file))
-            data_graph.parse(_data_graph_file)
-
-    # Get the ontology graph from the case_version and supplemental_graphs arguments
-    ontology_graph: Graph = get_ontology_graph(case_version, supplemental_graphs)
-
-    if not review_tbox:
-        # This is done because, at the time of pyshacl 0.20.0, the
-        # entirety of the ontology graph is mixed into the data graph.
-        # UCO 1.0.0 includes some mechanisms to cross-check SHACL
-        # PropertyShapes versus OWL property definitions.  Because of
-        # the mix-in, all of the ontology graph (.validate ont_graph
-        # kwarg) is reviewed by the SHACL graph (.validate shacl_graph
-        # kwarg), so for UCO 1.0.0 that adds around 30 seconds to each
-        # case_validate call, redundantly reviewing UCO.
-        disable_tbox_review(ontology_graph)
-
-    # Get the undefined CDO concepts.
-    undefined_cdo_concepts = get_invalid_cdo_concepts(data_graph, ontology_graph)
-
-    # Warn about typo'd concepts before performing SHACL review.
-    for undefined_cdo_concept in sorted(undefined_cdo_concepts):
-        warnings.warn(undefined_cdo_concept, NonExistentCDOConceptWarning)
-    undefined_cdo_concepts_message = (
-        "There were %d concepts with CDO IRIs in the data graph that are not in the ontology graph."
-        % len(undefined_cdo_concepts)
-    )
-
-    # Validate data graph against ontology graph.
-    validate_result: Tuple[
-        bool, Union[Exception, bytes, str, rdflib.Graph], str
-    ] = pyshacl.validate(
-        data_graph,
-        *args,
-        ont_graph=ontology_graph,
-        shacl_graph=ontology_graph,
-        **kwargs,
-    )
-
-    # Relieve RAM of the data graph after validation has run.
-    del data_graph
+    focus_node_sampler = _make_focus_node_sampler(
+        sample_size,
+        sample_fraction,
+        sample_seed,
+        max_results=max_results,
+        max_results_per_shape=max_results_per_shape,
+    )
 
-    conforms = validate_result[0]
+    # Find the validation cache entry, if any.
+    cache: Optional[ValidationCache] = None
+    cache_key: Optional[str] = None
+    input_files = [input_file] if isinstance(input_file, str) else input_file
+    if cache_dir is not None:
+        if "-" in input_files:
+            _logger.debug("Not using validation cache, due to reading standard input.")
+        elif profile_shapes or result_writers is not None:
+            _logger.debug(
+                "Not using validation cache, due to shape profiling or result streaming."
+            )
+        elif focus_node_sampler is not None:
+            _logger.debug("Not using validation cache, due to sampling.")
+        else:
+            cache = ValidationCache(cache_dir, cache_max_size)
+            # Arguments that do not affect validation results are
+            # excluded, so their runs share cache entries.
+            result_arguments: Dict[str, Any] = {
+                k: v for (k, v) in kwargs.items() if k != "debug"
+            }
+            result_arguments["args"] = list(args)
+            result_arguments["max_results"] = max_results
+            result_arguments["max_results_per_shape"] = max_results_per_shape
+            result_arguments["review_tbox"] = review_tbox
+            # The format is only recorded if given, so runs guessing
+            # formats from file extensions keep their cache keys.
+            if input_format is not None:
+                result_arguments["input_format"] = input_format
+            cache_key = get_cache_key(
+                input_files,
+                "none"
+                if case_version == "none"
+                else normalize_case_version(case_version),
+                supplemental_graphs,
+                result_arguments,
+            )
+    cache_entry: Optional[Dict[str, Any]] = None
+    if cache is not None and cache_key is not None:
+        cache_entry = cache.get(cache_key)
 
-    if len(undefined_cdo_concepts) > 0:
-        warnings.warn(undefined_cdo_concepts_message)
-        if not kwargs.get("allow_warnings"):
-            undefined_cdo_concepts_alleviation_message = "The data graph is SHACL-conformant with the CDO ontologies, but nonexistent-concept references raise Warnings with this tool.  Please either correct the concept names in the data graph; use the --ontology-graph flag to pass a corrected CDO ontology file, also using --built-version none; or, use the --allow-warnings flag."
-            warnings.warn(undefined_cdo_concepts_alleviation_message)
-            conforms = False
+    validate_result: Tuple[bool, Union[Exception, bytes, str, rdflib.Graph], str]
+    undefined_cdo_concepts: Set[rdflib.URIRef]
+    shape_profiles: Optional[List[ShapeProfile]] = None
+    results_capped_counts: Optional[Tuple[int, int]] = None
+    if cache_entry is not None:
+        validation_graph: Union[bytes, str, rdflib.Graph]
+        if cache_entry["graph_type"] == "graph":
+            validation_graph = rdflib.Graph()
+            validation_graph.parse(data=cache_entry["graph"], format="turtle")
+        elif cache_entry["graph_type"] == "bytes":
+            validation_graph = cache_entry["graph"].encode("utf-8")
+        else:
+            validation_graph = cache_entry["graph"]
+        validate_result = (
+            cache_entry["conforms"],
+            validation_graph,
+            cache_entry["text"],
+        )
+        undefined_cdo_concepts = {
+            rdflib.URIRef(x) for x in cache_entry["undefined_concepts"]
+        }
+        if cache_entry["results_capped_counts"] is not None:
+            results_capped_counts = (
+                cache_entry["results_capped_counts"][0],
+                cache_entry["results_capped_counts"][1],
+            )
+        # Replay the warnings issued before SHACL review.
+        for undefined_cdo_concept in sorted(undefined_cdo_concepts):
+            warnings.warn(undefined_cdo_concept, NonExistentCDOConceptWarning)
+    else:
+        (
+            validate_result,
+            undefined_cdo_concepts,
+            shape_profiles,
+            result_limiter,
+        ) = Validator(
+            *args,
+            case_version=case_version,
+            data_store_dir=data_store_dir,
+            input_format=input_format,
+            materialize_types=materialize_types,
+            native_rdfs=native_rdfs,
+            precheck_constraints=precheck_constraints,
+            prune_shapes=prune_shapes,
+            review_tbox=review_tbox,
+            supplemental_graphs=supplemental_graphs,
+            **kwargs,
+        )._run(
+            input_file,
+            max_results=max_results,
+            max_results_per_shape=max_results_per_shape,
+            profile_shapes=profile_shapes,
+            result_writers=result_writers,
+            focus_node_sampler=focus_node_sampler,
+        )
+        if result_limiter is not None and result_limiter.capped:
+            results_capped_counts = (
+                result_limiter.n_results,
+                len(result_limiter.capped_shapes),
+            )
+        if cache is not None and cache_key is not None:
+            graph_type: Optional[str] = None
+            graph_data: Optional[str] = None
+            if isinstance(validate_result[1], rdflib.Graph):
+                graph_type = "graph"
+                graph_data = validate_result[1].serialize(format="turtle")
+            elif isinstance(validate_result[1], bytes):
+                graph_type = "bytes"
+                graph_data = validate_result[1].decode("utf-8")
+            elif isinstance(validate_result[1], str):
+                graph_type = "str"
+                graph_data = validate_result[1]
+            if graph_type is not None:
+                cache.put(
+                    cache_key,
+                    {
+                        "conforms": validate_result[0],
+                        "graph_type": graph_type,
+                        "graph": graph_data,
+                        "text": validate_result[2],
+                        "undefined_concepts": sorted(
+                            str(x) for x in undefined_cdo_concepts
+                        ),
+                        "results_capped_counts": results_capped_counts,
+                    },
+                )
 
-    return ValidationResult(
-        conforms,
-        validate_result[1],
-        validate_result[2],
+    return _make_validation_result(
+        validate_result,
         undefined_cdo_concepts,
+        shape_profiles,
+        results_capped_counts,
+        bool(kwargs.get("allow_warnings")),
+        None
+        if focus_node_sampler is None
+        else sort_shape_samples(focus_node_sampler.shape_samples),
     )
 
 
+# The data graph shared with forked version-validation workers.
+_versions_data_graph: Optional[rdflib.Graph] = None
+
+
+def _validate_version(
+    case_version: str,
+    args: Tuple[Any, ...],
+    validator_kwargs: Dict[str, Any],
+    call_kwargs: Dict[str, Any],
+) -> Tuple[ValidationResult, List[Tuple[Any, str]]]:
+    """
+    This function runs in a forked worker process, reading the data graph the parent process loaded before forking.
+
+    :return: The validation result, and the category and message of each warning issued, for the parent process to replay.
+    """
+    assert _versions_data_graph is not None
+    with warnings.catch_warnings(record=True) as warning_messages:
+        warnings.simplefilter("always")
+        validation_result = Validator(
+            *args, case_version=case_version, **validator_kwargs
+        ).validate(_versions_data_graph, **call_kwargs)
+    return validation_result, [(x.category, str(x.message)) for x in warning_messages]
+
+
+def validate_versions(
+    input_file: Union[rdflib.Graph, List[str], str],
+    case_versions: List[str],
+    *args: Any,
+    max_results: Optional[int] = None,
+    max_results_per_shape: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    **kwargs: Any,
+) -> Dict[str, ValidationResult]:
+    """
+    Validate one data graph against several CASE versions, parsing the data graph once.
+
+    If more than one worker is allowed, each version is validated in a forked worker process, which reads the parsed data graph without copying it.  Warnings issued in workers are re-issued in this process, in version order.  Where forking is unavailable, or other threads are running, versions are validated one after another.
+
+    The returned results' graphs are rdflib.Graph objects, suitable for case_utils.case_validate.validate_comparison.VersionComparison.
+
+    :param input_file: See Validator.validate.
+    :param case_versions: The CASE versions to validate against, as for the case_version parameter of validate.
+    :param *args: The positional arguments to pass to the underlying pyshacl.validate function.
+    :param max_results: See validate.
+    :param max_results_per_shape: See validate.
+    :param max_workers: The maximum number of worker processes.  Defaults to the lesser of the number of versions and the number of processors.
+    :param **kwargs: The keyword arguments to pass to Validator, e.g. allow_warnings or supplemental_graphs.
+    :return: Validation results, keyed by CASE version, in the order of case_versions.
+    """
+    global _versions_data_graph
+
+    if "serialize_report_graph" in kwargs:
+        raise ValueError(
+            "serialize_report_graph is not supported with validate_versions."
+        )
+    call_kwargs: Dict[str, Any] = {
+        "max_results": max_results,
+        "max_results_per_shape": max_results_per_shape,
+    }
+
+    # Versions are reported once each, in the order first given.
+    case_versions = list(dict.fromkeys(case_versions))
+
+    data_graph: rdflib.Graph
+    if isinstance(input_file, rdflib.Graph):
+        data_graph = input_file
+    elif isinstance(input_file, str):
+        data_graph = parse_graphs(
+            rdflib.Graph(), [input_file], format=kwargs.get("input_format")
+        )
+    elif isinstance(input_file, list):
+        data_graph = parse_graphs(
+            rdflib.Graph(), input_file, format=kwargs.get("input_format")
+        )
+    else:
+        raise TypeError(
+            "Expected rdflib.Graph, str, or list, received %s." % type(input_file)
+        )
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(case_versions))
+
+    version_results: Dict[str, ValidationResult] = dict()
+    if (
+        max_workers <= 1
+        or "fork" not in multiprocessing.get_all_start_methods()
+        or threading.active_count() > 1
+    ):
+        for case_version in case_versions:
+            version_results[case_version] = Validator(
+                *args, case_version=case_version, **kwargs
+            ).validate(data_graph, **call_kwargs)
+        return version_results
+
+    _logger.debug(
+        "Validating against %d versions in %d worker processes.",
+        len(case_versions),
+        max_workers,
+    )
+    _versions_data_graph = data_graph
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _validate_version, case_version, args, kwargs, call_kwargs
+                )
+                for case_version in case_versions
+            ]
+            for case_version, future in zip(case_versions, futures):
+                validation_result, warning_messages = future.result()
+                for category, message in warning_messages:
+                    warnings.warn(message, category)
+                version_results[case_version] = validation_result
+    finally:
+        _versions_data_graph = None
+    return version_results
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="CASE wrapper to pySHACL command line tool."
@@ -168,11 +931,26 @@ def main() -> None:
     parser.add_argument(
         "-d", "--debug", action="store_true", help="Output additional runtime messages."
     )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of a content-addressed cache of validation results.  If the input files, supplemental ontology graphs, --built-version, and flags affecting results match a previous run, the stored report and exit status are used instead of re-running validation.  Not used with --profile-shapes, --stream, --summary, or --format jsonl.",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        default=DEFAULT_MAX_SIZE,
+        help="Size limit of the --cache-dir directory, in bytes.  Least recently used entries are removed to stay within the limit.  Default is %d."
+        % DEFAULT_MAX_SIZE,
+    )
+    parser.add_argument(
+        "--data-store-dir",
+        help="Load the data graph into a temporary SQLite database in this directory, rather than into memory, to validate data graphs larger than available memory.  Validation is slower.  The database file is removed afterwards.",
+    )
     parser.add_argument(
         "--built-version",
+        action="append",
         choices=tuple(built_version_choices_list),
-        default="case-" + CURRENT_CASE_VERSION,
-        help="Monolithic aggregation of CASE ontology files at certain versions.  Does not require networking to use.  Default is most recent CASE release.  Passing 'none' will mean no pre-built CASE ontology versions accompanying this tool will be included in the analysis.",
+        help="Monolithic aggregation of CASE ontology files at certain versions.  Does not require networking to use.  Default is most recent CASE release.  Passing 'none' will mean no pre-built CASE ontology versions accompanying this tool will be included in the analysis.  Can be given multiple times, to parse the data graph once and validate it against each version, writing one report per version followed by a comparison of the validation results not reported with every version.  Multiple versions require --format human, and cannot be used with --cache-dir, --data-store-dir, --profile-shapes, --stream, or --summary.  The exit status is 0 only if the data graph conforms with every version.",
     )
     parser.add_argument(
         "--ontology-graph",
@@ -205,9 +983,9 @@ def main() -> None:
     parser.add_argument(
         "-f",
         "--format",
-        choices=("human", "turtle", "xml", "json-ld", "nt", "n3"),
+        choices=("human", "turtle", "xml", "json-ld", "nt", "n3", "jsonl"),
         default="human",
-        help="(ALMOST as with pyshacl CLI) Choose an output format. Default is \"human\".  Difference: 'table' not provided.",
+        help="(ALMOST as with pyshacl CLI) Choose an output format. Default is \"human\".  Difference: 'table' not provided.  Addition: 'jsonl', JSON Lines, writes each validation result as a JSON object on its own line, as results are found.",
     )
     parser.add_argument(
         "-im",
@@ -222,6 +1000,10 @@ def main() -> None:
         choices=("none", "rdfs", "owlrl", "both"),
         help='(As with pyshacl CLI) Choose a type of inferencing to run against the Data Graph before validating. The default behavior if this flag is not provided is to behave as "none", if not using the --metashacl flag.  The default behavior when using the --metashacl flag will apply "rdfs" inferencing to the ontology graph, but the data graph will still have no inferencing applied.  If the --inference flag is provided, it will apply to both the ontology graph, and the data graph.',
     )
+    parser.add_argument(
+        "--input-format",
+        help='RDF format of the input data graphs, e.g. nt or turtle, overriding the format guessed from their file extensions.  An input data graph of "-" is read from standard input, as Turtle (which includes N-Triples) unless this flag is given.',
+    )
     parser.add_argument(
         "-m",
         "--metashacl",
@@ -235,10 +1017,71 @@ def main() -> None:
         "--output",
         dest="output",
         nargs="?",
-        type=argparse.FileType("x"),
-        help='(ALMOST as with pyshacl CLI) Send output to a file.  If absent, output will be written to stdout.  Difference: If specified, file is expected not to exist.  Clarification: Does NOT influence --format flag\'s default value of "human".  (I.e., any machine-readable serialization format must be specified with --format.)',
+        type=case_utils.file_compression.FileType("x"),
+        help='(ALMOST as with pyshacl CLI) Send output to a file.  If absent, output will be written to stdout.  Difference: If specified, file is expected not to exist.  Difference: If the file name ends with a compression extension (.bz2, .gz, .xz, or .zst), output is compressed.  Clarification: Does NOT influence --format flag\'s default value of "human".  (I.e., any machine-readable serialization format must be specified with --format.)',
         default=sys.stdout,
     )
+    parser.add_argument(
+        "--max-results",
+        type=int,
+        help="Report at most this many validation results.  Once the cap is reached, shapes are only evaluated as far as needed to determine conformance, so the exit status is the same as without the cap.  A warning is issued if any results are omitted.",
+    )
+    parser.add_argument(
+        "--max-results-per-shape",
+        type=int,
+        help="Report at most this many validation results for each shape, counting results of the property shapes it uses.  As with --max-results, the exit status is unaffected.",
+    )
+    parser.add_argument(
+        "--materialize-types",
+        action="store_true",
+        help="Before validating, add to the data graph the rdf:type statements entailed by the ontology's class hierarchy, rather than mixing the class hierarchy into a copy of the data graph.  Validation results are unaffected, but run time and memory usage are reduced.  Ignored if --review-tbox, --inference, or --imports are used.",
+    )
+    parser.add_argument(
+        "--native-rdfs",
+        action="store_true",
+        help="With --inference rdfs, compute the RDFS entailments with case_validate's own implementation, which indexes the ontology's class and property hierarchies once, rather than with the OWL-RL library.  Validation results are unaffected, but run time is reduced.  Ignored with other --inference values, or if --imports is used.",
+    )
+    parser.add_argument(
+        "--precheck-constraints",
+        action="store_true",
+        help="Check shapes constrained only by sh:datatype, sh:class, sh:minCount, sh:maxCount, and sh:nodeKind in bulk before validating, so pySHACL only evaluates them for focus nodes that might not conform.  Validation results are unaffected, but run time is reduced.  Ignored if SHACL advanced features are used.",
+    )
+    parser.add_argument(
+        "--profile-shapes",
+        help="Record the wall time, number of focus nodes, and number of validation results of each evaluated SHACL shape, and write them to this file as a table sorted by descending time spent in the shape itself.  Format is determined by file extension, .csv or .json, which a compression extension (.bz2, .gz, .xz, or .zst) can follow.",
+    )
+    parser.add_argument(
+        "--prune-shapes",
+        action="store_true",
+        help="Before validating, remove shapes from the shapes graph that cannot have focus nodes in the data graph, e.g. shapes targeting classes that have no instances.  Validation results are unaffected, but run time is reduced.  Ignored if --inference, --imports, or --metashacl are used.",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        metavar="N",
+        help="Quick estimate mode for very large data graphs.  Evaluate each shape against a random sample of at most N of its focus nodes, and after the report, write for each shape the rate of sampled focus nodes with validation results, with a 95%% confidence interval.  The report only covers the sampled focus nodes, so it is an estimate: the exit status is 1 if the sample does not conform, and otherwise 3, never 0.  Requires --format human, and cannot be used with --max-results, --max-results-per-shape, --stream, or --summary.",
+    )
+    parser.add_argument(
+        "--sample-fraction",
+        type=float,
+        help="As with --sample, but sample this fraction (e.g. 0.01) of each shape's focus nodes, rounded up.",
+    )
+    parser.add_argument(
+        "--sample-seed",
+        type=int,
+        default=0,
+        help="Seed of the random samples of --sample and --sample-fraction.  The same seed draws the same samples from the same data graph.  Default is 0.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write each validation result as soon as it is found, rather than building the whole report in memory.  Requires --format nt or --format jsonl.  (jsonl output is always streamed.)  With nt, the report's sh:conforms statement is written last.",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Instead of the full report, write a summary that groups validation results by source shape, result path, and message, with counts and sample focus nodes.  Results are aggregated as they are found, so memory use is bounded by the number of groups.  Requires --format human or --format jsonl (one group per line).",
+    )
     parser.add_argument(
         "--review-tbox",
         action="store_true",
@@ -249,27 +1092,138 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    if args.in_graph.count("-") > 1:
+        parser.error("Standard input can only be read once.")
+
+    # Fail on an unsupported profile format before running validation.
+    if (
+        args.profile_shapes is not None
+        and not case_utils.file_compression.uncompressed_name(
+            args.profile_shapes
+        ).endswith((".csv", ".json"))
+    ):
+        raise NotImplementedError("Output file extension not implemented.")
+
+    sampling = args.sample is not None or args.sample_fraction is not None
+    if sampling:
+        if args.sample is not None and args.sample_fraction is not None:
+            parser.error("--sample and --sample-fraction cannot be used together.")
+        if args.sample is not None and args.sample < 1:
+            parser.error("--sample must be positive.")
+        if args.sample_fraction is not None and not (0 < args.sample_fraction <= 1):
+            parser.error("--sample-fraction must be greater than 0 and at most 1.")
+        if args.format != "human":
+            parser.error("--sample requires --format human.")
+        for flag, value in [
+            ("--max-results", args.max_results),
+            ("--max-results-per-shape", args.max_results_per_shape),
+            ("--stream", args.stream or None),
+            ("--summary", args.summary or None),
+        ]:
+            if value is not None:
+                parser.error("%s cannot be used with sampling." % flag)
+
+    built_versions: List[str] = list(
+        dict.fromkeys(
+            ["case-" + CURRENT_CASE_VERSION]
+            if args.built_version is None
+            else args.built_version
+        )
+    )
+    if len(built_versions) > 1:
+        if args.format != "human":
+            parser.error("Multiple --built-version values require --format human.")
+        for flag, value in [
+            ("--cache-dir", args.cache_dir),
+            ("--data-store-dir", args.data_store_dir),
+            ("--profile-shapes", args.profile_shapes),
+            ("--sample", args.sample),
+            ("--sample-fraction", args.sample_fraction),
+            ("--stream", args.stream or None),
+            ("--summary", args.summary or None),
+        ]:
+            if value is not None:
+                parser.error(
+                    "%s cannot be used with multiple --built-version values." % flag
+                )
+        version_results = validate_versions(
+            args.in_graph,
+            built_versions,
+            abort_on_first=args.abort,
+            allow_infos=True if args.allow_infos else False,
+            allow_warnings=True if args.allow_warnings else False,
+            debug=True if args.debug else False,
+            do_owl_imports=True if args.imports else False,
+            inference=args.inference,
+            input_format=args.input_format,
+            materialize_types=True if args.materialize_types else False,
+            max_results=args.max_results,
+            max_results_per_shape=args.max_results_per_shape,
+            meta_shacl=args.metashacl,
+            native_rdfs=True if args.native_rdfs else False,
+            precheck_constraints=True if args.precheck_constraints else False,
+            prune_shapes=True if args.prune_shapes else False,
+            review_tbox=True if args.review_tbox else False,
+            supplemental_graphs=args.ontology_graph,
+        )
+        for built_version, version_result in version_results.items():
+            args.output.write("Built version: %s\n" % built_version)
+            args.output.write(version_result.text)
+            args.output.write("\n")
+        args.output.write(VersionComparison(version_results).to_text())
+        sys.exit(0 if all(x.conforms for x in version_results.values()) else 1)
+
     # Determine output format.
     # pySHACL's determination of output formatting is handled solely
     # through the -f flag.  Other CASE CLI tools handle format
     # determination by output file extension.  case_validate will defer
     # to pySHACL behavior, as other CASE tools don't (at the time of
     # this writing) have the value "human" as an output format.
-    validator_kwargs: Dict[str, str] = dict()
-    if args.format != "human":
+    validator_kwargs: Dict[str, Any] = dict()
+    result_writers: Optional[List[ResultWriter]] = None
+    result_summarizer: Optional[ResultSummarizer] = None
+    if args.summary:
+        if args.stream:
+            parser.error("--summary and --stream cannot be used together.")
+        if args.format not in {"human", "jsonl"}:
+            parser.error("--summary requires --format human or --format jsonl.")
+        result_summarizer = ResultSummarizer()
+        result_writers = [result_summarizer]
+    elif args.format == "jsonl":
+        result_writers = [JSONLinesResultWriter(args.output)]
+    elif args.stream:
+        if args.format != "nt":
+            parser.error("--stream requires --format nt or --format jsonl.")
+        result_writers = [NTriplesResultWriter(args.output)]
+    elif args.format != "human":
         validator_kwargs["serialize_report_graph"] = args.format
 
     validation_result: ValidationResult = validate(
         args.in_graph,
         abort_on_first=args.abort,
+        cache_dir=args.cache_dir,
+        cache_max_size=args.cache_max_size,
         allow_infos=True if args.allow_infos else False,
         allow_warnings=True if args.allow_warnings else False,
-        case_version=args.built_version,
+        case_version=built_versions[0],
+        data_store_dir=args.data_store_dir,
         debug=True if args.debug else False,
         do_owl_imports=True if args.imports else False,
         inference=args.inference,
+        input_format=args.input_format,
+        materialize_types=True if args.materialize_types else False,
+        max_results=args.max_results,
+        max_results_per_shape=args.max_results_per_shape,
         meta_shacl=args.metashacl,
+        native_rdfs=True if args.native_rdfs else False,
+        profile_shapes=args.profile_shapes is not None,
+        precheck_constraints=True if args.precheck_constraints else False,
+        prune_shapes=True if args.prune_shapes else False,
+        result_writers=result_writers,
         review_tbox=True if args.review_tbox else False,
+        sample_fraction=args.sample_fraction,
+        sample_seed=args.sample_seed,
+        sample_size=args.sample,
         supplemental_graphs=args.ontology_graph,
         **validator_kwargs,
     )
@@ -278,10 +1232,34 @@ def main() -> None:
     validation_graph = validation_result.graph
     validation_text = validation_result.text
 
+    if args.profile_shapes is not None:
+        assert validation_result.shape_profiles is not None
+        write_shape_profiles(validation_result.shape_profiles, args.profile_shapes)
+
     # NOTE: The output logistics code is adapted from pySHACL's file
     # pyshacl/cli.py.  This section should be monitored for code drift.
-    if args.format == "human":
+    if result_summarizer is not None:
+        if args.format == "jsonl":
+            for result_group in result_summarizer.groups:
+                args.output.write(json.dumps(result_group.to_dict()))
+                args.output.write("\n")
+        else:
+            args.output.write(result_summarizer.to_text(conforms))
+    elif result_writers is not None:
+        # Results were written during validation.
+        pass
+    elif args.format == "human":
         args.output.write(validation_text)
+        if validation_result.shape_samples is not None:
+            args.output.write("\n")
+            namespace_manager: Optional[rdflib.namespace.NamespaceManager] = None
+            if isinstance(validation_graph, rdflib.Graph):
+                namespace_manager = validation_graph.namespace_manager
+            args.output.write(
+                shape_samples_to_text(
+                    validation_result.shape_samples, namespace_manager
+                )
+            )
     else:
         if isinstance(validation_graph, rdflib.Graph):
             raise NotImplementedError(
@@ -298,7 +1276,12 @@ def main() -> None:
                 % type(validation_graph)
             )
 
-    sys.exit(0 if conforms else 1)
+    if not conforms:
+        sys.exit(1)
+    if sampling:
+        # A conformant sample does not show the data graph conforms.
+        sys.exit(3)
+    sys.exit(0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module provides an asyncio interface to case_validate, running validations in a pool of worker processes.
+
+Each worker process holds a case_utils.case_validate.Validator, so the ontology graph is prepared once per worker rather than once per validation.  A worker process reports when its Validator is built, and validation timeouts count only the time after that.  A validation that is cancelled or times out while running has its worker process terminated, and a replacement worker is started for the next validation.  Warnings issued in a worker, such as NonExistentCDOConceptWarning, are re-issued in the calling process.
+"""
+
+__version__ = "0.1.0"
+
+import asyncio
+import concurrent.futures
+import concurrent.futures.process
+import logging
+import multiprocessing
+import multiprocessing.connection
+import multiprocessing.context
+import os
+import warnings
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+import rdflib
+
+from case_utils.case_validate import Validator
+from case_utils.case_validate.validate_types import ValidationResult
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+DataGraphInput = Union[rdflib.Graph, List[str], str]
+"""
+The data graph argument of Validator.validate: a graph, a file path, or a list of file paths.
+"""
+
+# Keyword arguments of Validator.validate that can be passed to a
+# worker process.  result_writers are excluded, as they would write in
+# the worker process.
+_CALL_KWARGS = {
+    "max_results",
+    "max_results_per_shape",
+    "profile_shapes",
+    "sample_fraction",
+    "sample_seed",
+    "sample_size",
+}
+
+# Keyword arguments of Validator.validate, which Validator would pass on
+# to pySHACL, which would ignore them.
+_VALIDATE_KWARGS = _CALL_KWARGS | {"result_writers"}
+
+_WorkerResponse = Tuple[
+    Optional[ValidationResult],
+    List[Tuple[Type[Warning], str]],
+    Optional[BaseException],
+]
+
+
+def _terminate_new_worker(future: "concurrent.futures.Future[_Worker]") -> None:
+    """
+    Terminate the worker process started for a validation that was cancelled while the process was being started.
+    """
+    if future.cancelled() or future.exception() is not None:
+        return
+    _logger.debug("Terminating validation worker process of cancelled validation.")
+    future.result().terminate()
+
+
+def _worker_main(
+    conn: multiprocessing.connection.Connection,
+    validator_args: Tuple[Any, ...],
+    validator_kwargs: Dict[str, Any],
+) -> None:
+    """
+    The main loop of a worker process.  Once the Validator is built, or has failed to build, None is sent on conn.  Each request received on conn is a (data_graph, call_kwargs) tuple, answered with a (validation_result, warnings, exception) tuple.  None ends the loop.
+    """
+    validator: Optional[Validator] = None
+    validator_error: Optional[BaseException] = None
+    try:
+        validator = Validator(*validator_args, **validator_kwargs)
+    except Exception as e:
+        validator_error = e
+    # The Validator error, if any, is raised for each request.
+    conn.send(None)
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        data_graph, call_kwargs = request
+
+        response: _WorkerResponse
+        with warnings.catch_warnings(record=True) as warning_messages:
+            warnings.simplefilter("always")
+            try:
+                if validator is None:
+                    assert validator_error is not None
+                    raise validator_error
+                validation_result = validator.validate(data_graph, **call_kwargs)
+                response = (validation_result, [], None)
+            except Exception as e:
+                response = (None, [], e)
+        response[1].extend((x.category, str(x.message)) for x in warning_messages)
+
+        try:
+            conn.send(response)
+        except Exception as e:
+            # Report errors in pickling the response, e.g. from an
+            # exception that cannot be pickled.
+            conn.send((None, response[1], RuntimeError(repr(e))))
+    conn.close()
+
+
+class _Worker:
+    def __init__(
+        self,
+        mp_context: multiprocessing.context.BaseContext,
+        validator_args: Tuple[Any, ...],
+        validator_kwargs: Dict[str, Any],
+    ) -> None:
+        self._conn, child_conn = mp_context.Pipe()
+        self._process = mp_context.Process(  # type: ignore[attr-defined]
+            target=_worker_main,
+            args=(child_conn, validator_args, validator_kwargs),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+
+    def wait_ready(self) -> None:
+        """
+        Wait for the worker process to build its Validator.  This blocks, so it is called in a thread.
+        """
+        try:
+            self._conn.recv()
+        except (EOFError, OSError):
+            raise concurrent.futures.process.BrokenProcessPool(
+                "A validation worker process exited unexpectedly."
+            )
+
+    def run(self, request: Tuple[DataGraphInput, Dict[str, Any]]) -> _WorkerResponse:
+        """
+        Send a request and wait for its response.  This blocks, so it is called in a thread.
+        """
+        try:
+            self._conn.send(request)
+            response: _WorkerResponse = self._conn.recv()
+        except (EOFError, OSError):
+            raise concurrent.futures.process.BrokenProcessPool(
+                "A validation worker process exited unexpectedly."
+            )
+        return response
+
+    def close(self) -> None:
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join()
+        self._conn.close()
+
+    def terminate(self) -> None:
+        self._process.terminate()
+        self._process.join()
+        self._conn.close()
+
+
+class AsyncValidator:
+    """
+    This class validates data graphs from asyncio code, in a pool of worker processes that each hold a Validator constructed with the given arguments.
+
+    At most max_workers validations run at once.  Further calls to validate wait for a worker to become free, so callers feel back-pressure rather than queuing unbounded work.  The pool should be closed with aclose, or used as an async context manager.
+
+    :param *args: The positional arguments to pass to Validator.
+    :param max_workers: The maximum number of worker processes, and so of concurrent validations.  If None, the number of CPUs is used.
+    :param mp_context: The multiprocessing context used to start worker processes.  If None, the "spawn" context is used, as forking a process running an event loop is unsafe.
+    :param **kwargs: The keyword arguments to pass to Validator, e.g. case_version or allow_warnings.  Keyword arguments of Validator.validate are passed to AsyncValidator.validate instead.
+    :raises TypeError: If a keyword argument of Validator.validate is given.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        max_workers: Optional[int] = None,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+        **kwargs: Any,
+    ) -> None:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive.")
+        for key in kwargs:
+            if key in _VALIDATE_KWARGS:
+                raise TypeError(
+                    "AsyncValidator got keyword argument %r, which is an argument of AsyncValidator.validate."
+                    % key
+                )
+        self.max_workers = max_workers
+        self._mp_context = (
+            multiprocessing.get_context("spawn") if mp_context is None else mp_context
+        )
+        self._validator_args = args
+        self._validator_kwargs = kwargs
+
+        self._closed = False
+        self._idle_workers: List[_Worker] = []
+        self._busy_workers: Set[_Worker] = set()
+        # The semaphore is created on first use, so it belongs to the
+        # running event loop.
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Each running validation has a thread waiting on its worker.
+        self._threads = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="case_validate"
+        )
+
+    async def __aenter__(self) -> "AsyncValidator":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _new_worker(self) -> _Worker:
+        """
+        Start a worker process, and wait for it to build its Validator.  This blocks, so it is called in a thread.
+        """
+        worker = _Worker(self._mp_context, self._validator_args, self._validator_kwargs)
+        try:
+            worker.wait_ready()
+        except BaseException:
+            worker.terminate()
+            raise
+        return worker
+
+    async def validate(
+        self,
+        data_graph: DataGraphInput,
+        *,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> ValidationResult:
+        """
+        Validate a data graph in a worker process.
+
+        :param data_graph: See Validator.validate.  A graph is pickled to reach the worker process, so file paths are cheaper to pass.
+        :param timeout: If not None, the number of seconds to allow the validation to run.  On timeout, the worker process is terminated, and asyncio.TimeoutError is raised.  Time spent waiting for a free worker, or for a new worker to build its Validator, does not count.
+        :param **kwargs: max_results, max_results_per_shape, profile_shapes, sample_fraction, sample_seed, or sample_size, as for Validator.validate.
+        :return: The validation result object containing the defined properties.
+        """
+        if self._closed:
+            raise RuntimeError("AsyncValidator is closed.")
+        for key in kwargs:
+            if key not in _CALL_KWARGS:
+                raise TypeError(
+                    "AsyncValidator.validate got an unsupported keyword argument %r."
+                    % key
+                )
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            if len(self._idle_workers) > 0:
+                worker = self._idle_workers.pop()
+            else:
+                new_worker = self._threads.submit(self._new_worker)
+                try:
+                    worker = await asyncio.wrap_future(new_worker)
+                except asyncio.CancelledError:
+                    # Cancellation does not stop the thread starting the
+                    # worker process, so the process is terminated once
+                    # ready.
+                    new_worker.add_done_callback(_terminate_new_worker)
+                    raise
+            self._busy_workers.add(worker)
+            healthy = False
+            try:
+                response = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        self._threads, worker.run, (data_graph, kwargs)
+                    ),
+                    timeout,
+                )
+                healthy = True
+            finally:
+                self._busy_workers.discard(worker)
+                if healthy and not self._closed:
+                    self._idle_workers.append(worker)
+                else:
+                    # The worker might still be validating, so it is
+                    # stopped rather than reused.
+                    _logger.debug("Terminating validation worker process.")
+                    await loop.run_in_executor(None, worker.terminate)
+
+        validation_result, warning_messages, error = response
+        for category, message in warning_messages:
+            warnings.warn(message, category)
+        if error is not None:
+            raise error
+        assert validation_result is not None
+        return validation_result
+
+    async def validate_batch(
+        self,
+        data_graphs: Iterable[DataGraphInput],
+        *,
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Tuple[int, Union[ValidationResult, BaseException]]]:
+        """
+        Validate many data graphs, yielding results as they finish, which might not be in input order.
+
+        Data graphs are drawn from the iterable only as workers become free, so a long or unbounded iterable is not read ahead.  If the consumer stops iterating, validations still running are cancelled.
+
+        :param data_graphs: The data graphs, as for validate.
+        :param return_exceptions: If True, exceptions (including asyncio.TimeoutError) are yielded in place of results, as with asyncio.gather.  Otherwise, the first exception cancels the remaining validations and is raised.
+        :param timeout: The timeout of each validation, as for validate.
+        :param **kwargs: As for validate.
+        :return: An async iterator of (index, result) tuples, index being the position of the data graph in data_graphs.
+        """
+        data_graph_iterator = enumerate(data_graphs)
+        pending: Dict["asyncio.Future[ValidationResult]", int] = dict()
+
+        def _submit() -> bool:
+            try:
+                index, data_graph = next(data_graph_iterator)
+            except StopIteration:
+                return False
+            task = asyncio.ensure_future(
+                self.validate(data_graph, timeout=timeout, **kwargs)
+            )
+            pending[task] = index
+            return True
+
+        try:
+            while len(pending) < self.max_workers and _submit():
+                pass
+            while len(pending) > 0:
+                done, _ = await asyncio.wait(
+                    set(pending), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=lambda x: pending[x]):
+                    index = pending.pop(task)
+                    _submit()
+                    error = task.exception()
+                    if error is None:
+                        yield index, task.result()
+                    elif return_exceptions:
+                        yield index, error
+                    else:
+                        raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if len(pending) > 0:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """
+        Stop the worker processes.  Validations still running have their workers terminated.
+        """
+        self._closed = True
+        loop = asyncio.get_running_loop()
+        idle_workers = self._idle_workers
+        self._idle_workers = []
+        for worker in idle_workers:
+            await loop.run_in_executor(None, worker.close)
+        for worker in list(self._busy_workers):
+            await loop.run_in_executor(None, worker.terminate)
+        self._threads.shutdown(wait=False)
+
+
+def _split_kwargs(kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    validator_kwargs = {k: v for (k, v) in kwargs.items() if k not in _CALL_KWARGS}
+    call_kwargs = {k: v for (k, v) in kwargs.items() if k in _CALL_KWARGS}
+    return validator_kwargs, call_kwargs
+
+
+async def validate_async(
+    input_file: DataGraphInput,
+    *args: Any,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> ValidationResult:
+    """
+    Validate a data graph in a worker process, without blocking the event loop.  The worker process is started for this call, so to validate many data graphs, use AsyncValidator or validate_batch_async instead.
+
+    :param input_file: See Validator.validate.
+    :param *args: The positional arguments to pass to the underlying pyshacl.validate function.
+    :param timeout: See AsyncValidator.validate.
+    :param **kwargs: The keyword arguments of Validator and Validator.validate, other than result_writers.
+    :return: The validation result object containing the defined properties.
+    """
+    validator_kwargs, call_kwargs = _split_kwargs(kwargs)
+    async with AsyncValidator(*args, max_workers=1, **validator_kwargs) as validator:
+        return await validator.validate(input_file, timeout=timeout, **call_kwargs)
+
+
+async def validate_batch_async(
+    input_files: Iterable[DataGraphInput],
+    *args: Any,
+    max_workers: Optional[int] = None,
+    return_exceptions: bool = False,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> AsyncIterator[Tuple[int, Union[ValidationResult, BaseException]]]:
+    """
+    Validate many data graphs in a pool of worker processes, yielding results as they finish.  See AsyncValidator.validate_batch.
+
+    :param input_files: The data graphs, as for Validator.validate.
+    :param *args: The positional arguments to pass to the underlying pyshacl.validate function.
+    :param max_workers: See AsyncValidator.
+    :param return_exceptions: See AsyncValidator.validate_batch.
+    :param timeout: See AsyncValidator.validate.
+    :param **kwargs: The keyword arguments of Validator and Validator.validate, other than result_writers.
+    """
+    validator_kwargs, call_kwargs = _split_kwargs(kwargs)
+    async with AsyncValidator(
+        *args, max_workers=max_workers, **validator_kwargs
+    ) as validator:
+        async for item in validator.validate_batch(
+            input_files,
+            return_exceptions=return_exceptions,
+            timeout=timeout,
+            **call_kwargs,
+        ):
+            yield item
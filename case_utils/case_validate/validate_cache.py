@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module provides a content-addressed cache of validation results, so unchanged inputs need not be re-validated.
+
+Cache entries are keyed on the SHA-256 digests of the input files and supplemental ontology files, the resolved CASE version, and the arguments that affect validation results.  Each entry is a JSON file in the cache directory.  When the directory exceeds its size limit, least recently used entries are removed.
+"""
+
+__version__ = "0.1.0"
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import pyshacl
+
+import case_utils
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+"""
+The default size limit of a cache directory, in bytes.
+"""
+
+
+def _file_digest(file_path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as in_fh:
+        for chunk in iter(lambda: in_fh.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _is_cacheable_value(value: Any) -> bool:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_cacheable_value(x) for x in value)
+    return False
+
+
+def get_cache_key(
+    input_files: List[str],
+    case_version: str,
+    supplemental_graphs: Optional[List[str]],
+    result_arguments: Dict[str, Any],
+) -> Optional[str]:
+    """
+    Compute the cache key of a validation run.
+
+    :param input_files: Paths to the data graph files, in the order they are loaded.
+    :param case_version: The resolved CASE version, e.g. "case-1.3.0", or "none".
+    :param supplemental_graphs: Paths to the supplemental ontology graph files, in the order they are loaded.
+    :param result_arguments: The other arguments that affect validation results.  Values must be None, or JSON scalars, or lists of those.
+    :return: A hexadecimal SHA-256 digest, or None if some argument value cannot be keyed by content (e.g. an in-memory graph).
+    """
+    for value in result_arguments.values():
+        if not _is_cacheable_value(value):
+            _logger.debug("Not caching, due to an argument that cannot be keyed.")
+            return None
+
+    key_record = {
+        "case_utils": case_utils.__version__,
+        "pyshacl": pyshacl.__version__,
+        "input_files": [_file_digest(x) for x in input_files],
+        "case_version": case_version,
+        "supplemental_graphs": [_file_digest(x) for x in supplemental_graphs or []],
+        "arguments": result_arguments,
+    }
+    key_json = json.dumps(key_record, sort_keys=True)
+    return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+
+class ValidationCache:
+    """
+    This class stores validation results as JSON files in a directory, evicting least recently used entries when the directory exceeds max_size bytes.  Entries are written atomically, so a cache directory can be shared by concurrent processes.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        if max_size < 0:
+            raise ValueError("Cache size limit must be non-negative.")
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        :return: The stored entry, or None on a cache miss.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r") as in_fh:
+                entry: Dict[str, Any] = json.load(in_fh)
+        except FileNotFoundError:
+            _logger.debug("Validation cache miss for key %s.", key)
+            return None
+        except ValueError:
+            _logger.warning("Discarding corrupt validation cache entry %r.", entry_path)
+            self._remove(entry_path)
+            return None
+        _logger.debug("Validation cache hit for key %s.", key)
+        # Mark the entry as recently used, for eviction.
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            pass
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Store an entry, and then evict entries until the cache is within its size limit.
+        """
+        out_fd, tmp_path = tempfile.mkstemp(
+            dir=self.cache_dir, prefix=".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(out_fd, "w") as out_fh:
+                json.dump(entry, out_fh)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        _logger.debug("Stored validation cache entry for key %s.", key)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache is within its size limit.
+        """
+        entries = []
+        total_size = 0
+        with os.scandir(self.cache_dir) as dir_entries:
+            for dir_entry in dir_entries:
+                if not dir_entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat_result = dir_entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append(
+                    (stat_result.st_mtime, stat_result.st_size, dir_entry.path)
+                )
+                total_size += stat_result.st_size
+        for _, entry_size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            _logger.debug("Evicting validation cache entry %r.", entry_path)
+            self._remove(entry_path)
+            total_size -= entry_size
+
+    @staticmethod
+    def _remove(file_path: str) -> None:
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
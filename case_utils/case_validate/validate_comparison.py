@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module compares the validation reports of one data graph validated against several CASE versions, to show which validation results are specific to a version.
+
+Validation results are matched on their focus node, result path, value, severity, source constraint component, and source shape.  Blank node paths and shapes are matched as unknown, as they are not shared between the ontology graphs of different versions.  Messages are not matched, as their wording can change between versions.
+"""
+
+__version__ = "0.1.0"
+
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+import rdflib
+
+from case_utils.case_validate.validate_types import ValidationResult
+
+NS_SH = rdflib.SH
+
+ResultKey = Tuple[
+    Optional[rdflib.term.Node],
+    Optional[rdflib.term.Node],
+    Optional[rdflib.term.Node],
+    Optional[rdflib.term.Node],
+    Optional[rdflib.term.Node],
+    Optional[rdflib.term.Node],
+]
+
+_KEY_PREDICATES = (
+    NS_SH.focusNode,
+    NS_SH.resultPath,
+    NS_SH.value,
+    NS_SH.resultSeverity,
+    NS_SH.sourceConstraintComponent,
+    NS_SH.sourceShape,
+)
+
+_KEY_LABELS = (
+    "Focus node",
+    "Path",
+    "Value",
+    "Severity",
+    "Constraint",
+    "Shape",
+)
+
+
+def get_result_keys(report_graph: rdflib.Graph) -> Set[ResultKey]:
+    """
+    :param report_graph: A SHACL validation report graph.
+    :return: The keys of the validation results in the report, matchable across reports.
+    """
+    result_keys: Set[ResultKey] = set()
+    for n_result in report_graph.objects(None, NS_SH.result, unique=True):
+        values: List[Optional[rdflib.term.Node]] = []
+        for predicate in _KEY_PREDICATES:
+            value = report_graph.value(n_result, predicate)
+            if predicate != NS_SH.focusNode and predicate != NS_SH.value:
+                # Paths and shapes from the ontology graph.
+                if isinstance(value, rdflib.BNode):
+                    value = None
+            values.append(value)
+        result_keys.add(
+            (values[0], values[1], values[2], values[3], values[4], values[5])
+        )
+    return result_keys
+
+
+class VersionComparison:
+    """
+    This class records which validation results are reported with every compared CASE version, and which only with some.
+
+    :param version_results: Validation results, keyed by CASE version, in the order to report them.  Each result's graph must be an rdflib.Graph.
+    """
+
+    def __init__(self, version_results: Mapping[str, ValidationResult]) -> None:
+        self.versions: List[str] = list(version_results.keys())
+        self.conforms: Dict[str, bool] = dict()
+        self.result_keys: Dict[str, Set[ResultKey]] = dict()
+        self.namespace_manager: Optional[rdflib.namespace.NamespaceManager] = None
+        for version, validation_result in version_results.items():
+            if not isinstance(validation_result.graph, rdflib.Graph):
+                raise TypeError(
+                    "Expected rdflib.Graph report for version %r, received %s."
+                    % (version, type(validation_result.graph))
+                )
+            self.conforms[version] = validation_result.conforms
+            self.result_keys[version] = get_result_keys(validation_result.graph)
+            if self.namespace_manager is None:
+                self.namespace_manager = validation_result.graph.namespace_manager
+
+        self.common: Set[ResultKey] = set()
+        if len(self.versions) > 0:
+            self.common = set.intersection(*self.result_keys.values())
+
+    def specific(self, version: str) -> Set[ResultKey]:
+        """
+        :return: The validation results reported with this version, but not with every version.
+        """
+        return self.result_keys[version] - self.common
+
+    def to_text(self) -> str:
+        lines: List[str] = ["Version comparison:"]
+        for version in self.versions:
+            lines.append(
+                "  %s: Conforms: %s, %d results, %d not reported with every version."
+                % (
+                    version,
+                    self.conforms[version],
+                    len(self.result_keys[version]),
+                    len(self.specific(version)),
+                )
+            )
+        for version in self.versions:
+            specific = self.specific(version)
+            if len(specific) == 0:
+                continue
+            lines.append(
+                "Results reported with %s, but not with every version:" % version
+            )
+            for result_key in sorted(specific, key=self._key_text):
+                lines.append("  " + self._key_text(result_key))
+        return "\n".join(lines) + "\n"
+
+    def _key_text(self, result_key: ResultKey) -> str:
+        return ", ".join(
+            "%s: %s" % (label, value.n3(self.namespace_manager))
+            for (label, value) in zip(_KEY_LABELS, result_key)
+            if value is not None
+        )
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module provides hooks into pySHACL's evaluation of individual shapes.
+
+pySHACL does not provide a hook for observing or steering the evaluation of individual shapes, so while any hook is active, the methods pyshacl.shape.Shape.validate and pyshacl.shape.Shape.focus_nodes are wrapped.  Hooks are only called for the thread (or asyncio task) that activated them; other callers of pySHACL in the process pass through the wrappers to pySHACL's implementation.  The wrappers are removed when no hook remains active.
+
+The wrappers depend on the parameters of those methods, which are not part of pySHACL's public API.  The wrappers were verified against pySHACL 0.40.  If the installed pySHACL's methods take other parameters, hooks are not activated, and UnsupportedPySHACLWarning is issued, rather than letting hooks misread arguments.  Validation then runs without the features built on hooks.
+"""
+
+__version__ = "0.1.0"
+
+import contextlib
+import contextvars
+import inspect
+import threading
+import warnings
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+import pyshacl.shape
+
+from case_utils.case_validate.validate_types import UnsupportedPySHACLWarning
+
+ShapeValidateResult = Tuple[bool, Any]
+"""
+The return type of pyshacl.shape.Shape.validate: a conformance flag, and a list of reports.
+"""
+
+
+class ShapeValidationHook:
+    """
+    Base class for hooks.  Subclasses override the methods of interest.
+    """
+
+    def validate(
+        self,
+        shape: pyshacl.shape.Shape,
+        target_graph: Any,
+        focus: Any,
+        validate_next: Callable[[Any], ShapeValidateResult],
+    ) -> ShapeValidateResult:
+        """
+        Called in place of shape.validate.
+
+        :param shape: The shape being evaluated.
+        :param target_graph: The data graph.
+        :param focus: The focus nodes passed to shape.validate, or None if the shape is to find its own focus nodes from its targets.
+        :param validate_next: Calls the next hook, or pySHACL's implementation, with the given focus nodes.
+        """
+        return validate_next(focus)
+
+    def observe_focus_nodes(self, shape: pyshacl.shape.Shape, focus_nodes: Any) -> None:
+        """
+        Called with the result of shape.focus_nodes.
+        """
+        pass
+
+
+_SHAPE_METHOD_PARAMETERS = {
+    "focus_nodes": ("self", "data_graph", "debug"),
+    "validate": ("self", "executor", "target_graph", "focus", "_evaluation_path"),
+}
+
+
+def check_shape_api() -> bool:
+    """
+    Check that the methods of pyshacl.shape.Shape that hooks wrap take the parameters the wrappers were written for.
+
+    :return: True if they do.  Otherwise, e.g. with a pySHACL release the wrappers do not support, UnsupportedPySHACLWarning is issued, and False is returned.
+    """
+    for method_name, expected_parameters in sorted(_SHAPE_METHOD_PARAMETERS.items()):
+        method = getattr(pyshacl.shape.Shape, method_name)
+        if method_name == "validate" and method is _hooked_validate:
+            method = _original_validate
+        elif method_name == "focus_nodes" and method is _hooked_focus_nodes:
+            method = _original_focus_nodes
+        computed_parameters = tuple(inspect.signature(method).parameters)
+        if computed_parameters != expected_parameters:
+            warnings.warn(
+                "pyshacl.shape.Shape.%s has parameters %r, rather than the parameters %r that case_utils shape validation hooks support.  Result streaming, result limits, shape profiling, focus node sampling, and constraint pre-checks are turned off."
+                % (method_name, computed_parameters, expected_parameters),
+                UnsupportedPySHACLWarning,
+            )
+            return False
+    return True
+
+
+_active_hooks: contextvars.ContextVar[
+    Tuple[ShapeValidationHook, ...]
+] = contextvars.ContextVar("_active_hooks", default=tuple())
+
+_patch_lock = threading.Lock()
+_patch_count = 0
+_original_validate: Optional[Callable[..., Any]] = None
+_original_focus_nodes: Optional[Callable[..., Any]] = None
+
+
+def _hooked_validate(
+    self: pyshacl.shape.Shape,
+    executor: Any,
+    target_graph: Any,
+    focus: Any = None,
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    assert _original_validate is not None
+    hooks = _active_hooks.get()
+    if len(hooks) == 0 or self.deactivated:
+        return _original_validate(self, executor, target_graph, focus, *args, **kwargs)
+
+    def _validate_next(hook_index: int, _focus: Any) -> ShapeValidateResult:
+        assert _original_validate is not None
+        if hook_index == len(hooks):
+            return _original_validate(  # type: ignore
+                self, executor, target_graph, _focus, *args, **kwargs
+            )
+        return hooks[hook_index].validate(
+            self,
+            target_graph,
+            _focus,
+            lambda x: _validate_next(hook_index + 1, x),
+        )
+
+    return _validate_next(0, focus)
+
+
+def _hooked_focus_nodes(self: pyshacl.shape.Shape, *args: Any, **kwargs: Any) -> Any:
+    assert _original_focus_nodes is not None
+    focus_nodes = _original_focus_nodes(self, *args, **kwargs)
+    for hook in _active_hooks.get():
+        hook.observe_focus_nodes(self, focus_nodes)
+    return focus_nodes
+
+
+def _install_wrappers() -> bool:
+    """
+    :return: True if the wrappers are installed, and so are to be uninstalled.
+    """
+    global _original_focus_nodes
+    global _original_validate
+    global _patch_count
+    with _patch_lock:
+        if _patch_count == 0:
+            if not check_shape_api():
+                return False
+            _original_validate = pyshacl.shape.Shape.validate
+            _original_focus_nodes = pyshacl.shape.Shape.focus_nodes
+            setattr(pyshacl.shape.Shape, "validate", _hooked_validate)
+            setattr(pyshacl.shape.Shape, "focus_nodes", _hooked_focus_nodes)
+        _patch_count += 1
+    return True
+
+
+def _uninstall_wrappers() -> None:
+    global _patch_count
+    with _patch_lock:
+        _patch_count -= 1
+        if _patch_count == 0:
+            setattr(pyshacl.shape.Shape, "validate", _original_validate)
+            setattr(pyshacl.shape.Shape, "focus_nodes", _original_focus_nodes)
+
+
+@contextlib.contextmanager
+def shape_validation_hook(hook: ShapeValidationHook) -> Iterator[bool]:
+    """
+    Activate a hook for shapes evaluated by pySHACL within this context.  Hooks activated earlier are called first, and so wrap hooks activated later.
+
+    :return: True if the hook is active.  False if the installed pySHACL is not supported (see check_shape_api), in which case the hook is never called.
+    """
+    if not _install_wrappers():
+        yield False
+        return
+    token = _active_hooks.set(_active_hooks.get() + (hook,))
+    try:
+        yield True
+    finally:
+        _active_hooks.reset(token)
+        _uninstall_wrappers()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module caps the number of results pySHACL reports, using the hooks in case_utils.case_validate.validate_hooks.
+
+Shapes are evaluated against their focus nodes in chunks, so that evaluation of a shape can stop once a cap is reached.  If the results found so far do not determine that the data graph is non-conformant (e.g. if they are all of allowed severities), evaluation continues without recording results until non-conformance is found or the focus nodes are exhausted.  Hence, the conformance of a capped validation run is the same as that of an uncapped run.
+"""
+
+__version__ = "0.1.0"
+
+import contextlib
+import logging
+import os
+from typing import Any, Callable, Iterator, List, Optional, Set
+
+import pyshacl.shape
+import rdflib
+
+from case_utils.case_validate.validate_hooks import (
+    ShapeValidateResult,
+    ShapeValidationHook,
+    shape_validation_hook,
+)
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+# Evaluating a shape costs some overhead per call, so focus nodes are
+# not passed in chunks smaller than this.
+_MINIMUM_CHUNK_SIZE = 100
+
+
+class ResultLimiter(ShapeValidationHook):
+    """
+    This class caps the number of validation results, in total and per top-level shape.  Results of shapes nested under a top-level shape (e.g. by sh:property) count towards the top-level shape's cap.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_results: Optional[int] = None,
+        max_results_per_shape: Optional[int] = None,
+    ) -> None:
+        # pySHACL requires a non-conformant report to have at least one
+        # result.
+        for limit in (max_results, max_results_per_shape):
+            if limit is not None and limit < 1:
+                raise ValueError("Result limits must be positive.")
+        self.max_results = max_results
+        self.max_results_per_shape = max_results_per_shape
+
+        self.n_results = 0
+        "The number of results kept."
+
+        self.capped_shapes: Set[rdflib.term.Node] = set()
+        "The top-level shapes that had results omitted, or were not evaluated."
+
+        self._depth = 0
+        self._non_conformant = False
+
+    @property
+    def capped(self) -> bool:
+        """
+        True if any results were omitted.
+        """
+        return len(self.capped_shapes) > 0
+
+    def _budget(self, n_shape_results: int) -> Optional[int]:
+        budgets: List[int] = []
+        if self.max_results is not None:
+            budgets.append(self.max_results - self.n_results - n_shape_results)
+        if self.max_results_per_shape is not None:
+            budgets.append(self.max_results_per_shape - n_shape_results)
+        return min(budgets) if len(budgets) > 0 else None
+
+    def validate(
+        self,
+        shape: pyshacl.shape.Shape,
+        target_graph: Any,
+        focus: Any,
+        validate_next: Callable[[Any], ShapeValidateResult],
+    ) -> ShapeValidateResult:
+        # Only top-level shapes, which find their own focus nodes, are
+        # limited.
+        if focus is not None or self._depth > 0:
+            self._depth += 1
+            try:
+                return validate_next(focus)
+            finally:
+                self._depth -= 1
+
+        self._depth += 1
+        try:
+            # Focus nodes are sorted so the kept results do not depend
+            # on set iteration order.
+            focus_list = sorted(
+                shape.focus_nodes(target_graph),  # type: ignore[no-untyped-call]
+                key=lambda x: (type(x).__name__, str(x)),
+            )
+            conforms = True
+            kept_reports: List[Any] = []
+            offset = 0
+            shape_capped = False
+            while offset < len(focus_list):
+                budget = self._budget(len(kept_reports))
+                if budget is not None and budget <= 0:
+                    break
+                chunk_size = (
+                    len(focus_list)
+                    if budget is None
+                    else max(budget, _MINIMUM_CHUNK_SIZE)
+                )
+                chunk = focus_list[offset : offset + chunk_size]
+                offset += len(chunk)
+                chunk_conforms, chunk_reports = validate_next(chunk)
+                conforms = conforms and chunk_conforms
+                if budget is not None and len(chunk_reports) > budget:
+                    kept_reports.extend(chunk_reports[:budget])
+                    shape_capped = True
+                    break
+                kept_reports.extend(chunk_reports)
+
+            # Continue only as far as needed to determine conformance.
+            while offset < len(focus_list) and conforms and not self._non_conformant:
+                chunk = focus_list[offset : offset + _MINIMUM_CHUNK_SIZE]
+                offset += len(chunk)
+                chunk_conforms, chunk_reports = validate_next(chunk)
+                conforms = conforms and chunk_conforms
+                if len(chunk_reports) > 0:
+                    shape_capped = True
+            # Focus nodes left unevaluated might have had results.
+            if offset < len(focus_list):
+                shape_capped = True
+        finally:
+            self._depth -= 1
+
+        if shape_capped:
+            _logger.debug("Capped results of shape %s.", shape.node)
+            self.capped_shapes.add(shape.node)
+        self.n_results += len(kept_reports)
+        self._non_conformant = self._non_conformant or not conforms
+        return conforms, kept_reports
+
+
+@contextlib.contextmanager
+def result_limits(
+    *,
+    max_results: Optional[int] = None,
+    max_results_per_shape: Optional[int] = None,
+) -> Iterator[ResultLimiter]:
+    """
+    Cap the number of results reported by pySHACL validation runs within this context.
+
+    :param max_results: The maximum number of results to report in total.  If None, there is no limit.
+    :param max_results_per_shape: The maximum number of results to report for each top-level shape.  If None, there is no limit.
+    :return: The ResultLimiter, which records whether results were omitted.
+    """
+    limiter = ResultLimiter(
+        max_results=max_results, max_results_per_shape=max_results_per_shape
+    )
+    with shape_validation_hook(limiter):
+        yield limiter
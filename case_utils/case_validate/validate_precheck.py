@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module provides bulk pre-checks of the commonest SHACL constraints, to spare pySHACL evaluating focus nodes that conform.
+
+Most shapes of the CASE and UCO ontologies are property shapes with a simple predicate path, constrained only by sh:datatype, sh:class, sh:minCount, sh:maxCount, and sh:nodeKind.  pySHACL evaluates each such constraint for each focus node, building its value nodes along the way.  While a pre-check is active, such shapes are instead checked against indexes built once per validation run: for each predicate, the values of each subject, and for each class, its instances.  Only focus nodes that might not conform are passed on to pySHACL, so every validation result is still produced by pySHACL, and the report is unchanged.
+
+The pre-checks are conservative: a value that pySHACL might judge differently from the simple reading (e.g. a literal of a datatype pySHACL checks for ill-typing) leaves its focus node to pySHACL.
+"""
+
+__version__ = "0.1.0"
+
+import contextlib
+import datetime
+import decimal
+import logging
+import os
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+import pyshacl.shape
+import rdflib
+from pyshacl.constraints import ALL_CONSTRAINT_PARAMETERS
+
+from case_utils.case_validate.validate_hooks import (
+    ShapeValidateResult,
+    ShapeValidationHook,
+    shape_validation_hook,
+)
+
+NS_RDF = rdflib.RDF
+NS_RDFS = rdflib.RDFS
+NS_SH = rdflib.SH
+NS_XSD = rdflib.XSD
+
+# "class" is a Python keyword, so it is not an attribute of the namespace.
+NS_SH_CLASS = rdflib.URIRef(str(NS_SH) + "class")
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+_SIMPLE_PARAMETERS = frozenset(
+    {
+        NS_SH.datatype,
+        NS_SH_CLASS,
+        NS_SH.maxCount,
+        NS_SH.minCount,
+        NS_SH.nodeKind,
+    }
+)
+
+_CONSTRAINT_PARAMETERS = frozenset(ALL_CONSTRAINT_PARAMETERS)
+
+# The node kinds each kind of term matches.
+_BNODE_KINDS = frozenset(
+    {NS_SH.BlankNode, NS_SH.BlankNodeOrIRI, NS_SH.BlankNodeOrLiteral}
+)
+_IRI_KINDS = frozenset({NS_SH.IRI, NS_SH.BlankNodeOrIRI, NS_SH.IRIOrLiteral})
+_LITERAL_KINDS = frozenset(
+    {NS_SH.Literal, NS_SH.BlankNodeOrLiteral, NS_SH.IRIOrLiteral}
+)
+
+# The Python types of the values of literals that pySHACL's
+# DatatypeConstraintComponent judges well-typed, for the datatypes it
+# checks.  Values of literals of other datatypes are not checked.
+_DATATYPE_VALUE_TYPES: Dict[rdflib.term.Node, Tuple[Type[Any], ...]] = {
+    NS_RDF.langString: (str, bytes),
+    NS_XSD.boolean: (bool,),
+    NS_XSD.date: (datetime.date,),
+    NS_XSD.dateTime: (datetime.datetime,),
+    NS_XSD.decimal: (decimal.Decimal,),
+    NS_XSD.float: (float,),
+    NS_XSD.integer: (int,),
+    NS_XSD.string: (str, bytes),
+    NS_XSD.time: (datetime.time,),
+}
+
+
+class _ShapeCheck:
+    """
+    The simple constraints of one shape.  path is None for a node shape, whose value node is its focus node.
+    """
+
+    def __init__(
+        self,
+        path: Optional[rdflib.URIRef],
+        datatype: Optional[rdflib.term.Node],
+        classes: List[rdflib.term.Node],
+        min_count: Optional[int],
+        max_count: Optional[int],
+        node_kind: Optional[rdflib.term.Node],
+    ) -> None:
+        self.path = path
+        self.datatype = datatype
+        self.classes = classes
+        self.min_count = min_count
+        self.max_count = max_count
+        self.node_kind = node_kind
+
+
+def _compile_shape(shape: pyshacl.shape.Shape) -> Optional[_ShapeCheck]:
+    """
+    :return: The simple constraints of the shape, or None if the shape has any other constraint, or any constraint pySHACL would reject.
+    """
+    objects: Dict[rdflib.term.Node, List[rdflib.term.Node]] = dict()
+    for predicate, object in shape.sg.predicate_objects(shape.node):  # type: ignore[no-untyped-call]
+        if predicate not in _CONSTRAINT_PARAMETERS:
+            continue
+        if predicate not in _SIMPLE_PARAMETERS:
+            return None
+        objects.setdefault(predicate, []).append(object)
+    if len(objects) == 0:
+        return None
+    for predicate in [NS_SH.datatype, NS_SH.maxCount, NS_SH.minCount, NS_SH.nodeKind]:
+        if len(objects.get(predicate, [])) > 1:
+            return None
+    if len(shape.find_custom_constraints()) > 0:  # type: ignore[no-untyped-call]
+        return None
+
+    path: Optional[rdflib.URIRef] = None
+    if shape.is_property_shape:
+        _path = shape.path()  # type: ignore[no-untyped-call]
+        if not isinstance(_path, rdflib.URIRef):
+            return None
+        path = _path
+
+    counts: Dict[rdflib.term.Node, Optional[int]] = dict()
+    for predicate in [NS_SH.maxCount, NS_SH.minCount]:
+        counts[predicate] = None
+        if predicate in objects:
+            count = objects[predicate][0]
+            if not isinstance(count, rdflib.Literal) or not isinstance(
+                count.toPython(), int
+            ):
+                return None
+            counts[predicate] = int(count.toPython())
+
+    return _ShapeCheck(
+        path,
+        objects[NS_SH.datatype][0] if NS_SH.datatype in objects else None,
+        objects.get(NS_SH_CLASS, []),
+        counts[NS_SH.minCount],
+        counts[NS_SH.maxCount],
+        objects[NS_SH.nodeKind][0] if NS_SH.nodeKind in objects else None,
+    )
+
+
+def _datatype_conforms(value: rdflib.term.Node, datatype: rdflib.term.Node) -> bool:
+    """
+    :return: True if pySHACL's DatatypeConstraintComponent judges the value to match the datatype.  False if it does not, or might not.
+    """
+    if not isinstance(value, rdflib.Literal):
+        return False
+    if value.datatype == datatype:
+        if getattr(value, "ill_typed", None) is True:
+            return False
+    elif value.datatype is None:
+        # A plain literal matches xsd:string, and a language-tagged
+        # literal matches rdf:langString.
+        if value.language is None:
+            if datatype != NS_XSD.string:
+                return False
+        elif datatype != NS_RDF.langString:
+            return False
+    else:
+        return False
+    value_types = _DATATYPE_VALUE_TYPES.get(datatype)
+    if value_types is None:
+        return True
+    return isinstance(value.value, value_types)
+
+
+def _node_kind_conforms(value: rdflib.term.Node, node_kind: rdflib.term.Node) -> bool:
+    if isinstance(value, rdflib.BNode):
+        return node_kind in _BNODE_KINDS
+    if isinstance(value, rdflib.Literal):
+        return node_kind in _LITERAL_KINDS
+    if isinstance(value, rdflib.URIRef):
+        return node_kind in _IRI_KINDS
+    return False
+
+
+class ConstraintPrechecker(ShapeValidationHook):
+    """
+    This hook passes on to pySHACL only the focus nodes of simple shapes that might not conform.  It is meant for a single validation run, over an unchanging data graph.
+    """
+
+    def __init__(self) -> None:
+        self._checks: Dict[rdflib.term.Node, Optional[_ShapeCheck]] = dict()
+        self._path_values: Dict[
+            rdflib.term.Node, Dict[rdflib.term.Node, Set[rdflib.term.Node]]
+        ] = dict()
+        self._class_instances: Dict[
+            rdflib.term.Node, FrozenSet[rdflib.term.Node]
+        ] = dict()
+        self._target_graph: Any = None
+        self.n_focus_nodes = 0
+        self.n_focus_nodes_prechecked = 0
+
+    def _check(self, shape: pyshacl.shape.Shape) -> Optional[_ShapeCheck]:
+        if shape.node not in self._checks:
+            self._checks[shape.node] = _compile_shape(shape)
+        return self._checks[shape.node]
+
+    def _values(
+        self, path: rdflib.term.Node
+    ) -> Dict[rdflib.term.Node, Set[rdflib.term.Node]]:
+        """
+        :return: The values of each subject of the predicate, read in one pass over the predicate's triples.
+        """
+        if path not in self._path_values:
+            values: Dict[rdflib.term.Node, Set[rdflib.term.Node]] = dict()
+            for s, o in self._target_graph.subject_objects(path):
+                values.setdefault(s, set()).add(o)
+            self._path_values[path] = values
+        return self._path_values[path]
+
+    def _instances(self, n_class: rdflib.term.Node) -> FrozenSet[rdflib.term.Node]:
+        """
+        :return: The nodes that are typed with the class, or with any of its subclasses, in the data graph.  This matches pySHACL's reading of sh:class.
+        """
+        if n_class not in self._class_instances:
+            instances: Set[rdflib.term.Node] = set()
+            for n_subclass in self._target_graph.transitive_subjects(
+                NS_RDFS.subClassOf, n_class
+            ):
+                instances.update(self._target_graph.subjects(NS_RDF.type, n_subclass))
+            self._class_instances[n_class] = frozenset(instances)
+        return self._class_instances[n_class]
+
+    def _conforms(self, check: _ShapeCheck, focus_node: rdflib.term.Node) -> bool:
+        value_nodes: Set[rdflib.term.Node]
+        if check.path is None:
+            value_nodes = {focus_node}
+        else:
+            value_nodes = self._values(check.path).get(focus_node, set())
+
+        if check.min_count is not None and len(value_nodes) < check.min_count:
+            return False
+        if check.max_count is not None and len(value_nodes) > check.max_count:
+            return False
+        for value_node in value_nodes:
+            if check.node_kind is not None and not _node_kind_conforms(
+                value_node, check.node_kind
+            ):
+                return False
+            if check.datatype is not None and not _datatype_conforms(
+                value_node, check.datatype
+            ):
+                return False
+            for n_class in check.classes:
+                if isinstance(value_node, rdflib.Literal):
+                    return False
+                if value_node not in self._instances(n_class):
+                    return False
+        return True
+
+    def validate(
+        self,
+        shape: pyshacl.shape.Shape,
+        target_graph: Any,
+        focus: Any,
+        validate_next: Callable[[Any], ShapeValidateResult],
+    ) -> ShapeValidateResult:
+        check = self._check(shape)
+        if check is None:
+            return validate_next(focus)
+
+        if target_graph is not self._target_graph:
+            # pySHACL validates each graph of a dataset separately.
+            self._target_graph = target_graph
+            self._path_values = dict()
+            self._class_instances = dict()
+
+        focus_list: List[Any]
+        if focus is None:
+            focus_list = list(shape.focus_nodes(target_graph))  # type: ignore[no-untyped-call]
+        elif isinstance(focus, (rdflib.term.IdentifiedNode, rdflib.Literal)):
+            focus_list = [focus]
+        else:
+            focus_list = list(focus)
+
+        remaining = [x for x in focus_list if not self._conforms(check, x)]
+        self.n_focus_nodes += len(focus_list)
+        self.n_focus_nodes_prechecked += len(focus_list) - len(remaining)
+        if len(remaining) == 0:
+            return True, []
+        return validate_next(remaining)
+
+
+@contextlib.contextmanager
+def constraint_prechecks() -> Iterator[ConstraintPrechecker]:
+    """
+    Pre-check simple shapes evaluated by pySHACL validation runs within this context.  The hook should be activated after other hooks, so they see the focus nodes they would without it.
+
+    :return: The ConstraintPrechecker, which counts the focus nodes it spared pySHACL.
+    """
+    prechecker = ConstraintPrechecker()
+    with shape_validation_hook(prechecker):
+        yield prechecker
+    _logger.debug(
+        "Pre-checks found %d of %d focus nodes of simple shapes to conform.",
+        prechecker.n_focus_nodes_prechecked,
+        prechecker.n_focus_nodes,
+    )
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module records per-shape costs of pySHACL validation runs, using the hooks in case_utils.case_validate.validate_hooks.
+"""
+
+__version__ = "0.2.0"
+
+import contextlib
+import csv
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pyshacl.shape
+import rdflib
+from pyshacl.helper.path_helper import shacl_path_to_sparql_path
+
+from case_utils.case_validate.validate_hooks import (
+    ShapeValidateResult,
+    ShapeValidationHook,
+    shape_validation_hook,
+)
+from case_utils.case_validate.validate_types import ShapeProfile
+from case_utils.file_compression import open_file, uncompressed_name
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+NS_SH = rdflib.SH
+
+
+class _ShapeProfiler(ShapeValidationHook):
+    def __init__(self) -> None:
+        self.profiles: Dict[rdflib.term.Node, ShapeProfile] = dict()
+        # Each stack entry is a shape under evaluation, and the seconds
+        # spent evaluating shapes nested under it.
+        self.stack: List[List[Any]] = []
+
+    def get_profile(self, shape: Any) -> ShapeProfile:
+        if shape.node not in self.profiles:
+            path: Optional[str] = None
+            if shape.is_property_shape:
+                try:
+                    path = shacl_path_to_sparql_path(shape.sg, shape.path())
+                except Exception:
+                    path = str(shape.path())
+            self.profiles[shape.node] = ShapeProfile(
+                shape.node,
+                path=path,
+                is_property_shape=bool(shape.is_property_shape),
+            )
+        return self.profiles[shape.node]
+
+    def validate(
+        self,
+        shape: pyshacl.shape.Shape,
+        target_graph: Any,
+        focus: Any,
+        validate_next: Callable[[Any], ShapeValidateResult],
+    ) -> ShapeValidateResult:
+        profile = self.get_profile(shape)
+        profile.invocations += 1
+        if focus is not None:
+            if isinstance(focus, (rdflib.term.IdentifiedNode, rdflib.Literal)):
+                profile.focus_nodes += 1
+            else:
+                focus = list(focus)
+                profile.focus_nodes += len(focus)
+
+        self.stack.append([shape, 0.0])
+        time_start = time.perf_counter()
+        try:
+            return_value = validate_next(focus)
+        finally:
+            elapsed = time.perf_counter() - time_start
+            _, nested_seconds = self.stack.pop()
+            profile.total_seconds += elapsed
+            profile.self_seconds += elapsed - nested_seconds
+            if len(self.stack) > 0:
+                self.stack[-1][1] += elapsed
+
+        # Nested shapes' results are returned through their ancestors,
+        # so results are attributed by sh:sourceShape once, at the top
+        # level.
+        if len(self.stack) == 0:
+            for _, v_node, v_parts in return_value[1]:
+                for s, p, o in v_parts:
+                    if s != v_node or p != NS_SH.sourceShape:
+                        continue
+                    # pySHACL stores some report objects as (graph,
+                    # node) tuples.
+                    n_source_shape = o[1] if isinstance(o, tuple) else o
+                    if n_source_shape in self.profiles:
+                        self.profiles[n_source_shape].results += 1
+        return return_value
+
+    def observe_focus_nodes(self, shape: pyshacl.shape.Shape, focus_nodes: Any) -> None:
+        if len(self.stack) > 0 and self.stack[-1][0] is shape:
+            self.get_profile(shape).focus_nodes += len(focus_nodes)
+
+
+@contextlib.contextmanager
+def shape_profiling() -> Iterator[Dict[rdflib.term.Node, ShapeProfile]]:
+    """
+    Record the cost of each SHACL shape evaluated by pySHACL within this context.
+
+    :return: A dictionary, keyed by shape node, that is populated as shapes are evaluated.  Shapes that are never evaluated, such as deactivated shapes, are absent.
+    """
+    profiler = _ShapeProfiler()
+    with shape_validation_hook(profiler):
+        yield profiler.profiles
+
+
+def sort_shape_profiles(
+    shape_profiles: Dict[rdflib.term.Node, ShapeProfile]
+) -> List[ShapeProfile]:
+    """
+    Sort shape profiles so the most expensive shapes come first.  Shapes are ordered by descending self time, and then by descending total time.
+    """
+    return sorted(
+        shape_profiles.values(),
+        key=lambda x: (-x.self_seconds, -x.total_seconds, str(x.shape)),
+    )
+
+
+def write_shape_profiles(shape_profiles: List[ShapeProfile], out_file: str) -> None:
+    """
+    Write shape profiles as a table, in a format determined by the file extension.
+
+    :param shape_profiles: The profiles, in the order of the table rows.
+    :param out_file: A path ending with .csv or .json, optionally followed by a compression extension (see case_utils.file_compression).
+    """
+    records: List[Dict[str, Any]] = []
+    for shape_profile in shape_profiles:
+        records.append(
+            {
+                "shape": shape_profile.shape.n3()
+                if isinstance(shape_profile.shape, rdflib.BNode)
+                else str(shape_profile.shape),
+                "shape_type": "PropertyShape"
+                if shape_profile.is_property_shape
+                else "NodeShape",
+                "path": shape_profile.path,
+                "invocations": shape_profile.invocations,
+                "focus_nodes": shape_profile.focus_nodes,
+                "results": shape_profile.results,
+                "total_seconds": round(shape_profile.total_seconds, 6),
+                "self_seconds": round(shape_profile.self_seconds, 6),
+            }
+        )
+
+    _logger.debug("Writing %d shape profiles to %r.", len(records), out_file)
+    out_file_name = uncompressed_name(out_file)
+    if out_file_name.endswith(".csv"):
+        with open_file(out_file, "w", newline="") as out_fh:
+            writer = csv.DictWriter(
+                out_fh,
+                fieldnames=[
+                    "shape",
+                    "shape_type",
+                    "path",
+                    "invocations",
+                    "focus_nodes",
+                    "results",
+                    "total_seconds",
+                    "self_seconds",
+                ],
+            )
+            writer.writeheader()
+            writer.writerows(records)
+    elif out_file_name.endswith(".json"):
+        with open_file(out_file, "w") as out_fh:
+            json.dump(records, out_fh, indent=4)
+            out_fh.write("\n")
+    else:
+        raise NotImplementedError("Output file extension not implemented.")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module computes the RDFS entailments of a data graph mixed with an ontology graph, as pySHACL's "rdfs" inference option does with the OWL-RL library, but faster.
+
+The OWL-RL library applies every entailment rule to every triple of the graph, repeating until a pass adds nothing.  Here, the entailments of the ontology graph are computed once, along with an index of its class and property hierarchies and property domains and ranges.  Each data graph is then expanded by semi-naive evaluation: each triple is joined with the index and the graph once, when it is added, rather than on every pass.
+
+The entailments are the same as those of pySHACL's "rdfs" inference option, including its typing of all nodes of the input graphs as rdfs:Resource, and its typing of literal values of properties with ranges.
+"""
+
+__version__ = "0.1.0"
+
+import collections
+import logging
+import os
+from typing import Deque, Dict, Iterable, List, Set, Tuple
+
+import rdflib
+
+NS_RDF = rdflib.RDF
+NS_RDFS = rdflib.RDFS
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+_Node = rdflib.term.Node
+_Triple = Tuple[_Node, _Node, _Node]
+_Index = Dict[_Node, Set[_Node]]
+
+
+class _RDFSIndex:
+    """
+    The class and property hierarchies, and property domains and ranges, of the triples processed so far.  Each hierarchy is indexed in both directions.
+    """
+
+    def __init__(self) -> None:
+        self.domains: _Index = dict()
+        self.ranges: _Index = dict()
+        self.subclasses: _Index = dict()
+        self.subproperties: _Index = dict()
+        self.superclasses: _Index = dict()
+        self.superproperties: _Index = dict()
+
+    def copy(self) -> "_RDFSIndex":
+        index = _RDFSIndex()
+        index.domains = {k: set(v) for (k, v) in self.domains.items()}
+        index.ranges = {k: set(v) for (k, v) in self.ranges.items()}
+        index.subclasses = {k: set(v) for (k, v) in self.subclasses.items()}
+        index.subproperties = {k: set(v) for (k, v) in self.subproperties.items()}
+        index.superclasses = {k: set(v) for (k, v) in self.superclasses.items()}
+        index.superproperties = {k: set(v) for (k, v) in self.superproperties.items()}
+        return index
+
+
+def _expand(graph: rdflib.Graph, index: _RDFSIndex, triples: Iterable[_Triple]) -> None:
+    """
+    Add to the graph the RDFS entailments of the given triples, which must already be in the graph, jointly with the rest of the graph.  The index must cover all triples of the graph other than the given triples, and is updated.
+    """
+    queue: Deque[_Triple] = collections.deque(triples)
+
+    def _add(triple: _Triple) -> None:
+        if triple not in graph:
+            graph.add(triple)
+            queue.append(triple)
+
+    while len(queue) > 0:
+        s, p, o = queue.popleft()
+
+        # Each triple is indexed before it is joined, so of any two
+        # triples that entail a third, the later one to be processed
+        # finds the earlier one, in the index or in the graph.  Triples
+        # are only queued by _add, so the index is not changed while
+        # it is iterated.
+        if p == NS_RDFS.domain:
+            index.domains.setdefault(s, set()).add(o)
+            for u in list(graph.subjects(s, None, unique=True)):
+                _add((u, NS_RDF.type, o))
+        elif p == NS_RDFS.range:
+            index.ranges.setdefault(s, set()).add(o)
+            for v in list(graph.objects(None, s, unique=True)):
+                _add((v, NS_RDF.type, o))
+        elif p == NS_RDFS.subPropertyOf:
+            index.superproperties.setdefault(s, set()).add(o)
+            index.subproperties.setdefault(o, set()).add(s)
+            for x in index.superproperties.get(o, ()):
+                _add((s, NS_RDFS.subPropertyOf, x))
+            for z in index.subproperties.get(s, ()):
+                _add((z, NS_RDFS.subPropertyOf, o))
+            for z, w in list(graph.subject_objects(s, unique=True)):
+                _add((z, o, w))
+        elif p == NS_RDFS.subClassOf:
+            index.superclasses.setdefault(s, set()).add(o)
+            index.subclasses.setdefault(o, set()).add(s)
+            for x in index.superclasses.get(o, ()):
+                _add((s, NS_RDFS.subClassOf, x))
+            for z in index.subclasses.get(s, ()):
+                _add((z, NS_RDFS.subClassOf, o))
+            for v in list(graph.subjects(NS_RDF.type, s, unique=True)):
+                _add((v, NS_RDF.type, o))
+        elif p == NS_RDF.type:
+            for n_class in index.superclasses.get(o, ()):
+                _add((s, NS_RDF.type, n_class))
+            if o == NS_RDF.Property:
+                _add((s, NS_RDFS.subPropertyOf, s))
+            elif o == NS_RDFS.Class:
+                _add((s, NS_RDFS.subClassOf, NS_RDFS.Resource))
+                _add((s, NS_RDFS.subClassOf, s))
+            elif o == NS_RDFS.ContainerMembershipProperty:
+                _add((s, NS_RDFS.subPropertyOf, NS_RDFS.member))
+            elif o == NS_RDFS.Datatype:
+                _add((s, NS_RDFS.subClassOf, NS_RDFS.Literal))
+
+        _add((p, NS_RDF.type, NS_RDF.Property))
+        for n_class in index.domains.get(p, ()):
+            _add((s, NS_RDF.type, n_class))
+        for n_class in index.ranges.get(p, ()):
+            _add((o, NS_RDF.type, n_class))
+        for n_property in index.superproperties.get(p, ()):
+            _add((s, n_property, o))
+
+
+def _resource_typings(triples: Iterable[_Triple]) -> Set[_Triple]:
+    """
+    :return: The typing as rdfs:Resource of each subject and object of the triples.  pySHACL's inference adds these for the input graph, not for entailed triples.
+    """
+    nodes: Set[_Node] = set()
+    for s, p, o in triples:
+        nodes.add(s)
+        nodes.add(o)
+    return {(x, NS_RDF.type, NS_RDFS.Resource) for x in nodes}
+
+
+def _add_expanded(
+    graph: rdflib.Graph, index: _RDFSIndex, triples: List[_Triple]
+) -> None:
+    """
+    Add to the graph the entailments of the given triples, which must already be in the graph, including their typing as rdfs:Resource.
+    """
+    resource_typings = [x for x in _resource_typings(triples) if x not in graph]
+    graph.addN((s, p, o, graph) for (s, p, o) in resource_typings)
+    _expand(graph, index, triples + resource_typings)
+
+
+class RDFSClosure:
+    """
+    This class computes the RDFS entailments of an ontology graph once, so that data graphs can be expanded with the ontology graph and their joint entailments.
+
+    :param ontology_graph: The ontology graph.  It is not modified.
+    """
+
+    def __init__(self, ontology_graph: rdflib.Graph) -> None:
+        closure_graph = rdflib.Graph()
+        ontology_triples: List[_Triple] = list(ontology_graph)
+        for triple in ontology_triples:
+            closure_graph.add(triple)
+        self._index = _RDFSIndex()
+        _add_expanded(closure_graph, self._index, ontology_triples)
+        self._closure_triples: List[_Triple] = list(closure_graph)
+        self._namespaces: List[Tuple[str, rdflib.URIRef]] = list(
+            ontology_graph.namespaces()
+        )
+        _logger.debug(
+            "Entailed %d triples from %d-triple ontology graph.",
+            len(self._closure_triples) - len(ontology_triples),
+            len(ontology_triples),
+        )
+
+    def expand(self, data_graph: rdflib.Graph) -> int:
+        """
+        Add the ontology graph and its entailments to the data graph, and then the entailments of the data graph jointly with the ontology graph.  The result is the same as pySHACL's "rdfs" inference on the data graph mixed with the ontology graph.
+
+        :param data_graph: The data graph.  It is modified.
+        :return: The number of triples added, including the ontology graph's.
+        """
+        n_data_triples = len(data_graph)
+        data_triples: List[_Triple] = list(data_graph)
+        # The ontology graph's prefixes take precedence, as they do when
+        # pySHACL mixes in the ontology graph, so reports render nodes
+        # alike.
+        for prefix, namespace in self._namespaces:
+            data_graph.namespace_manager.bind(
+                prefix, namespace, override=True, replace=False
+            )
+        data_graph.addN((s, p, o, data_graph) for (s, p, o) in self._closure_triples)
+
+        _add_expanded(data_graph, self._index.copy(), data_triples)
+
+        n_added = len(data_graph) - n_data_triples
+        _logger.debug("Added %d triples to the data graph.", n_added)
+        return n_added
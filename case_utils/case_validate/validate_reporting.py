@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module writes validation results as pySHACL finds them, using the hooks in case_utils.case_validate.validate_hooks, rather than after pySHACL has built the whole report graph and text.
+
+If the installed pySHACL does not support the hooks, write_report_results passes the results of pySHACL's report graph to the writers after validation instead.
+
+While streaming is active, pySHACL only retains the first result that makes the data graph non-conformant, as pySHACL requires a non-conformant report to have at least one result.  Memory use is then bounded by the writers: the N-Triples and JSON Lines writers retain only the identifiers of blank nodes they have described, and the summarizer retains one record per group of results.
+"""
+
+__version__ = "0.1.0"
+
+import contextlib
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+import pyshacl.shape
+import rdflib
+from pyshacl.helper.path_helper import shacl_path_to_sparql_path
+
+from case_utils.case_validate.validate_hooks import (
+    ShapeValidateResult,
+    ShapeValidationHook,
+    shape_validation_hook,
+)
+
+NS_RDF = rdflib.RDF
+NS_SH = rdflib.SH
+
+# Keys of JSON records, in output order.
+_RESULT_PREDICATES: List[Tuple[str, rdflib.URIRef]] = [
+    ("focusNode", NS_SH.focusNode),
+    ("resultPath", NS_SH.resultPath),
+    ("value", NS_SH.value),
+    ("resultSeverity", NS_SH.resultSeverity),
+    ("sourceShape", NS_SH.sourceShape),
+    ("sourceConstraintComponent", NS_SH.sourceConstraintComponent),
+    ("sourceConstraint", NS_SH.sourceConstraint),
+]
+
+
+def _resolve(o: Any) -> Tuple[rdflib.term.Node, Optional[rdflib.Graph]]:
+    """
+    pySHACL represents some objects of result statements as (graph, node) tuples, so the report can describe blank nodes from the graph.  This returns the node, and the graph if the node needs describing.
+    """
+    if isinstance(o, tuple):
+        if isinstance(o[1], rdflib.BNode):
+            return o[1], o[0]
+        return o[1], None
+    return o, None
+
+
+class ResultWriter:
+    """
+    Base class for consumers of validation results.
+    """
+
+    def write_result(
+        self,
+        shapes_graph: Any,
+        result_node: rdflib.term.Node,
+        result_triples: List[Tuple[Any, Any, Any]],
+    ) -> None:
+        """
+        :param shapes_graph: The pySHACL ShapesGraph of the shape that produced the result.
+        :param result_node: The node of the result, a blank node.
+        :param result_triples: The statements describing the result, as made by pySHACL.
+        """
+        raise NotImplementedError
+
+    def finish(self, conforms: bool) -> None:
+        """
+        Called once validation is complete.
+        """
+        pass
+
+
+class NTriplesResultWriter(ResultWriter):
+    """
+    This class writes a SHACL validation report graph as N-Triples, with each result's statements written as soon as the result is found.  The sh:conforms statement of the report is written last.
+    """
+
+    def __init__(self, out_fh: TextIO) -> None:
+        self.out_fh = out_fh
+        self.n_report = rdflib.BNode()
+        self._described_nodes: Set[Tuple[int, rdflib.BNode]] = set()
+        self._started = False
+
+    def _write_graph(self, graph: rdflib.Graph) -> None:
+        self.out_fh.write(graph.serialize(format="nt"))
+
+    def _start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        graph = rdflib.Graph()
+        graph.add((self.n_report, NS_RDF.type, NS_SH.ValidationReport))
+        self._write_graph(graph)
+
+    def _describe(
+        self, graph: rdflib.Graph, source: rdflib.Graph, n_node: rdflib.BNode
+    ) -> None:
+        pending = [n_node]
+        while len(pending) > 0:
+            n_subject = pending.pop()
+            if (id(source), n_subject) in self._described_nodes:
+                continue
+            self._described_nodes.add((id(source), n_subject))
+            for p, o in source.predicate_objects(n_subject):
+                graph.add((n_subject, p, o))
+                if isinstance(o, rdflib.BNode):
+                    pending.append(o)
+
+    def write_result(
+        self,
+        shapes_graph: Any,
+        result_node: rdflib.term.Node,
+        result_triples: List[Tuple[Any, Any, Any]],
+    ) -> None:
+        self._start()
+        graph = rdflib.Graph()
+        graph.add((self.n_report, NS_SH.result, result_node))
+        for s, p, o in result_triples:
+            n_object, source = _resolve(o)
+            graph.add((s, p, n_object))
+            if source is not None:
+                assert isinstance(n_object, rdflib.BNode)
+                self._describe(graph, source, n_object)
+        self._write_graph(graph)
+
+    def finish(self, conforms: bool) -> None:
+        self._start()
+        graph = rdflib.Graph()
+        graph.add((self.n_report, NS_SH.conforms, rdflib.Literal(conforms)))
+        self._write_graph(graph)
+
+
+def _json_value(shapes_graph: Any, p: rdflib.URIRef, n_object: Any) -> str:
+    if p == NS_SH.resultPath and isinstance(n_object, rdflib.BNode):
+        return str(shacl_path_to_sparql_path(shapes_graph, n_object))
+    if isinstance(n_object, rdflib.BNode):
+        return n_object.n3()
+    return str(n_object)
+
+
+def _result_record(
+    shapes_graph: Any, result_triples: List[Tuple[Any, Any, Any]]
+) -> Dict[str, Any]:
+    """
+    Render a validation result as a JSON-compatible dictionary.  IRIs and literals are rendered as strings, blank nodes in N-Triples syntax, and complex result paths in SPARQL syntax.
+    """
+    values: Dict[rdflib.term.Node, Any] = dict()
+    messages: List[str] = []
+    for _, p, o in result_triples:
+        n_object, _ = _resolve(o)
+        if p == NS_SH.resultMessage:
+            messages.append(str(n_object))
+        else:
+            values[p] = n_object
+    record: Dict[str, Any] = dict()
+    for key, p in _RESULT_PREDICATES:
+        if p in values:
+            record[key] = _json_value(shapes_graph, p, values[p])
+    record["resultMessage"] = sorted(messages)
+    return record
+
+
+class JSONLinesResultWriter(ResultWriter):
+    """
+    This class writes each validation result as a JSON object on its own line, as soon as the result is found.  Keys are the local names of the SHACL result properties, e.g. "focusNode" and "resultMessage".
+    """
+
+    def __init__(self, out_fh: TextIO) -> None:
+        self.out_fh = out_fh
+
+    def write_result(
+        self,
+        shapes_graph: Any,
+        result_node: rdflib.term.Node,
+        result_triples: List[Tuple[Any, Any, Any]],
+    ) -> None:
+        self.out_fh.write(json.dumps(_result_record(shapes_graph, result_triples)))
+        self.out_fh.write("\n")
+
+
+class ResultGroup:
+    """
+    This class aggregates validation results that share a source shape, result path, and messages.
+    """
+
+    def __init__(self, record: Dict[str, Any]) -> None:
+        self.count = 0
+        self.result_severity: Optional[str] = record.get("resultSeverity")
+        self.source_shape: Optional[str] = record.get("sourceShape")
+        self.result_path: Optional[str] = record.get("resultPath")
+        self.result_message: List[str] = record["resultMessage"]
+        self.sample_focus_nodes: List[str] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "resultSeverity": self.result_severity,
+            "sourceShape": self.source_shape,
+            "resultPath": self.result_path,
+            "resultMessage": self.result_message,
+            "sampleFocusNodes": self.sample_focus_nodes,
+        }
+
+
+class ResultSummarizer(ResultWriter):
+    """
+    This class aggregates validation results by source shape, result path, and messages, counting the results and keeping a few sample focus nodes of each group.
+    """
+
+    def __init__(self, max_samples: int = 3) -> None:
+        self.max_samples = max_samples
+        self.n_results = 0
+        self.conforms: Optional[bool] = None
+        self._groups: Dict[Tuple[Any, ...], ResultGroup] = dict()
+
+    def write_result(
+        self,
+        shapes_graph: Any,
+        result_node: rdflib.term.Node,
+        result_triples: List[Tuple[Any, Any, Any]],
+    ) -> None:
+        record = _result_record(shapes_graph, result_triples)
+        key = (
+            record.get("sourceShape"),
+            record.get("resultPath"),
+            tuple(record["resultMessage"]),
+        )
+        if key not in self._groups:
+            self._groups[key] = ResultGroup(record)
+        group = self._groups[key]
+        group.count += 1
+        focus_node = record.get("focusNode")
+        if (
+            focus_node is not None
+            and len(group.sample_focus_nodes) < self.max_samples
+            and focus_node not in group.sample_focus_nodes
+        ):
+            group.sample_focus_nodes.append(focus_node)
+        self.n_results += 1
+
+    def finish(self, conforms: bool) -> None:
+        self.conforms = conforms
+
+    @property
+    def groups(self) -> List[ResultGroup]:
+        """
+        The result groups, largest first.
+        """
+        return sorted(
+            self._groups.values(),
+            key=lambda x: (
+                -x.count,
+                str(x.source_shape),
+                str(x.result_path),
+                x.result_message,
+            ),
+        )
+
+    def to_text(self, conforms: Optional[bool] = None) -> str:
+        """
+        Render the summary in the style of pySHACL's human-readable report.
+
+        :param conforms: The conformance to report.  If None, the SHACL conformance passed to finish is reported.
+        """
+        lines = [
+            "Validation Report Summary",
+            "Conforms: %s" % (self.conforms if conforms is None else conforms),
+        ]
+        if self.n_results > 0:
+            lines.append(
+                "Results (%d) in groups (%d):" % (self.n_results, len(self._groups))
+            )
+        for group in self.groups:
+            lines.append("Result Group (Count: %d):" % group.count)
+            if group.result_severity is not None:
+                lines.append("\tSeverity: %s" % group.result_severity)
+            if group.source_shape is not None:
+                lines.append("\tSource Shape: %s" % group.source_shape)
+            if group.result_path is not None:
+                lines.append("\tResult Path: %s" % group.result_path)
+            for message in group.result_message:
+                lines.append("\tMessage: %s" % message)
+            lines.append(
+                "\tSample Focus Nodes: %s" % ", ".join(group.sample_focus_nodes)
+            )
+        return "\n".join(lines) + "\n"
+
+
+class _ResultStreamer(ShapeValidationHook):
+    def __init__(self, result_writers: List[ResultWriter]) -> None:
+        self.result_writers = result_writers
+        self._depth = 0
+        self._retained_result = False
+
+    def validate(
+        self,
+        shape: pyshacl.shape.Shape,
+        target_graph: Any,
+        focus: Any,
+        validate_next: Callable[[Any], ShapeValidateResult],
+    ) -> ShapeValidateResult:
+        self._depth += 1
+        try:
+            conforms, reports = validate_next(focus)
+        finally:
+            self._depth -= 1
+        # Results of nested shapes are returned through the top-level
+        # shape.
+        if self._depth > 0:
+            return conforms, reports
+
+        for _, result_node, result_triples in reports:
+            for result_writer in self.result_writers:
+                result_writer.write_result(shape.sg, result_node, result_triples)
+        # One result is retained, so a non-conformant report has a
+        # result even if result limits drop those of the non-conformant
+        # shapes.
+        if not self._retained_result and len(reports) > 0:
+            self._retained_result = True
+            return conforms, reports[:1]
+        return conforms, []
+
+
+@contextlib.contextmanager
+def result_streaming(result_writers: List[ResultWriter]) -> Iterator[bool]:
+    """
+    Pass each validation result found by pySHACL within this context to the given writers, instead of retaining it for pySHACL's report.  The caller is responsible for calling each writer's finish method.
+
+    :return: True if results are streamed.  False if the installed pySHACL does not support streaming, in which case the caller can pass the report's results to the writers with write_report_results.
+    """
+    streamer = _ResultStreamer(result_writers)
+    with shape_validation_hook(streamer) as active:
+        yield active
+
+
+class _ReportShapesGraph:
+    """
+    This class stands in for the pySHACL ShapesGraph of a result, to render the result paths that pySHACL copies into the report graph.
+    """
+
+    def __init__(self, graph: rdflib.Graph) -> None:
+        self.graph = graph
+
+    def objects(
+        self,
+        subject: Optional[rdflib.term.Node] = None,
+        predicate: Optional[rdflib.term.Node] = None,
+    ) -> Iterator[rdflib.term.Node]:
+        return self.graph.objects(subject, predicate)
+
+
+def write_report_results(
+    report_graph: rdflib.Graph, result_writers: List[ResultWriter]
+) -> None:
+    """
+    Pass each validation result of a pySHACL report graph to the given writers, as result_streaming would have.  The caller is responsible for calling each writer's finish method.
+    """
+    shapes_graph = _ReportShapesGraph(report_graph)
+    for n_result in report_graph.objects(None, NS_SH.result):
+        result_triples: List[Tuple[Any, Any, Any]] = []
+        for p, o in report_graph.predicate_objects(n_result):
+            # Blank nodes are described from the report graph, as
+            # pySHACL marks them in streamed results.
+            if isinstance(o, rdflib.BNode):
+                result_triples.append((n_result, p, (report_graph, o)))
+            else:
+                result_triples.append((n_result, p, o))
+        for result_writer in result_writers:
+            result_writer.write_result(shapes_graph, n_result, result_triples)
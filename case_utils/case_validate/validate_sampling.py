@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module estimates the rate of non-conformance of very large data graphs, by validating a random sample of the focus nodes of each shape, using the hooks in case_utils.case_validate.validate_hooks.
+
+Each top-level shape, which finds its own focus nodes from its targets, is evaluated against a sample of its focus nodes, drawn with a seeded random number generator so runs can be repeated.  Shapes nested under a top-level shape (e.g. by sh:property) are evaluated as usual for the sampled focus nodes.  The validation report then covers only the sampled focus nodes, so its conformance is not a verdict on the data graph.
+"""
+
+__version__ = "0.1.0"
+
+import logging
+import math
+import os
+import random
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import pyshacl.shape
+import rdflib
+
+from case_utils.case_validate.validate_hooks import (
+    ShapeValidateResult,
+    ShapeValidationHook,
+)
+from case_utils.case_validate.validate_types import ShapeSample
+
+NS_SH = rdflib.SH
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+# The z-score of a two-sided 95% confidence interval.
+_Z_95 = 1.959963984540054
+
+
+def confidence_interval(
+    n_focus_nodes_with_results: int, n_sampled: int, n_focus_nodes: int
+) -> Tuple[float, float]:
+    """
+    :return: The 95% Wilson score interval of the rate of focus nodes with results, from a simple random sample.  If every focus node was sampled, the rate is exact.
+
+    >>> confidence_interval(0, 0, 0)
+    (0.0, 1.0)
+    >>> confidence_interval(5, 10, 10)
+    (0.5, 0.5)
+    >>> low, high = confidence_interval(0, 100, 1000)
+    >>> (round(low, 4), round(high, 4))
+    (0.0, 0.037)
+    """
+    if n_sampled == 0:
+        return 0.0, 1.0
+    rate = n_focus_nodes_with_results / n_sampled
+    if n_sampled >= n_focus_nodes:
+        return rate, rate
+    z2 = _Z_95 * _Z_95
+    denominator = 1 + z2 / n_sampled
+    center = (rate + z2 / (2 * n_sampled)) / denominator
+    half_width = (
+        _Z_95
+        * math.sqrt(rate * (1 - rate) / n_sampled + z2 / (4 * n_sampled * n_sampled))
+        / denominator
+    )
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+class FocusNodeSampler(ShapeValidationHook):
+    """
+    This hook evaluates each top-level shape against a random sample of its focus nodes, and records the results of each shape's sample.
+
+    Exactly one of sample_size and sample_fraction must be given.
+
+    :param sample_size: The number of focus nodes to sample for each shape.  Shapes with fewer focus nodes are evaluated against all of them.
+    :param sample_fraction: The fraction of each shape's focus nodes to sample, rounded up, so at least one focus node is sampled.
+    :param seed: The seed of the random number generator.  Each shape's sample is drawn with a generator seeded by this seed and the shape's IRI, so samples do not depend on the order in which shapes are evaluated.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_size: Optional[int] = None,
+        sample_fraction: Optional[float] = None,
+        seed: int = 0,
+    ) -> None:
+        if (sample_size is None) == (sample_fraction is None):
+            raise ValueError(
+                "Exactly one of sample_size and sample_fraction is needed."
+            )
+        if sample_size is not None and sample_size < 1:
+            raise ValueError("The sample size must be positive.")
+        if sample_fraction is not None and not (0 < sample_fraction <= 1):
+            raise ValueError("The sample fraction must be in (0, 1].")
+        self.sample_size = sample_size
+        self.sample_fraction = sample_fraction
+        self.seed = seed
+
+        self.shape_samples: Dict[rdflib.term.Node, ShapeSample] = dict()
+        "The sample of each top-level shape with focus nodes, keyed by shape node."
+
+        self._depth = 0
+
+    def _sample_size(self, n_focus_nodes: int) -> int:
+        if self.sample_size is not None:
+            return min(self.sample_size, n_focus_nodes)
+        assert self.sample_fraction is not None
+        return min(math.ceil(self.sample_fraction * n_focus_nodes), n_focus_nodes)
+
+    def validate(
+        self,
+        shape: pyshacl.shape.Shape,
+        target_graph: Any,
+        focus: Any,
+        validate_next: Callable[[Any], ShapeValidateResult],
+    ) -> ShapeValidateResult:
+        # Only top-level shapes, which find their own focus nodes, are
+        # sampled.
+        if focus is not None or self._depth > 0:
+            self._depth += 1
+            try:
+                return validate_next(focus)
+            finally:
+                self._depth -= 1
+
+        # Focus nodes are sorted so the sample does not depend on set
+        # iteration order.
+        focus_list = sorted(
+            shape.focus_nodes(target_graph),  # type: ignore[no-untyped-call]
+            key=lambda x: (type(x).__name__, str(x)),
+        )
+        if len(focus_list) == 0:
+            return True, []
+
+        # Blank node labels differ between runs, so they do not seed.
+        shape_seed = "%d %s" % (
+            self.seed,
+            shape.node if isinstance(shape.node, rdflib.URIRef) else "",
+        )
+        sample = random.Random(shape_seed).sample(
+            focus_list, self._sample_size(len(focus_list))
+        )
+
+        self._depth += 1
+        try:
+            conforms, reports = validate_next(sample)
+        finally:
+            self._depth -= 1
+
+        focus_nodes_with_results: Set[rdflib.term.Node] = set()
+        for _, result_node, result_triples in reports:
+            for s, p, o in result_triples:
+                if s == result_node and p == NS_SH.focusNode:
+                    focus_nodes_with_results.add(o)
+
+        shape_sample = ShapeSample(
+            shape.node,
+            n_focus_nodes=len(focus_list),
+            n_sampled=len(sample),
+            n_focus_nodes_with_results=len(focus_nodes_with_results),
+        )
+        _logger.debug(
+            "Sampled %d of %d focus nodes of shape %s, %d with results.",
+            shape_sample.n_sampled,
+            shape_sample.n_focus_nodes,
+            shape.node,
+            shape_sample.n_focus_nodes_with_results,
+        )
+        self.shape_samples[shape.node] = shape_sample
+        return conforms, reports
+
+
+def sort_shape_samples(
+    shape_samples: Dict[rdflib.term.Node, ShapeSample]
+) -> List[ShapeSample]:
+    """
+    :return: The shape samples, by descending rate of focus nodes with results.
+    """
+    return sorted(
+        shape_samples.values(),
+        key=lambda x: (-x.rate, -x.n_focus_nodes, str(x.shape)),
+    )
+
+
+def shape_samples_to_text(
+    shape_samples: List[ShapeSample],
+    namespace_manager: Optional[rdflib.namespace.NamespaceManager] = None,
+) -> str:
+    """
+    Render the estimate from the shape samples, e.g. to follow a human-readable validation report.
+    """
+    n_sampled = sum(x.n_sampled for x in shape_samples)
+    n_focus_nodes = sum(x.n_focus_nodes for x in shape_samples)
+    lines: List[str] = [
+        "Sampled Estimate:",
+        "  This is an estimate from %d of %d focus nodes of %d shapes.  The conformance above covers only the sampled focus nodes."
+        % (n_sampled, n_focus_nodes, len(shape_samples)),
+    ]
+    for shape_sample in shape_samples:
+        low, high = confidence_interval(
+            shape_sample.n_focus_nodes_with_results,
+            shape_sample.n_sampled,
+            shape_sample.n_focus_nodes,
+        )
+        lines.append(
+            "  %s: %d of %d sampled focus nodes with results (%.1f%%, 95%% interval %.1f%% to %.1f%%), of %d focus nodes."
+            % (
+                shape_sample.shape.n3(namespace_manager),
+                shape_sample.n_focus_nodes_with_results,
+                shape_sample.n_sampled,
+                100 * shape_sample.rate,
+                100 * low,
+                100 * high,
+                shape_sample.n_focus_nodes,
+            )
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This module provides an rdflib store kept in an SQLite database file, so data graphs larger than available memory can be validated.
+
+Terms are stored once each in a terms table, and statements as rows of term identifiers with the identifier of their context (graph), indexed in subject-predicate-object, predicate-object-subject, and object-subject-predicate orders.  Memory use is bounded by the SQLite page cache, an LRU cache of recently used terms, and a buffer of triples not yet written.
+"""
+
+__version__ = "0.1.0"
+
+import collections
+import contextlib
+import logging
+import os
+import sqlite3
+import tempfile
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+import rdflib
+import rdflib.store
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.plugins.stores.memory import SimpleMemory
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+DEFAULT_CACHE_SIZE = 100000
+"""
+The default number of terms an SQLiteStore keeps in memory.
+"""
+
+# Number of triples buffered before they are written, and number of
+# triples read per query.
+_BATCH_SIZE = 10000
+
+# SQLite page cache size, in KiB.
+_PAGE_CACHE_KIB = 64 * 1024
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, kind TEXT NOT NULL, value TEXT NOT NULL, datatype TEXT NOT NULL, lang TEXT NOT NULL, UNIQUE (kind, value, datatype, lang))",
+    "CREATE TABLE IF NOT EXISTS triples (s INTEGER NOT NULL, p INTEGER NOT NULL, o INTEGER NOT NULL, c INTEGER NOT NULL, PRIMARY KEY (s, p, o, c)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s, c)",
+    "CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p, c)",
+]
+
+_TermKey = Tuple[str, str, str, str]
+
+
+def _term_key(term: rdflib.term.Node) -> _TermKey:
+    if isinstance(term, rdflib.URIRef):
+        return ("U", str(term), "", "")
+    if isinstance(term, rdflib.BNode):
+        return ("B", str(term), "", "")
+    if isinstance(term, rdflib.Literal):
+        return (
+            "L",
+            str(term),
+            "" if term.datatype is None else str(term.datatype),
+            term.language or "",
+        )
+    raise TypeError("Unsupported term type: %s." % type(term))
+
+
+def _key_term(key: _TermKey) -> rdflib.term.Node:
+    kind, value, datatype, lang = key
+    if kind == "U":
+        return rdflib.URIRef(value)
+    if kind == "B":
+        return rdflib.BNode(value)
+    # The lexical form was normalized, if at all, when the literal was
+    # first made.
+    return rdflib.Literal(
+        value,
+        lang=lang or None,
+        datatype=rdflib.URIRef(datatype) if datatype != "" else None,
+        normalize=False,
+    )
+
+
+def _index_order(
+    s_id: Optional[int], p_id: Optional[int], o_id: Optional[int]
+) -> Tuple[str, str, str]:
+    """
+    Choose the column order of the index that serves a triple pattern, so the bound columns are a prefix of the order.
+    """
+    if s_id is not None:
+        return ("o", "s", "p") if p_id is None and o_id is not None else ("s", "p", "o")
+    if p_id is not None:
+        return ("p", "o", "s")
+    if o_id is not None:
+        return ("o", "s", "p")
+    return ("s", "p", "o")
+
+
+class SQLiteStore(rdflib.store.Store):
+    """
+    This class is an rdflib quad store kept in an SQLite database file.  It is context-aware, as pySHACL requires of data graph stores, but not formula-aware, and is not safe for use from multiple threads.
+
+    :param configuration: The path to the database file.  If given, the store is opened.
+    :param cache_size: The number of terms to keep in memory.
+    """
+
+    context_aware = True
+    formula_aware = False
+    graph_aware = True
+    transaction_aware = False
+
+    def __init__(
+        self,
+        configuration: Optional[str] = None,
+        identifier: Optional[rdflib.term.Identifier] = None,
+        *,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cache_size = cache_size
+        self._term_ids: "collections.OrderedDict[_TermKey, int]" = (
+            collections.OrderedDict()
+        )
+        self._id_terms: "collections.OrderedDict[int, rdflib.term.Node]" = (
+            collections.OrderedDict()
+        )
+        self._pending: List[Tuple[int, int, int, int]] = []
+        # The graph objects of known contexts, keyed by identifier, as
+        # rdflib's Memory store keeps them.  Contexts are few.
+        self._context_graphs: Dict[rdflib.term.Node, rdflib.Graph] = dict()
+        # Namespace bindings are few, so they are kept in memory, with
+        # rdflib's own binding rules.
+        self._namespaces = SimpleMemory()
+        super().__init__(configuration, identifier)
+        self.identifier = identifier
+
+    def open(self, configuration: str, create: bool = True) -> Optional[int]:  # type: ignore[override]
+        if not create and not os.path.exists(configuration):
+            return rdflib.store.NO_STORE
+        self._conn = sqlite3.connect(configuration)
+        # The database is a scratch copy of the data graph, so it is not
+        # made durable.
+        self._conn.execute("PRAGMA journal_mode = OFF")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute("PRAGMA cache_size = -%d" % _PAGE_CACHE_KIB)
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        return rdflib.store.VALID_STORE
+
+    def close(self, commit_pending_transaction: bool = False) -> None:
+        if self._conn is None:
+            return
+        self._flush()
+        self._conn.commit()
+        self._conn.close()
+        self._conn = None
+
+    def destroy(self, configuration: str) -> None:
+        self.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(configuration)
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise ValueError("SQLiteStore is not open.")
+        return self._conn
+
+    def _term_id(self, term: rdflib.term.Node, create: bool) -> Optional[int]:
+        key = _term_key(term)
+        term_id = self._term_ids.get(key)
+        if term_id is not None:
+            self._term_ids.move_to_end(key)
+            return term_id
+        row = self._connection.execute(
+            "SELECT id FROM terms WHERE kind = ? AND value = ? AND datatype = ? AND lang = ?",
+            key,
+        ).fetchone()
+        if row is not None:
+            term_id = row[0]
+        elif create:
+            term_id = self._connection.execute(
+                "INSERT INTO terms (kind, value, datatype, lang) VALUES (?, ?, ?, ?)",
+                key,
+            ).lastrowid
+        else:
+            return None
+        assert term_id is not None
+        self._cache(key, term_id, term)
+        return term_id
+
+    def _term(self, term_id: int) -> rdflib.term.Node:
+        term = self._id_terms.get(term_id)
+        if term is not None:
+            self._id_terms.move_to_end(term_id)
+            return term
+        row = self._connection.execute(
+            "SELECT kind, value, datatype, lang FROM terms WHERE id = ?", (term_id,)
+        ).fetchone()
+        key: _TermKey = (row[0], row[1], row[2], row[3])
+        term = _key_term(key)
+        self._cache(key, term_id, term)
+        return term
+
+    def _cache(self, key: _TermKey, term_id: int, term: rdflib.term.Node) -> None:
+        self._term_ids[key] = term_id
+        self._id_terms[term_id] = term
+        while len(self._term_ids) > self._cache_size:
+            self._term_ids.popitem(last=False)
+        while len(self._id_terms) > self._cache_size:
+            self._id_terms.popitem(last=False)
+
+    def _context_graph(self, n_context: rdflib.term.Node) -> rdflib.Graph:
+        graph = self._context_graphs.get(n_context)
+        if graph is None:
+            assert isinstance(n_context, rdflib.term.IdentifiedNode)
+            graph = rdflib.Graph(store=self, identifier=n_context)
+            self._context_graphs[n_context] = graph
+        return graph
+
+    def _flush(self) -> None:
+        if len(self._pending) == 0:
+            return
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO triples (s, p, o, c) VALUES (?, ?, ?, ?)",
+            self._pending,
+        )
+        self._pending = []
+
+    def add(
+        self,
+        triple: Tuple[Any, Any, Any],
+        context: Any = None,
+        quoted: bool = False,
+    ) -> None:
+        if context is None:
+            n_context: rdflib.term.Node = DATASET_DEFAULT_GRAPH_ID
+        else:
+            n_context = context.identifier
+            self._context_graphs.setdefault(n_context, context)
+        s_id = self._term_id(triple[0], True)
+        p_id = self._term_id(triple[1], True)
+        o_id = self._term_id(triple[2], True)
+        c_id = self._term_id(n_context, True)
+        assert s_id is not None and p_id is not None and o_id is not None
+        assert c_id is not None
+        self._pending.append((s_id, p_id, o_id, c_id))
+        if len(self._pending) >= _BATCH_SIZE:
+            self._flush()
+
+    def addN(self, quads: Iterable[Tuple[Any, Any, Any, Any]]) -> None:
+        for s, p, o, c in quads:
+            self.add((s, p, o), c)
+
+    def _pattern_ids(
+        self, triple_pattern: Tuple[Any, Any, Any], context: Any
+    ) -> Optional[Dict[str, int]]:
+        """
+        :return: The term identifiers of the bound members of the pattern and of the context, keyed by column name, or None if a bound member is not in the store.
+        """
+        bound: Dict[str, int] = dict()
+        terms = list(triple_pattern)
+        if context is not None:
+            terms.append(context.identifier)
+        for column, term in zip(("s", "p", "o", "c"), terms):
+            if term is None:
+                continue
+            term_id = self._term_id(term, False)
+            if term_id is None:
+                return None
+            bound[column] = term_id
+        return bound
+
+    def remove(
+        self,
+        triple_pattern: Tuple[Any, Any, Any],
+        context: Any = None,
+    ) -> None:
+        self._flush()
+        bound = self._pattern_ids(triple_pattern, context)
+        if bound is None:
+            return
+        sql = "DELETE FROM triples"
+        if len(bound) > 0:
+            sql += " WHERE " + " AND ".join("%s = ?" % x for x in bound)
+        self._connection.execute(sql, tuple(bound.values()))
+
+    def _triple_contexts(self, ids: Dict[str, int]) -> Iterator[rdflib.Graph]:
+        for row in self._connection.execute(
+            "SELECT c FROM triples WHERE s = ? AND p = ? AND o = ?",
+            (ids["s"], ids["p"], ids["o"]),
+        ).fetchall():
+            yield self._context_graph(self._term(row[0]))
+
+    def triples(
+        self,
+        triple_pattern: Tuple[Any, Any, Any],
+        context: Any = None,
+    ) -> Iterator[Tuple[Tuple[Any, Any, Any], Iterator[Any]]]:
+        self._flush()
+        bound = self._pattern_ids(triple_pattern, context)
+        if bound is None:
+            return
+        order = _index_order(bound.get("s"), bound.get("p"), bound.get("o"))
+        conditions = ["%s = ?" % x for x in bound]
+        order_sql = ", ".join(order)
+        # Without a context, statements in several contexts are listed
+        # once.
+        select_sql = "SELECT %s%s FROM triples" % (
+            "" if "c" in bound else "DISTINCT ",
+            order_sql,
+        )
+
+        # Rows are read in pages, resuming after the last row read, so
+        # neither the whole result nor an open cursor is held while the
+        # caller iterates.
+        last_row: Optional[Tuple[int, int, int]] = None
+        while True:
+            self._flush()
+            page_conditions = list(conditions)
+            params: List[int] = list(bound.values())
+            if last_row is not None:
+                page_conditions.append("(%s) > (?, ?, ?)" % order_sql)
+                params.extend(last_row)
+            sql = select_sql
+            if len(page_conditions) > 0:
+                sql += " WHERE " + " AND ".join(page_conditions)
+            sql += " ORDER BY %s LIMIT %d" % (order_sql, _BATCH_SIZE)
+            rows = self._connection.execute(sql, params).fetchall()
+            for row in rows:
+                ids = dict(zip(order, row))
+                yield (
+                    self._term(ids["s"]),
+                    self._term(ids["p"]),
+                    self._term(ids["o"]),
+                ), self._triple_contexts(ids)
+            if len(rows) < _BATCH_SIZE:
+                break
+            last_row = rows[-1]
+
+    def __len__(self, context: Any = None) -> int:
+        self._flush()
+        if context is None:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM (SELECT DISTINCT s, p, o FROM triples)"
+            ).fetchone()
+            return int(row[0])
+        c_id = self._term_id(context.identifier, False)
+        if c_id is None:
+            return 0
+        row = self._connection.execute(
+            "SELECT COUNT(*) FROM triples WHERE c = ?", (c_id,)
+        ).fetchone()
+        return int(row[0])
+
+    def contexts(
+        self, triple: Optional[Tuple[Any, Any, Any]] = None
+    ) -> Generator[rdflib.Graph, None, None]:
+        if triple is None or triple == (None, None, None):
+            yield from list(self._context_graphs.values())
+            return
+        for _, triple_contexts in self.triples(triple):
+            yield from triple_contexts
+
+    def add_graph(self, graph: rdflib.Graph) -> None:
+        self._context_graphs.setdefault(graph.identifier, graph)
+
+    def remove_graph(self, graph: rdflib.Graph) -> None:
+        self.remove((None, None, None), graph)
+        self._context_graphs.pop(graph.identifier, None)
+
+    def bind(
+        self, prefix: str, namespace: rdflib.URIRef, override: bool = True
+    ) -> None:
+        self._namespaces.bind(prefix, namespace, override)
+
+    def namespace(self, prefix: str) -> Optional[rdflib.URIRef]:
+        return self._namespaces.namespace(prefix)
+
+    def prefix(self, namespace: rdflib.URIRef) -> Optional[str]:
+        return self._namespaces.prefix(namespace)
+
+    def namespaces(self) -> Iterator[Tuple[str, rdflib.URIRef]]:
+        return self._namespaces.namespaces()
+
+
+@contextlib.contextmanager
+def disk_backed_graph(
+    store_dir: Optional[str] = None, cache_size: int = DEFAULT_CACHE_SIZE
+) -> Iterator[rdflib.Graph]:
+    """
+    Provide an empty graph kept in a temporary SQLite database file, which is removed on exit.
+
+    :param store_dir: The directory of the database file.  If None, the system temporary directory is used.
+    :param cache_size: See SQLiteStore.
+    """
+    fd, store_path = tempfile.mkstemp(
+        dir=store_dir, prefix="case_validate-", suffix=".sqlite"
+    )
+    os.close(fd)
+    _logger.debug("Storing data graph in %r.", store_path)
+    store = SQLiteStore(cache_size=cache_size)
+    try:
+        store.open(store_path)
+        yield rdflib.Graph(store=store)
+    finally:
+        store.destroy(store_path)
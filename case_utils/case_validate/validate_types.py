@@ -16,11 +16,65 @@
 
 __version__ = "0.1.0"
 
-from typing import Set, Union
+from typing import List, Optional, Set, Union
 
 import rdflib
 
 
+class ShapeProfile:
+    """
+    This class records the cost of evaluating one SHACL shape during a validation run.
+
+    total_seconds includes the evaluation of shapes nested under this shape (e.g. by sh:property or sh:node), and self_seconds excludes it.  results counts the validation results whose sh:sourceShape is this shape.
+    """
+
+    def __init__(
+        self,
+        shape: rdflib.term.Node,
+        *,
+        path: Optional[str] = None,
+        is_property_shape: bool = False,
+    ) -> None:
+        self.shape = shape
+        self.path = path
+        self.is_property_shape = is_property_shape
+        self.invocations = 0
+        self.focus_nodes = 0
+        self.results = 0
+        self.total_seconds = 0.0
+        self.self_seconds = 0.0
+
+
+class ShapeSample:
+    """
+    This class records the evaluation of one SHACL shape against a random sample of its focus nodes.
+
+    n_focus_nodes_with_results counts the sampled focus nodes with at least one validation result from the shape, including results from shapes nested under it.
+    """
+
+    def __init__(
+        self,
+        shape: rdflib.term.Node,
+        *,
+        n_focus_nodes: int,
+        n_sampled: int,
+        n_focus_nodes_with_results: int,
+    ) -> None:
+        self.shape = shape
+        self.n_focus_nodes = n_focus_nodes
+        self.n_sampled = n_sampled
+        self.n_focus_nodes_with_results = n_focus_nodes_with_results
+
+    @property
+    def rate(self) -> float:
+        """
+        The observed rate of sampled focus nodes with results.
+        """
+        if self.n_sampled == 0:
+            return 0.0
+        return self.n_focus_nodes_with_results / self.n_sampled
+
+
 class ValidationResult:
     def __init__(
         self,
@@ -28,11 +82,17 @@ class ValidationResult:
         graph: Union[Exception, bytes, str, rdflib.Graph],
         text: str,
         undefined_concepts: Set[rdflib.URIRef],
+        shape_profiles: Optional[List[ShapeProfile]] = None,
+        results_capped: bool = False,
+        shape_samples: Optional[List[ShapeSample]] = None,
     ) -> None:
         self.conforms = conforms
         self.graph = graph
         self.text = text
         self.undefined_concepts = undefined_concepts
+        self.shape_profiles = shape_profiles
+        self.results_capped = results_capped
+        self.shape_samples = shape_samples
 
 
 class NonExistentCDOConceptWarning(UserWarning):
@@ -43,6 +103,14 @@ class NonExistentCDOConceptWarning(UserWarning):
     pass
 
 
+class UnsupportedPySHACLWarning(UserWarning):
+    """
+    This class is used when the installed pySHACL release does not have the shape methods that case_utils shape validation hooks wrap, so the features built on the hooks are turned off.  Those features are result streaming, result limits, shape profiling, focus node sampling, and constraint pre-checks.
+    """
+
+    pass
+
+
 class NonExistentCASEVersionError(Exception):
     """
     This class is used when an invalid CASE version is requested that is not supported by the library.
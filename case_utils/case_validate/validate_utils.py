@@ -16,15 +16,18 @@
 
 __version__ = "0.3.0"
 
+import functools
 import importlib
 import logging
 import os
-from typing import List, Optional, Set
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
 
 import rdflib
 
 import case_utils
+import case_utils.ontology
 from case_utils.case_validate.validate_types import NonExistentCASEVersionError
+from case_utils.graph_loading import parse_graph
 from case_utils.ontology.version_info import CURRENT_CASE_VERSION
 
 NS_OWL = rdflib.OWL
@@ -32,6 +35,12 @@ NS_RDF = rdflib.RDF
 NS_RDFS = rdflib.RDFS
 NS_SH = rdflib.SH
 
+# These SHACL terms are Python keywords, and so cannot be spelled as
+# attributes of NS_SH.
+_SH_AND = rdflib.URIRef(str(NS_SH) + "and")
+_SH_NOT = rdflib.URIRef(str(NS_SH) + "not")
+_SH_OR = rdflib.URIRef(str(NS_SH) + "or")
+
 _logger = logging.getLogger(os.path.basename(__file__))
 
 
@@ -83,6 +92,16 @@ def get_invalid_cdo_concepts(
     >>> # Note that the property "ourCustomProperty" was typo'd in the data graph, but this was not reported.
     >>> assert ns_ex.ourCustomProperty not in invalid_cdo_concepts
     """
+    return get_data_cdo_concepts(data_graph) - get_cdo_concepts(ontology_graph)
+
+
+def get_cdo_concepts(ontology_graph: rdflib.Graph) -> Set[rdflib.URIRef]:
+    """
+    Get the set of CDO concepts defined in the ontology graph, along with the historical CDO ontology and version IRIs.  This is the index against which get_invalid_cdo_concepts reviews data graphs.
+
+    :param ontology_graph: The ontology graph to use for validation.
+    :return: The set of defined CDO concepts.
+    """
     # Construct set of CDO concepts for data graph concept-existence review.
     cdo_concepts: Set[rdflib.URIRef] = set()
 
@@ -132,56 +151,115 @@ def get_invalid_cdo_concepts(
             continue
         cdo_concepts.add(rdflib.URIRef(cleaned_line))
 
+    return cdo_concepts
+
+
+def _get_data_terms(data_graph: rdflib.Graph) -> Set[rdflib.term.Node]:
+    """
+    :return: The distinct subjects, predicates, and objects of the data graph, found in one pass over its triples.
+    """
+    subjects: Set[rdflib.term.Node] = set()
+    predicates: Set[rdflib.term.Node] = set()
+    objects: Set[rdflib.term.Node] = set()
+    for s, p, o in data_graph.triples((None, None, None)):
+        subjects.add(s)
+        predicates.add(p)
+        objects.add(o)
+    return subjects | predicates | objects
+
+
+def get_data_cdo_concepts(data_graph: rdflib.Graph) -> Set[rdflib.URIRef]:
+    """
+    Get the set of concepts with CDO IRIs used in the data graph, as subjects, predicates, objects, or literal datatypes.
+
+    Each distinct term of the data graph is reviewed once, rather than each position of each triple.
+
+    :param data_graph: The data graph to validate.
+    :return: The set of used CDO concepts.
+    """
+    data_terms = _get_data_terms(data_graph)
+
     data_cdo_concepts: Set[rdflib.URIRef] = set()
-    for data_triple in data_graph.triples((None, None, None)):
-        for data_triple_member in data_triple:
-            if isinstance(data_triple_member, rdflib.URIRef):
-                if concept_is_cdo_concept(data_triple_member):
-                    data_cdo_concepts.add(data_triple_member)
-            elif isinstance(data_triple_member, rdflib.Literal):
-                if isinstance(data_triple_member.datatype, rdflib.URIRef):
-                    if concept_is_cdo_concept(data_triple_member.datatype):
-                        data_cdo_concepts.add(data_triple_member.datatype)
+    for data_term in data_terms:
+        n_concept: rdflib.URIRef
+        if isinstance(data_term, rdflib.URIRef):
+            n_concept = data_term
+        elif isinstance(data_term, rdflib.Literal) and isinstance(
+            data_term.datatype, rdflib.URIRef
+        ):
+            n_concept = data_term.datatype
+        else:
+            continue
+        if n_concept in data_cdo_concepts or not concept_is_cdo_concept(n_concept):
+            continue
+        data_cdo_concepts.add(n_concept)
 
-    return data_cdo_concepts - cdo_concepts
+    return data_cdo_concepts
+
+
+def normalize_case_version(case_version: Optional[str] = None) -> str:
+    """
+    Normalize a requested CASE version to the form used in the names of the ontology files shipped with this package, e.g. "case-1.3.0".
+
+    :param case_version: As in get_ontology_graph.  The string "none" is returned unchanged.
+
+    >>> normalize_case_version("1.2.0")
+    'case-1.2.0'
+    >>> normalize_case_version("case-1.2.0")
+    'case-1.2.0'
+    """
+    if case_version is None or case_version == "":
+        case_version = CURRENT_CASE_VERSION
+    # If the first character case_version is numeric, prepend case- to it. This allows for the version to be passed
+    # by the library as both case-1.2.0 and 1.2.0
+    if case_version[0].isdigit():
+        case_version = "case-" + case_version
+    return case_version
 
 
 def get_ontology_graph(
-    case_version: Optional[str] = None, supplemental_graphs: Optional[List[str]] = None
+    case_version: Optional[str] = None,
+    supplemental_graphs: Optional[List[str]] = None,
+    *,
+    abox_only: bool = False,
 ) -> rdflib.Graph:
     """
     Get the ontology graph for the given case_version and any supplemental graphs.
 
     :param case_version: the version of the CASE ontology to use.  If None (i.e. null), the most recent version will be used.  If "none" (the string), no pre-built version of CASE will be used.
     :param supplemental_graphs: a list of supplemental graphs to use.  If None, no supplemental graphs will be used.
-    :return: the ontology graph against which to validate the data graph.
+    :param abox_only: If True, and the package includes an ABox-only variant of the CASE version, that variant is used.  It omits the shapes deactivated by disable_tbox_review, which is still needed for any supplemental graphs.
+    :return: the ontology graph against which to validate the data graph.  See also get_class_hierarchy_graph and get_shapes_graph, for the partitions of this graph used for ABox validation.
     """
     ontology_graph = rdflib.Graph()
 
     if case_version != "none":
         # Load bundled CASE ontology at requested version.
-        if case_version is None or case_version == "":
-            case_version = CURRENT_CASE_VERSION
-        # If the first character case_version is numeric, prepend case- to it. This allows for the version to be passed
-        # by the library as both case-1.2.0 and 1.2.0
-        if case_version[0].isdigit():
-            case_version = "case-" + case_version
+        case_version = normalize_case_version(case_version)
         ttl_filename = case_version + ".ttl"
         _logger.debug("ttl_filename = %r.", ttl_filename)
         # Ensure the requested version of the CASE ontology is available and if not, throw an appropriate exception
         # that can be returned in a user-friendly message.
-        if not importlib.resources.is_resource(case_utils.ontology, ttl_filename):
+        ontology_files = importlib.resources.files(case_utils.ontology)
+        if not ontology_files.joinpath(ttl_filename).is_file():
             raise NonExistentCASEVersionError(
                 f"The requested version ({case_version}) of the CASE ontology is not available.  Please choose a "
                 f"different version. The latest supported version is: {CURRENT_CASE_VERSION}"
             )
+        if abox_only:
+            abox_ttl_filename = case_version + "-abox.ttl"
+            # Versions from before UCO's TBox-review shapes have no
+            # ABox-only variant.
+            if ontology_files.joinpath(abox_ttl_filename).is_file():
+                ttl_filename = abox_ttl_filename
+                _logger.debug("ttl_filename = %r.", ttl_filename)
         ttl_data = importlib.resources.read_text(case_utils.ontology, ttl_filename)
         ontology_graph.parse(data=ttl_data, format="turtle")
 
     if supplemental_graphs:
         for arg_ontology_graph in supplemental_graphs:
             _logger.debug("arg_ontology_graph = %r.", arg_ontology_graph)
-            ontology_graph.parse(arg_ontology_graph)
+            parse_graph(ontology_graph, arg_ontology_graph)
 
     return ontology_graph
 
@@ -212,3 +290,377 @@ def disable_tbox_review(graph: rdflib.Graph) -> None:
     }:
         n_tbox_shape = ns_uco_owl[tbox_shape_basename]
         graph.add((n_tbox_shape, NS_SH.deactivated, l_true))
+
+
+def _get_shape_nodes(shapes_graph: rdflib.Graph) -> Set[rdflib.term.Node]:
+    """
+    Get the set of nodes that pySHACL would load as shapes from the shapes graph.
+
+    This follows the shape-discovery rules of pySHACL's ShapesGraph class: explicitly typed NodeShapes and PropertyShapes, subjects of target and shape-containing predicates, and values of shape-expecting predicates.
+    """
+    shape_nodes: Set[rdflib.term.Node] = set()
+    for n_shape_class in [NS_SH.NodeShape, NS_SH.PropertyShape]:
+        shape_nodes |= set(shapes_graph.subjects(NS_RDF.type, n_shape_class))
+    for n_predicate in [
+        NS_SH.node,
+        NS_SH.property,
+        NS_SH.targetClass,
+        NS_SH.targetNode,
+        NS_SH.targetObjectsOf,
+        NS_SH.targetSubjectsOf,
+    ]:
+        shape_nodes |= set(shapes_graph.subjects(n_predicate, None))
+    for n_predicate in [
+        NS_SH.node,
+        _SH_NOT,
+        NS_SH.property,
+        NS_SH.qualifiedValueShape,
+    ]:
+        shape_nodes |= set(shapes_graph.objects(None, n_predicate))
+    for n_predicate in [_SH_AND, _SH_OR, NS_SH.xone]:
+        for n_list in shapes_graph.objects(None, n_predicate):
+            shape_nodes |= set(shapes_graph.items(n_list))
+    return shape_nodes
+
+
+def get_superclass_closure_table(
+    graphs: Iterable[rdflib.Graph],
+) -> Dict[rdflib.term.Node, FrozenSet[rdflib.term.Node]]:
+    """
+    Get a table mapping each subclass to itself and all of its superclasses, following rdfs:subClassOf statements in any of the given graphs.
+
+    :param graphs: The graphs housing the class hierarchy.
+    :return: A dictionary, keyed by each subject of an rdfs:subClassOf statement.
+
+    >>> from case_utils.namespace import NS_RDFS, NS_UCO_CORE, NS_UCO_OBSERVABLE
+    >>> from rdflib import Graph
+    >>> g = Graph()
+    >>> _ = g.add((NS_UCO_OBSERVABLE.File, NS_RDFS.subClassOf, NS_UCO_OBSERVABLE.ObservableObject))
+    >>> _ = g.add((NS_UCO_OBSERVABLE.ObservableObject, NS_RDFS.subClassOf, NS_UCO_CORE.UcoObject))
+    >>> table = get_superclass_closure_table([g])
+    >>> sorted(str(x).split("/")[-1] for x in table[NS_UCO_OBSERVABLE.File])
+    ['File', 'ObservableObject', 'UcoObject']
+    """
+    superclasses: Dict[rdflib.term.Node, Set[rdflib.term.Node]] = dict()
+    for graph in graphs:
+        for n_subclass, n_superclass in graph.subject_objects(NS_RDFS.subClassOf):
+            if n_subclass not in superclasses:
+                superclasses[n_subclass] = set()
+            superclasses[n_subclass].add(n_superclass)
+
+    table: Dict[rdflib.term.Node, FrozenSet[rdflib.term.Node]] = dict()
+    for n_subclass in superclasses:
+        closure: Set[rdflib.term.Node] = set()
+        pending: List[rdflib.term.Node] = [n_subclass]
+        while len(pending) > 0:
+            n_class = pending.pop()
+            if n_class in closure:
+                continue
+            closure.add(n_class)
+            pending.extend(superclasses.get(n_class, set()) - closure)
+        table[n_subclass] = frozenset(closure)
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def get_bundled_superclass_closure_table(
+    built_version: str,
+) -> Mapping[rdflib.term.Node, FrozenSet[rdflib.term.Node]]:
+    """
+    Get the superclass closure table of a CASE version shipped with this package.  The table is computed once per version per process.
+
+    :param built_version: A value from case_utils.ontology.version_info.built_version_choices_list, other than "none".
+    :return: See get_superclass_closure_table.
+    """
+    return get_superclass_closure_table(
+        [case_utils.ontology.get_subclass_hierarchy_graph(built_version)]
+    )
+
+
+def _get_superclass_closure(
+    n_classes: Set[rdflib.term.Node], graphs: Iterable[rdflib.Graph]
+) -> Set[rdflib.term.Node]:
+    """
+    Get the given classes and all of their superclasses, following rdfs:subClassOf statements in any of the given graphs.
+    """
+    table = get_superclass_closure_table(graphs)
+    closure: Set[rdflib.term.Node] = set()
+    for n_class in n_classes:
+        closure |= table.get(n_class, {n_class})
+    return closure
+
+
+def materialize_type_closure(
+    data_graph: rdflib.Graph,
+    hierarchy_graph: rdflib.Graph,
+    superclass_closure_table: Optional[
+        Mapping[rdflib.term.Node, FrozenSet[rdflib.term.Node]]
+    ] = None,
+) -> int:
+    """
+    Add to the data graph the rdf:type statements entailed by the class hierarchy, for every typed node in the data graph.
+
+    Nodes used in the data graph that are typed in the hierarchy graph, such as concepts defined in the ontology, also receive their types from the hierarchy graph.  After this function runs, the data graph can be validated against class-targeting shapes without mixing in the ontology graph, and without RDFS inferencing, unless the data graph has typed blank nodes.
+
+    Blank nodes are not given additional types, because validation reports describe blank nodes by their statements, and those descriptions would otherwise differ from validation with the ontology graph mixed in.
+
+    :param data_graph: The data graph, which is modified in place.
+    :param hierarchy_graph: The class hierarchy, e.g. as returned by get_class_hierarchy_graph.
+    :param superclass_closure_table: A precomputed table from get_superclass_closure_table.  If None, the table is computed from the hierarchy graph and the data graph.  If provided, it must also account for any rdfs:subClassOf statements in the data graph.
+    :return: The number of rdf:type statements added.
+
+    >>> from case_utils.namespace import NS_RDF, NS_RDFS, NS_UCO_CORE, NS_UCO_OBSERVABLE
+    >>> from rdflib import Graph, URIRef
+    >>> hg = Graph()
+    >>> _ = hg.add((NS_UCO_OBSERVABLE.File, NS_RDFS.subClassOf, NS_UCO_OBSERVABLE.ObservableObject))
+    >>> _ = hg.add((NS_UCO_OBSERVABLE.ObservableObject, NS_RDFS.subClassOf, NS_UCO_CORE.UcoObject))
+    >>> dg = Graph()
+    >>> n_file = URIRef("http://example.org/kb/File-1")
+    >>> _ = dg.add((n_file, NS_RDF.type, NS_UCO_OBSERVABLE.File))
+    >>> materialize_type_closure(dg, hg)
+    2
+    >>> (n_file, NS_RDF.type, NS_UCO_CORE.UcoObject) in dg
+    True
+    """
+    if superclass_closure_table is None:
+        superclass_closure_table = get_superclass_closure_table(
+            [hierarchy_graph, data_graph]
+        )
+
+    n_node_types: Dict[rdflib.term.Node, Set[rdflib.term.Node]] = dict()
+    for n_node, n_type in data_graph.subject_objects(NS_RDF.type):
+        if isinstance(n_node, rdflib.BNode):
+            continue
+        if n_node not in n_node_types:
+            n_node_types[n_node] = set()
+        n_node_types[n_node].add(n_type)
+    for n_node, n_type in hierarchy_graph.subject_objects(NS_RDF.type):
+        if n_node not in n_node_types:
+            if (n_node, None, None) not in data_graph and (
+                None,
+                None,
+                n_node,
+            ) not in data_graph:
+                continue
+            n_node_types[n_node] = set()
+        n_node_types[n_node].add(n_type)
+
+    inferred_triples: List[
+        Tuple[rdflib.term.Node, rdflib.term.Node, rdflib.term.Node]
+    ] = []
+    for n_node, n_types in n_node_types.items():
+        n_entailed_types: Set[rdflib.term.Node] = set()
+        for n_type in n_types:
+            n_entailed_types |= superclass_closure_table.get(n_type, {n_type})
+        for n_entailed_type in n_entailed_types:
+            if (n_node, NS_RDF.type, n_entailed_type) not in data_graph:
+                inferred_triples.append((n_node, NS_RDF.type, n_entailed_type))
+
+    for inferred_triple in inferred_triples:
+        data_graph.add(inferred_triple)
+    return len(inferred_triples)
+
+
+def get_pruned_shapes_graph(
+    data_graph: rdflib.Graph,
+    shapes_graph: rdflib.Graph,
+    ontology_graph: Optional[rdflib.Graph] = None,
+) -> rdflib.Graph:
+    """
+    Get a copy of the shapes graph, reduced to the shapes that could have focus nodes in the data graph, and the shapes those shapes reference.
+
+    A shape is retained if any of its targets can match: a sh:targetClass or implicit class target that is a type, or a superclass of a type, of some node; a sh:targetSubjectsOf or sh:targetObjectsOf predicate that is used in some triple; or any sh:targetNode or sh:target declaration.  Because pySHACL mixes the ontology graph into the data graph before finding focus nodes, types and predicates are collected from both graphs.  Shapes marked sh:deactivated are only retained if referenced.
+
+    Validating with the reduced shapes graph produces the same results as validating with the full shapes graph, provided the data graph is not altered before validation, e.g. by inferencing, owl:imports, or SHACL rules.
+
+    :param data_graph: The data graph that will be validated.
+    :param shapes_graph: The graph containing the SHACL shapes.
+    :param ontology_graph: The ontology graph that will be mixed into the data graph during validation.  If None, no ontology graph is mixed in.
+    :return: A new graph, containing the statements describing the retained shapes.
+
+    >>> from case_utils.namespace import NS_RDF, NS_SH, NS_UCO_CORE
+    >>> from rdflib import BNode, Graph, Namespace
+    >>> ns_kb = Namespace("http://example.org/kb/")
+    >>> dg = Graph()
+    >>> sg = Graph()
+    >>> # Define two class-targeting shapes, each with a blank-node property shape.
+    >>> for n_shape, n_class in [
+    ...     (NS_UCO_CORE["UcoObject-shape"], NS_UCO_CORE.UcoObject),
+    ...     (NS_UCO_CORE["Relationship-shape"], NS_UCO_CORE.Relationship),
+    ... ]:
+    ...     n_property_shape = BNode()
+    ...     _ = sg.add((n_shape, NS_RDF.type, NS_SH.NodeShape))
+    ...     _ = sg.add((n_shape, NS_SH.targetClass, n_class))
+    ...     _ = sg.add((n_shape, NS_SH.property, n_property_shape))
+    ...     _ = sg.add((n_property_shape, NS_SH.path, NS_UCO_CORE.name))
+    >>> # Only a UcoObject is in the data graph.
+    >>> _ = dg.add((ns_kb["UcoObject-1"], NS_RDF.type, NS_UCO_CORE.UcoObject))
+    >>> pruned_graph = get_pruned_shapes_graph(dg, sg)
+    >>> len(sg)
+    8
+    >>> len(pruned_graph)
+    4
+    >>> (NS_UCO_CORE["Relationship-shape"], None, None) in pruned_graph
+    False
+    """
+    mixed_graphs: List[rdflib.Graph] = [data_graph]
+    if ontology_graph is not None:
+        mixed_graphs.append(ontology_graph)
+
+    # Collect the classes and predicates that could match targets.
+    n_used_classes: Set[rdflib.term.Node] = set()
+    n_used_predicates: Set[rdflib.term.Node] = set()
+    for graph in mixed_graphs:
+        n_used_classes |= set(graph.objects(None, NS_RDF.type))
+        n_used_predicates |= set(graph.predicates(None, None))
+    n_targetable_classes = _get_superclass_closure(n_used_classes, mixed_graphs)
+
+    # pySHACL treats a shape as implicitly targeting itself as a class
+    # if the shape is an rdfs:Class, owl:Class, or instance of a
+    # declared subclass of rdfs:Class.
+    n_class_types: Set[rdflib.term.Node] = {NS_OWL.Class, NS_RDFS.Class}
+    n_class_types |= set(shapes_graph.subjects(NS_RDFS.subClassOf, NS_RDFS.Class))
+
+    shape_nodes = _get_shape_nodes(shapes_graph)
+    l_true = rdflib.Literal(True)
+
+    def _shape_can_match(n_shape: rdflib.term.Node) -> bool:
+        if (n_shape, NS_SH.deactivated, l_true) in shapes_graph:
+            return False
+        for n_predicate in [NS_SH.target, NS_SH.targetNode]:
+            for _ in shapes_graph.objects(n_shape, n_predicate):
+                return True
+        for n_target_class in shapes_graph.objects(n_shape, NS_SH.targetClass):
+            if n_target_class in n_targetable_classes:
+                return True
+        if n_shape in n_targetable_classes:
+            for n_type in shapes_graph.objects(n_shape, NS_RDF.type):
+                if n_type in n_class_types:
+                    return True
+        for n_predicate in [NS_SH.targetObjectsOf, NS_SH.targetSubjectsOf]:
+            for n_target_predicate in shapes_graph.objects(n_shape, n_predicate):
+                if n_target_predicate in n_used_predicates:
+                    return True
+        return False
+
+    n_retained_shapes = {
+        n_shape for n_shape in shape_nodes if _shape_can_match(n_shape)
+    }
+    pruned_graph = _copy_shapes(shapes_graph, n_retained_shapes, shape_nodes)
+
+    _logger.debug(
+        "Retained %d of %d shapes, in %d of %d triples.",
+        len(set(pruned_graph.subjects()) & shape_nodes),
+        len(shape_nodes),
+        len(pruned_graph),
+        len(shapes_graph),
+    )
+
+    return pruned_graph
+
+
+def _copy_shapes(
+    shapes_graph: rdflib.Graph,
+    n_shapes: Set[rdflib.term.Node],
+    shape_nodes: Set[rdflib.term.Node],
+) -> rdflib.Graph:
+    """
+    Copy the given shapes, and everything pySHACL needs to load and evaluate them, into a new graph.
+
+    :param shapes_graph: The graph containing the SHACL shapes.
+    :param n_shapes: The shapes to copy.
+    :param shape_nodes: All nodes that pySHACL would load as shapes from shapes_graph.  Named shapes referenced by copied shapes are also copied.
+    :return: A new graph.
+    """
+    copied_graph = rdflib.Graph()
+    for prefix, namespace in shapes_graph.namespace_manager.namespaces():
+        copied_graph.bind(prefix, namespace)
+
+    # Copy system-level triples that influence implicit class targets.
+    for n_class_type in shapes_graph.subjects(NS_RDFS.subClassOf, NS_RDFS.Class):
+        copied_graph.add((n_class_type, NS_RDFS.subClassOf, NS_RDFS.Class))
+
+    # Copy the bounded description of each shape, following blank
+    # nodes, and queueing named shapes reached through shape-expecting
+    # predicates and named prefix declarations.
+    n_shape_referencing_predicates = {
+        NS_RDF.first,
+        NS_SH.node,
+        _SH_NOT,
+        NS_SH.property,
+        NS_SH.qualifiedValueShape,
+    }
+    n_prefix_referencing_predicates = {NS_OWL.imports, NS_SH.prefixes}
+    pending: List[rdflib.term.Node] = list(n_shapes)
+    # Custom constraint components are found by pySHACL by type, not by reference.
+    pending.extend(shapes_graph.subjects(NS_RDF.type, NS_SH.ConstraintComponent))
+    visited: Set[rdflib.term.Node] = set()
+    while len(pending) > 0:
+        n_subject = pending.pop()
+        if n_subject in visited:
+            continue
+        visited.add(n_subject)
+        for triple in shapes_graph.triples((n_subject, None, None)):
+            copied_graph.add(triple)
+            n_object = triple[2]
+            if n_object in visited:
+                continue
+            if isinstance(n_object, rdflib.BNode):
+                pending.append(n_object)
+            elif triple[1] in n_shape_referencing_predicates:
+                if n_object in shape_nodes:
+                    pending.append(n_object)
+            elif triple[1] in n_prefix_referencing_predicates:
+                pending.append(n_object)
+
+    return copied_graph
+
+
+def get_class_hierarchy_graph(ontology_graph: rdflib.Graph) -> rdflib.Graph:
+    """
+    Get the partition of the ontology graph needed for rdf:type reasoning during SHACL validation.
+
+    This partition holds the rdfs:subClassOf and rdfs:subPropertyOf statements between named concepts, and the rdf:type statements of named concepts and individuals, excepting typing as SHACL shapes.  It is meant to be mixed into the data graph in place of the whole ontology graph, for ABox validation without OWL inferencing.
+
+    :param ontology_graph: The ontology graph, e.g. as returned by get_ontology_graph.
+    :return: A new graph, with the prefixes of the ontology graph.  pySHACL carries the prefixes of the mixed-in graph into validation reports.
+
+    >>> from case_utils.namespace import NS_OWL, NS_RDF, NS_RDFS, NS_SH, NS_UCO_CORE
+    >>> from rdflib import BNode, Graph, Literal
+    >>> og = Graph()
+    >>> _ = og.add((NS_UCO_CORE.UcoObject, NS_RDF.type, NS_OWL.Class))
+    >>> _ = og.add((NS_UCO_CORE.UcoObject, NS_RDF.type, NS_SH.NodeShape))
+    >>> _ = og.add((NS_UCO_CORE.UcoObject, NS_RDFS.subClassOf, NS_UCO_CORE.UcoThing))
+    >>> _ = og.add((NS_UCO_CORE.UcoObject, NS_RDFS.label, Literal("UcoObject")))
+    >>> _ = og.add((NS_UCO_CORE.UcoObject, NS_SH.property, BNode()))
+    >>> hierarchy_graph = get_class_hierarchy_graph(og)
+    >>> len(hierarchy_graph)
+    2
+    """
+    hierarchy_graph = rdflib.Graph()
+    for prefix, namespace in ontology_graph.namespace_manager.namespaces():
+        hierarchy_graph.bind(prefix, namespace)
+    for n_predicate in [NS_RDFS.subClassOf, NS_RDFS.subPropertyOf]:
+        for triple in ontology_graph.triples((None, n_predicate, None)):
+            if isinstance(triple[0], rdflib.URIRef) and isinstance(
+                triple[2], rdflib.URIRef
+            ):
+                hierarchy_graph.add(triple)
+    for triple in ontology_graph.triples((None, NS_RDF.type, None)):
+        if not isinstance(triple[0], rdflib.URIRef):
+            continue
+        if str(triple[2]).startswith(str(NS_SH)):
+            continue
+        hierarchy_graph.add(triple)
+    return hierarchy_graph
+
+
+def get_shapes_graph(ontology_graph: rdflib.Graph) -> rdflib.Graph:
+    """
+    Get the partition of the ontology graph that holds the SHACL shapes.
+
+    :param ontology_graph: The ontology graph, e.g. as returned by get_ontology_graph.
+    :return: A new graph, containing the statements describing all shapes, and any prefix declarations and constraint components the shapes use.
+    """
+    shape_nodes = _get_shape_nodes(ontology_graph)
+    return _copy_shapes(ontology_graph, shape_nodes, shape_nodes)
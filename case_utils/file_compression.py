@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This library reads and writes the files of the case_utils command line tools, decompressing and compressing them as their file extensions indicate.
+
+The file name "-" stands for standard input when reading, and standard output when writing.
+
+A compressed file is named by appending a compression extension to the name it would have uncompressed, e.g. "graph.jsonld.gz" or "graph.nt.zst".  The inner extension still determines the file format.  Files are decompressed and compressed as they are read and written, without temporary files.
+
+gzip, bzip2, and xz compression use the standard library.  Zstandard compression uses the standard library's compression.zstd module where available (Python 3.14 and later), and otherwise the zstandard package, if installed.
+"""
+
+__version__ = "0.1.0"
+
+import argparse
+import bz2
+import gzip
+import importlib
+import logging
+import lzma
+import os
+import pathlib
+import sys
+from typing import IO, Any, Dict, Optional, cast
+
+import rdflib
+import rdflib.util
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+COMPRESSION_EXTENSIONS: Dict[str, str] = {
+    ".bz2": "bzip2",
+    ".gz": "gzip",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+"Compression schemes, keyed by file extension."
+
+
+def compression_of(filename: str) -> Optional[str]:
+    """
+    :return: The compression scheme of the file, from its extension, or None if the file is not compressed.
+
+    >>> compression_of("graph.jsonld.gz")
+    'gzip'
+    >>> compression_of("graph.ttl") is None
+    True
+    """
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def uncompressed_name(filename: str) -> str:
+    """
+    :return: The file name without its compression extension, if any.
+
+    >>> uncompressed_name("graph.nt.zst")
+    'graph.nt'
+    >>> uncompressed_name("graph.nt")
+    'graph.nt'
+    """
+    if compression_of(filename) is None:
+        return filename
+    return os.path.splitext(filename)[0]
+
+
+def guess_format(filename: str) -> Optional[str]:
+    """
+    :return: The RDF format of the file, guessed by rdflib.util.guess_format from the file's extension, after removing any compression extension.
+
+    >>> guess_format("graph.jsonld.gz")
+    'json-ld'
+    """
+    return rdflib.util.guess_format(uncompressed_name(filename))
+
+
+def _zstd_open(filename: str, mode: str, **kwargs: Any) -> IO[Any]:
+    for module_name in ["compression.zstd", "zstandard"]:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        _logger.debug("Using %s for %r.", module_name, filename)
+        zstd_file: IO[Any] = module.open(filename, mode, **kwargs)
+        return zstd_file
+    raise ImportError(
+        "Reading or writing Zstandard-compressed file %r requires Python 3.14 or later, or the zstandard package."
+        % filename
+    )
+
+
+def _open_standard_stream(mode: str, **kwargs: Any) -> IO[Any]:
+    """
+    :return: A file object reading standard input or writing standard output, which leaves the stream open when it is closed.
+    """
+    if "r" in mode:
+        return open(sys.stdin.fileno(), mode, closefd=False, **kwargs)
+    # Anything already written through sys.stdout comes first.
+    sys.stdout.flush()
+    return open(sys.stdout.fileno(), mode, closefd=False, **kwargs)
+
+
+def open_file(
+    filename: str,
+    mode: str = "r",
+    *,
+    encoding: Optional[str] = None,
+    errors: Optional[str] = None,
+    newline: Optional[str] = None,
+) -> IO[Any]:
+    """
+    Open a file, as the built-in open() does, decompressing reads and compressing writes if the file name has a compression extension.  The file name "-" opens standard input or standard output, depending on the mode.
+
+    :param mode: As for open(), without "+".  Text mode is the default, as for open().
+    """
+    if filename == "-":
+        return _open_standard_stream(
+            mode, encoding=encoding, errors=errors, newline=newline
+        )
+    compression = compression_of(filename)
+    if compression is None:
+        return open(filename, mode, encoding=encoding, errors=errors, newline=newline)
+
+    if "b" not in mode and "t" not in mode:
+        # The compression modules' default is binary mode.
+        mode += "t"
+    kwargs: Dict[str, Any] = dict()
+    if "t" in mode:
+        kwargs = {"encoding": encoding, "errors": errors, "newline": newline}
+
+    if compression == "bzip2":
+        return bz2.open(filename, mode, **kwargs)
+    if compression == "gzip":
+        # GzipFile does not implement all of IO, though it reads and
+        # writes like a file.
+        return cast(IO[Any], gzip.open(filename, mode, **kwargs))
+    if compression == "xz":
+        return lzma.open(filename, mode, **kwargs)
+    return _zstd_open(filename, mode, **kwargs)
+
+
+def parse_file(
+    graph: rdflib.Graph, filename: str, format: Optional[str] = None
+) -> rdflib.Graph:
+    """
+    Parse a graph file with rdflib, decompressing it if its name has a compression extension.  The file name "-" reads standard input.
+
+    :param format: The RDF format.  If absent, the format is guessed from the file extension, as `rdflib.Graph.parse` does.  Standard input is read as Turtle if no format is given, as rdflib does for files it cannot guess the format of.
+    :return: The graph passed in, for convenience.
+    """
+    if filename == "-":
+        with open_file(filename, "rb") as in_fh:
+            graph.parse(source=in_fh, format=format)
+        return graph
+    if compression_of(filename) is None:
+        return graph.parse(filename, format=format)
+
+    if format is None:
+        format = guess_format(filename)
+    with open_file(filename, "rb") as in_fh:
+        # Relative IRIs are resolved against the file's location, as
+        # they are for uncompressed files.
+        graph.parse(
+            source=in_fh,
+            format=format,
+            publicID=pathlib.Path(filename).absolute().as_uri(),
+        )
+    return graph
+
+
+class FileType(argparse.FileType):
+    """
+    This argument type opens files as argparse.FileType does, and with open_file if the file name has a compression extension.
+    """
+
+    def __call__(self, string: str) -> IO[Any]:
+        if string == "-" or compression_of(string) is None:
+            return super().__call__(string)
+        try:
+            return open_file(
+                string, self._mode, encoding=self._encoding, errors=self._errors
+            )
+        except OSError as e:
+            raise argparse.ArgumentTypeError("can't open '%s': %s" % (string, e))
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This library provides a shared loader for the input graph files of the case_utils command line tools.
+
+Parsing several large files one after another leaves all but one processor idle.  `parse_graphs` parses input files in worker processes, and merges their triples and prefix bindings into the target graph in argument order, giving the same graph as calling `rdflib.Graph.parse` on each file in turn.
+
+JSON-LD files are read one node object at a time where their layout allows (see case_utils.jsonld_streaming), rather than loaded whole before parsing.
+"""
+
+__version__ = "0.1.0"
+
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import rdflib
+from rdflib.plugins.stores.memory import Memory
+
+from case_utils.file_compression import guess_format, parse_file
+from case_utils.jsonld_streaming import parse_jsonld
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+# Starting worker processes takes longer than parsing small files, so
+# inputs smaller than this in total are parsed in this process.
+PARALLEL_MIN_BYTES = 1024 * 1024
+
+_Binding = Tuple[Optional[str], rdflib.URIRef, bool]
+_Triple = Tuple[Any, Any, Any]
+
+
+class _RecordingMemory(Memory):
+    """
+    This store records the triples added and namespaces bound by a parser, in call order.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.recorded_bindings: List[_Binding] = []
+        self.recorded_triples: List[_Triple] = []
+
+    def add(self, triple: _Triple, context: Any, quoted: bool = False) -> None:
+        self.recorded_triples.append(triple)
+        super().add(triple, context, quoted)
+
+    def bind(
+        self, prefix: str, namespace: rdflib.URIRef, override: bool = True
+    ) -> None:
+        self.recorded_bindings.append((prefix, namespace, override))
+        super().bind(prefix, namespace, override)
+
+
+def parse_graph(
+    graph: rdflib.Graph, filename: str, format: Optional[str] = None
+) -> rdflib.Graph:
+    """
+    Parse one input file into a graph, as `rdflib.Graph.parse` would, guessing the format from the file extension.  Compressed files are decompressed as they are read, and "-" reads standard input (see case_utils.file_compression).  JSON-LD files are read incrementally where possible.
+
+    :param format: The RDF format, overriding the format guessed from the file extension.
+    :return: The graph passed in, for convenience.
+    """
+    # Standard input cannot be re-read by rdflib if incremental reading
+    # fails partway.
+    if filename != "-" and (format or guess_format(filename)) == "json-ld":
+        return parse_jsonld(graph, filename)
+    return parse_file(graph, filename, format)
+
+
+def _parse_file(
+    filename: str, format: Optional[str]
+) -> Tuple[List[_Binding], List[_Triple]]:
+    """
+    This function runs in a worker process.
+
+    :return: The prefix bindings and triples of the file, in the order the parser produced them.
+    """
+    store = _RecordingMemory()
+    # No namespaces are bound in advance, so the recorded bindings are
+    # those the file declares.  The target graph resolves conflicts
+    # when they are replayed.
+    graph = rdflib.Graph(store=store, bind_namespaces="none")
+    parse_graph(graph, filename, format)
+    return store.recorded_bindings, store.recorded_triples
+
+
+def _merge(
+    graph: rdflib.Graph, bindings: Iterable[_Binding], triples: Iterable[_Triple]
+) -> None:
+    for prefix, namespace, override in bindings:
+        graph.bind(prefix, namespace, override=override)
+    graph.addN((s, p, o, graph) for (s, p, o) in triples)
+
+
+def parse_graphs(
+    graph: rdflib.Graph,
+    filenames: Sequence[str],
+    *,
+    format: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> rdflib.Graph:
+    """
+    Parse each input file into a graph.  If there are several files, and they are large enough in total for the startup cost to be worthwhile, they are parsed in parallel worker processes.
+
+    Prefix bindings are merged in the order of the files, so a prefix declared differently by two files is bound as it would be by parsing the files one after another.
+
+    :param graph: The graph to load.  It can be backed by any store.
+    :param filenames: Input graph files.  Formats are guessed from file extensions, as `rdflib.Graph.parse` does, after removing any compression extension.  "-" reads standard input, in this process, so it can be given at most once.
+    :param format: The RDF format of all input files, overriding the formats guessed from file extensions.
+    :param max_workers: The maximum number of worker processes.  Defaults to the number of processors.  Passing 1 parses all files in this process.
+    :return: The graph passed in, for convenience.
+    """
+    if list(filenames).count("-") > 1:
+        raise ValueError("Standard input can only be read once.")
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(filenames))
+    if "-" in filenames:
+        # Worker processes do not share this process's standard input.
+        max_workers = 1
+
+    total_bytes = 0
+    for filename in filenames:
+        try:
+            total_bytes += os.path.getsize(filename)
+        except OSError:
+            # Non-file sources are left for the parser to report on.
+            pass
+
+    if max_workers <= 1 or total_bytes < PARALLEL_MIN_BYTES:
+        for filename in filenames:
+            parse_graph(graph, filename, format)
+            _logger.debug("len(graph) = %d.", len(graph))
+        return graph
+
+    _logger.debug(
+        "Parsing %d files in %d worker processes.", len(filenames), max_workers
+    )
+    # Workers are spawned rather than forked, as the calling process
+    # could be running threads.
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(_parse_file, filename, format) for filename in filenames
+        ]
+        # Results are merged in argument order, though files can finish
+        # parsing in any order.
+        for future in futures:
+            bindings, triples = future.result()
+            _merge(graph, bindings, triples)
+            _logger.debug("len(graph) = %d.", len(graph))
+    return graph
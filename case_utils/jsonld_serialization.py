@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This library writes graphs as compacted JSON-LD, with a context of prefixes, as the case_utils command line tools do.
+
+rdflib's JSON-LD serializer builds the whole JSON document in memory, looking up context terms and list structures for each triple, before writing any of it.  `serialize_jsonld` instead writes one node object per subject, in subject order, as each is built.  The JSON-LD is the same as rdflib's for the same context, other than the order of the "@graph" array and of multiple values of a property, which this serializer sorts so output is repeatable.
+
+Graphs with RDF lists, which rdflib writes with "@list", are written by rdflib, as are graphs with named graphs.
+"""
+
+__version__ = "0.1.0"
+
+import json
+import logging
+import os
+from typing import IO, Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import rdflib
+from rdflib.plugins.shared.jsonld.context import Context
+
+from case_utils.file_compression import open_file
+
+NS_RDF = rdflib.RDF
+NS_XSD = rdflib.XSD
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+# rdflib writes literals of these datatypes as JSON values, without
+# their datatype.
+_NATIVE_DATATYPES = frozenset(
+    {NS_XSD.boolean, NS_XSD.double, NS_XSD.integer, NS_XSD.string}
+)
+
+# Set membership is tested by hash, without calling rdflib's term
+# comparison for each predicate.
+_TYPE_PREDICATES = frozenset({NS_RDF.type})
+
+# This matches rdflib's JSON-LD serializer output.
+_INDENT = 2
+
+
+_SubjectIndex = Mapping[
+    rdflib.term.Node, Mapping[rdflib.term.Node, Iterable[rdflib.term.Node]]
+]
+
+_encode_scalar = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _sort_key(node: rdflib.term.Node) -> Tuple[str, str]:
+    return (type(node).__name__, str(node))
+
+
+def _subject_index(graph: rdflib.Graph) -> _SubjectIndex:
+    """
+    :return: The objects of each predicate of each subject of the graph.  Blank nodes that are only objects are included with no predicates, as rdflib writes a node object for each of them.
+    """
+    index: Dict[
+        rdflib.term.Node, Dict[rdflib.term.Node, List[rdflib.term.Node]]
+    ] = dict()
+    bnode_objects: Set[rdflib.term.Node] = set()
+    for s, p, o in graph.triples((None, None, None)):
+        index.setdefault(s, dict()).setdefault(p, []).append(o)
+        if isinstance(o, rdflib.BNode):
+            bnode_objects.add(o)
+    for o in bnode_objects:
+        index.setdefault(o, dict())
+    return index
+
+
+def _format(value: Any, depth: int) -> str:
+    """
+    :return: The JSON text of the value, as json.dumps renders it with sorted keys and an indent of _INDENT, indented to sit at the given depth of an enclosing document.
+
+    >>> _format({"b": [1, {"c": "d"}], "a": []}, 0) == json.dumps({"b": [1, {"c": "d"}], "a": []}, indent=2, sort_keys=True)
+    True
+    """
+    if isinstance(value, dict):
+        if len(value) == 0:
+            return "{}"
+        inner = "\n" + " " * (_INDENT * (depth + 1))
+        return (
+            "{"
+            + ",".join(
+                inner + _encode_scalar(k) + ": " + _format(value[k], depth + 1)
+                for k in sorted(value)
+            )
+            + "\n"
+            + " " * (_INDENT * depth)
+            + "}"
+        )
+    if isinstance(value, list):
+        if len(value) == 0:
+            return "[]"
+        inner = "\n" + " " * (_INDENT * (depth + 1))
+        return (
+            "["
+            + ",".join(inner + _format(x, depth + 1) for x in value)
+            + "\n"
+            + " " * (_INDENT * depth)
+            + "]"
+        )
+    return _encode_scalar(value)
+
+
+class _NodeWriter:
+    """
+    This class builds the JSON-LD node object of each subject, as rdflib's JSON-LD serializer would with a context of prefixes.
+    """
+
+    def __init__(self, context: Context) -> None:
+        self._context = context
+        self._id_cache: Dict[rdflib.term.Node, str] = dict()
+        self._symbol_cache: Dict[rdflib.term.Node, Optional[str]] = dict()
+
+    def _id(self, node: rdflib.term.Node) -> str:
+        if node not in self._id_cache:
+            if isinstance(node, rdflib.BNode):
+                self._id_cache[node] = node.n3()
+            else:
+                self._id_cache[node] = self._context.shrink_iri(str(node))
+        return self._id_cache[node]
+
+    def _symbol(self, node: rdflib.term.Node) -> Optional[str]:
+        if node not in self._symbol_cache:
+            self._symbol_cache[node] = self._context.to_symbol(str(node))
+        return self._symbol_cache[node]
+
+    def _value(self, o: rdflib.term.Node) -> Any:
+        if isinstance(o, rdflib.Literal):
+            if o.datatype is None:
+                if o.language is not None:
+                    return {"@language": o.language, "@value": str(o)}
+                return str(o)
+            if o.datatype in _NATIVE_DATATYPES:
+                value = o.toPython()
+                # Ill-typed literals keep their lexical form.
+                if isinstance(value, (bool, int, float, str)):
+                    return value
+            return {"@type": self._symbol(o.datatype), "@value": str(o)}
+        return {"@id": self._id(o)}
+
+    def node_object(
+        self,
+        subject: rdflib.term.Node,
+        predicate_objects: Mapping[rdflib.term.Node, Iterable[rdflib.term.Node]],
+    ) -> Dict[str, Any]:
+        node: Dict[str, Any] = {"@id": self._id(subject)}
+        for p, objects in predicate_objects.items():
+            if p in _TYPE_PREDICATES:
+                key = "@type"
+                values = [
+                    self._symbol(o) if isinstance(o, rdflib.URIRef) else self._value(o)
+                    for o in objects
+                ]
+            else:
+                key = str(self._symbol(p))
+                values = [self._value(o) for o in objects]
+            if len(values) == 0:
+                continue
+            if len(values) == 1:
+                node[key] = values[0]
+            else:
+                # Values are sorted for repeatable output.
+                node[key] = sorted(values, key=_encode_scalar)
+        return node
+
+
+def _can_serialize(
+    graph: rdflib.Graph, subject_index: _SubjectIndex, context: Context
+) -> bool:
+    """
+    :return: True if the graph is written the same by this serializer as by rdflib's, with the context.
+    """
+    if graph.context_aware:
+        return False
+    if (None, NS_RDF.first, None) in graph or (None, None, NS_RDF.nil) in graph:
+        return False
+    term_iris = {term.id for term in context.terms.values()}
+    predicates: Set[rdflib.term.Node] = set()
+    for s, predicate_objects in subject_index.items():
+        if not isinstance(s, (rdflib.URIRef, rdflib.BNode)):
+            return False
+        predicates.update(predicate_objects)
+    for p in predicates:
+        # A predicate named by a term could be compacted with coercion.
+        if not isinstance(p, rdflib.URIRef) or str(p) in term_iris:
+            return False
+    return True
+
+
+def _write(
+    subject_index: _SubjectIndex,
+    context_data: Mapping[str, str],
+    context: Context,
+    out_fh: IO[str],
+) -> None:
+    subjects = sorted(subject_index, key=_sort_key)
+    node_writer = _NodeWriter(context)
+
+    if len(subjects) == 1:
+        # As with rdflib, a single node object is the document.
+        document = node_writer.node_object(subjects[0], subject_index[subjects[0]])
+        document["@context"] = dict(context_data)
+        out_fh.write(_format(document, 0))
+        return
+
+    indent = " " * _INDENT
+    out_fh.write("{\n")
+    out_fh.write(indent + '"@context": ' + _format(dict(context_data), 1) + ",\n")
+    if len(subjects) == 0:
+        out_fh.write(indent + '"@graph": []\n}')
+        return
+    out_fh.write(indent + '"@graph": [\n')
+    for subject_no, subject in enumerate(subjects):
+        if subject_no > 0:
+            out_fh.write(",\n")
+        node = node_writer.node_object(subject, subject_index[subject])
+        out_fh.write(indent * 2 + _format(node, 2))
+    out_fh.write("\n" + indent + "]\n}")
+
+
+def serialize_jsonld(
+    graph: rdflib.Graph, destination: str, context_data: Mapping[str, str]
+) -> None:
+    """
+    Write the graph as compacted JSON-LD.
+
+    :param graph: The graph to write.
+    :param destination: The output file path, which can have a compression extension (see case_utils.file_compression).
+    :param context_data: The JSON-LD context, mapping prefixes to namespace IRIs, as passed to rdflib's JSON-LD serializer.
+    """
+    context = Context(dict(context_data))
+    subject_index = _subject_index(graph)
+    if not _can_serialize(graph, subject_index, context):
+        _logger.debug("Serializing with rdflib.")
+        with open_file(destination, "wb") as out_fh:
+            graph.serialize(out_fh, format="json-ld", context=dict(context_data))
+        return
+
+    with open_file(destination, "w", encoding="utf-8") as out_fh:
+        _write(subject_index, context_data, context, out_fh)
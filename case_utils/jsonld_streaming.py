@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This library reads JSON-LD files into graphs without loading the whole JSON document into memory.
+
+rdflib's JSON-LD parser loads the whole document before producing any triples, which takes several times the size of the file in memory.  CASE data graphs are almost always a single JSON object with a "@context" followed by a "@graph" array of node objects, or a top-level array of node objects.  For these documents, `parse_jsonld` decodes a batch of node objects at a time, and adds their triples with rdflib's JSON-LD parser, so the resulting graph is the same as rdflib's, up to the labels of unlabeled blank nodes.  Other documents are parsed with rdflib.
+"""
+
+__version__ = "0.1.0"
+
+import json
+import logging
+import os
+from typing import IO, Any, Iterator, List, Optional, Tuple
+
+import rdflib
+from rdflib.parser import create_input_source
+from rdflib.plugins.parsers.jsonld import Parser
+from rdflib.plugins.shared.jsonld.context import Context
+
+from case_utils.file_compression import open_file, parse_file
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+# The number of characters read from the file at a time.  Larger node
+# objects are read in larger steps.
+CHUNK_SIZE = 1024 * 1024
+
+# The number of node objects passed to rdflib's JSON-LD parser at a time.
+# Each call binds the prefixes of the context again.
+NODES_PER_PARSE = 1000
+
+_Triple = Tuple[Any, Any, Any]
+
+_WHITESPACE = " \t\n\r"
+
+
+class _StreamingUnsupported(Exception):
+    """
+    The document does not have a layout that can be read incrementally.
+    """
+
+    pass
+
+
+class _JSONReader:
+    """
+    This class decodes a JSON document one value at a time, holding in memory only the text of the value being decoded.
+    """
+
+    def __init__(self, text_stream: IO[str]) -> None:
+        self._decoder = json.JSONDecoder()
+        self._text_stream = text_stream
+        self._buffer = ""
+        self._index = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """
+        Read more of the document into the buffer, dropping the text already decoded.
+
+        :return: False if the document was already fully read.
+        """
+        if self._eof:
+            return False
+        self._buffer = self._buffer[self._index :]
+        self._index = 0
+        chunk = self._text_stream.read(max(CHUNK_SIZE, len(self._buffer)))
+        if chunk == "":
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """
+        :return: The next character other than whitespace, or "" at the end of the document.
+        """
+        while True:
+            while (
+                self._index < len(self._buffer)
+                and self._buffer[self._index] in _WHITESPACE
+            ):
+                self._index += 1
+            if self._index < len(self._buffer):
+                return self._buffer[self._index]
+            if not self._fill():
+                return ""
+
+    def expect(self, character: str) -> None:
+        if self.peek() != character:
+            raise _StreamingUnsupported("Expected %r." % character)
+        self._index += 1
+
+    def value(self) -> Any:
+        """
+        :return: The next JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._index)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number could continue past the end of the buffer.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._index = end
+            return value
+
+    def items(self) -> Iterator[Any]:
+        """
+        Decode the next JSON array, yielding its members as they are decoded.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._index += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self._index += 1
+                continue
+            self.expect("]")
+            return
+
+
+class _RecordingGraph(rdflib.Graph):
+    """
+    This graph view records the triples it adds that were not already in the store, so they can be removed if the document must be parsed by rdflib after all.
+    """
+
+    def __init__(self, graph: rdflib.Graph) -> None:
+        super().__init__(
+            store=graph.store,
+            identifier=graph.identifier,
+            namespace_manager=graph.namespace_manager,
+        )
+        self.added_triples: List[_Triple] = []
+
+    def add(self, triple: _Triple) -> "_RecordingGraph":
+        if triple not in self:
+            super().add(triple)
+            self.added_triples.append(triple)
+        return self
+
+
+def _stream_nodes(
+    reader: _JSONReader,
+) -> Tuple[Optional[Any], Iterator[Any]]:
+    """
+    :return: The top-level context of the document, if any, and an iterator of the node objects of the document's default graph.  Once the iterator is exhausted, the rest of the document has been confirmed to add nothing else.
+    """
+    if reader.peek() == "[":
+
+        def _array_nodes() -> Iterator[Any]:
+            yield from reader.items()
+            if reader.peek() != "":
+                raise _StreamingUnsupported("Expected end of document.")
+
+        return None, _array_nodes()
+
+    reader.expect("{")
+    key = reader.value()
+    if key != "@context":
+        raise _StreamingUnsupported("Expected @context first.")
+    reader.expect(":")
+    context_data = reader.value()
+    reader.expect(",")
+    key = reader.value()
+    if key != "@graph":
+        raise _StreamingUnsupported("Expected @graph after @context.")
+    reader.expect(":")
+    if reader.peek() != "[":
+        raise _StreamingUnsupported("Expected @graph array.")
+
+    def _graph_nodes() -> Iterator[Any]:
+        yield from reader.items()
+        # Keys after @graph could, e.g., name the graph.
+        reader.expect("}")
+        if reader.peek() != "":
+            raise _StreamingUnsupported("Expected end of document.")
+
+    return context_data, _graph_nodes()
+
+
+def _parse_nodes(graph: rdflib.Graph, text_stream: IO[str], base: str) -> None:
+    """
+    :raises _StreamingUnsupported: If the document does not have a supported layout, or is not valid JSON, after removing any triples added.
+    """
+    # If the store starts empty, the triples added can be removed
+    # without recording them.
+    recording_graph: Optional[_RecordingGraph] = None
+    if len(graph.store) > 0:
+        recording_graph = _RecordingGraph(graph)
+    n_nodes = 0
+    try:
+        if not graph.store.graph_aware:
+            raise _StreamingUnsupported("Store is not graph-aware.")
+        # rdflib.Dataset's default graph became settable in rdflib 7.3.0.
+        if not isinstance(getattr(rdflib.Dataset, "default_graph", None), property):
+            raise _StreamingUnsupported("rdflib.Dataset default graph is not settable.")
+        context_data, nodes = _stream_nodes(_JSONReader(text_stream))
+
+        # This follows rdflib's JsonLDParser.parse, with the @graph array
+        # read in batches of node objects.  The document's default graph
+        # is the graph being loaded, and any named graphs are in its
+        # store, as with rdflib.
+        dataset = rdflib.Dataset(store=graph.store)
+        dataset.default_graph = graph if recording_graph is None else recording_graph
+        context = Context(base=base, version=1.1)
+        if context_data:
+            context.load(context_data, context.base)
+
+        parser = Parser()
+        node_batch: List[Any] = []
+        for node in nodes:
+            node_batch.append(node)
+            if len(node_batch) == NODES_PER_PARSE:
+                parser.parse(node_batch, context, dataset)
+                n_nodes += len(node_batch)
+                node_batch = []
+        if len(node_batch) > 0 or n_nodes == 0:
+            # An empty batch binds the context's prefixes, as rdflib
+            # does for a document without nodes.
+            parser.parse(node_batch, context, dataset)
+            n_nodes += len(node_batch)
+    except (_StreamingUnsupported, json.JSONDecodeError, UnicodeDecodeError) as e:
+        if recording_graph is None:
+            graph.store.remove((None, None, None), None)
+        else:
+            for triple in recording_graph.added_triples:
+                graph.remove(triple)
+        raise _StreamingUnsupported(str(e))
+    _logger.debug("Streamed %d node objects.", n_nodes)
+
+
+def parse_jsonld(graph: rdflib.Graph, filename: str) -> rdflib.Graph:
+    """
+    Parse a JSON-LD file into a graph, reading one node object at a time if the document's layout allows, and otherwise with rdflib.
+
+    :param graph: The graph to load.
+    :param filename: The JSON-LD file, which can be compressed (see case_utils.file_compression).
+    :return: The graph passed in, for convenience.
+    """
+    if not os.path.isfile(filename):
+        # E.g. URLs are left to rdflib.
+        graph.parse(filename, format="json-ld")
+        return graph
+
+    # The base IRI is determined as rdflib's JSON-LD parser does.
+    source = create_input_source(filename)
+    base = graph.absolutize(source.getPublicId() or source.getSystemId() or "")
+    source.close()
+
+    try:
+        with open_file(filename, "r", encoding="utf-8") as text_stream:
+            _parse_nodes(graph, text_stream, base)
+        return graph
+    except _StreamingUnsupported as e:
+        _logger.debug("Parsing %r with rdflib, due to: %s", filename, e)
+
+    return parse_file(graph, filename, format="json-ld")
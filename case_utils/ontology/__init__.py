@@ -14,13 +14,16 @@
 #
 # We would appreciate acknowledgement if the software is used.
 
-__version__ = "0.1.2"
+__version__ = "0.1.4"
 
+import functools
 import importlib.resources
 import logging
 import os
+from typing import Any, Dict, Iterator, List, Set, Tuple
 
 import rdflib
+from rdflib.paths import Path
 
 # Yes, this next import is self-referential (/circular).  But, it does work with importlib.
 import case_utils.ontology
@@ -42,3 +45,114 @@ def load_subclass_hierarchy(
         _logger.debug("ttl_filename = %r.", ttl_filename)
         ttl_data = importlib.resources.read_text(case_utils.ontology, ttl_filename)
         graph.parse(data=ttl_data)
+
+
+@functools.lru_cache(maxsize=None)
+def get_subclass_hierarchy_graph(built_version: str) -> rdflib.Graph:
+    """
+    Get the ontology rdfs:subClassOf statements of a CASE version shipped with this package.  The graph is parsed once per version per process, and shared by all callers, so it must not be modified.
+
+    :param built_version: A value from case_utils.ontology.version_info.built_version_choices_list.  "none" gets an empty graph.
+    """
+    graph = rdflib.Graph()
+    load_subclass_hierarchy(graph, built_version=built_version)
+    return graph
+
+
+@functools.lru_cache(maxsize=None)
+def get_subclass_closure_table(
+    built_version: str,
+) -> Dict[rdflib.term.Node, Tuple[rdflib.term.Node, ...]]:
+    """
+    Get a table mapping each class of a CASE version shipped with this package to itself and all of its subclasses, following the ontology rdfs:subClassOf statements.  The table is computed once per version per process.
+
+    :param built_version: A value from case_utils.ontology.version_info.built_version_choices_list.  "none" gets an empty table.
+    :return: A dictionary, keyed by each subject and object of an rdfs:subClassOf statement.  Each class's subclasses are in the order rdflib's evaluation of the property path rdfs:subClassOf* reaches them from the class, depth-first.  A class absent from the table has only itself as a subclass.
+
+    >>> from case_utils.namespace import NS_UCO_OBSERVABLE
+    >>> table = get_subclass_closure_table("case-" + CURRENT_CASE_VERSION)
+    >>> table[NS_UCO_OBSERVABLE.ObservableObject][0] == NS_UCO_OBSERVABLE.ObservableObject
+    True
+    >>> NS_UCO_OBSERVABLE.File in table[NS_UCO_OBSERVABLE.ObservableObject]
+    True
+    >>> NS_UCO_OBSERVABLE.ObservableObject in table[NS_UCO_OBSERVABLE.File]
+    False
+    """
+    graph = get_subclass_hierarchy_graph(built_version)
+    subclasses: Dict[rdflib.term.Node, List[rdflib.term.Node]] = dict()
+    for n_subclass, n_superclass in graph.subject_objects(rdflib.RDFS.subClassOf):
+        for n_class in [n_subclass, n_superclass]:
+            if n_class not in subclasses:
+                subclasses[n_class] = list(
+                    graph.subjects(rdflib.RDFS.subClassOf, n_class)
+                )
+
+    table: Dict[rdflib.term.Node, Tuple[rdflib.term.Node, ...]] = dict()
+    for n_superclass in subclasses:
+        closure: List[rdflib.term.Node] = [n_superclass]
+        visited: Set[rdflib.term.Node] = {n_superclass}
+        pending: List[Iterator[rdflib.term.Node]] = [iter(subclasses[n_superclass])]
+        while len(pending) > 0:
+            n_next = next(pending[-1], None)
+            if n_next is None:
+                pending.pop()
+                continue
+            if n_next in visited:
+                continue
+            visited.add(n_next)
+            closure.append(n_next)
+            pending.append(iter(subclasses[n_next]))
+        table[n_superclass] = tuple(closure)
+    return table
+
+
+class _UnionGraphView(rdflib.Graph):
+    """
+    This read-only graph presents the triples of a graph and of a supplemental graph, without copying either.  Triples in both graphs are presented once.
+    """
+
+    def __init__(self, graph: rdflib.Graph, supplemental_graph: rdflib.Graph) -> None:
+        # The view's own store stays empty.
+        super().__init__(namespace_manager=graph.namespace_manager)
+        self._graph = graph
+        self._supplemental_graph = supplemental_graph
+
+    def triples(  # type: ignore[override]
+        self, triple: Tuple[Any, Any, Any]
+    ) -> Iterator[Tuple[Any, Any, Any]]:
+        if isinstance(triple[1], Path):
+            # Graph.triples evaluates the path against this view, so
+            # the path can cross between the graphs.
+            yield from super().triples(triple)
+            return
+        yield from self._graph.triples(triple)
+        for supplemental_triple in self._supplemental_graph.triples(triple):
+            if supplemental_triple not in self._graph:
+                yield supplemental_triple
+
+    def __len__(self) -> int:
+        return len(self._graph) + sum(
+            1 for triple in self._supplemental_graph if triple not in self._graph
+        )
+
+    def add(self, triple: Any) -> "_UnionGraphView":
+        raise NotImplementedError("The graph view is read-only.")
+
+    def addN(self, quads: Any) -> "_UnionGraphView":
+        raise NotImplementedError("The graph view is read-only.")
+
+    def remove(self, triple: Any) -> "_UnionGraphView":
+        raise NotImplementedError("The graph view is read-only.")
+
+
+def subclass_hierarchy_view(
+    graph: rdflib.Graph, *, built_version: str = "case-" + CURRENT_CASE_VERSION
+) -> rdflib.Graph:
+    """
+    Get a read-only view of the graph with the ontology rdfs:subClassOf statements of the version referred to by built_version, e.g. for queries following the subclass hierarchy.  Unlike load_subclass_hierarchy, the graph is neither modified nor copied.
+
+    :return: The view, or the graph itself if built_version is "none".
+    """
+    if built_version == "none":
+        return graph
+    return _UnionGraphView(graph, get_subclass_hierarchy_graph(built_version))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This script creates a variant of an ontology graph for ABox-only validation, emptying the UCO shapes that review OWL and SHACL definitions (the TBox) of all but their typing and paths, and omitting the blank nodes that only those shapes use.
+"""
+
+__version__ = "0.1.0"
+
+import argparse
+from typing import Set
+
+import rdflib
+
+# This list must match the shapes deactivated by
+# case_utils.case_validate.validate_utils.disable_tbox_review.
+TBOX_REVIEW_SHAPE_BASENAMES = {
+    "DataOneOf-shape",
+    "DatatypeProperty-shacl-constraints-shape",
+    "Disjointedness-AP-DP-shape",
+    "Disjointedness-AP-OP-shape",
+    "Disjointedness-C-DT-shape",
+    "Disjointedness-DP-OP-shape",
+    "ObjectProperty-shacl-constraints-shape",
+    "Sequence-shape",
+    "disjointUnionOf-subjects-shape",
+    "hasKey-subjects-shape",
+    "intersectionOf-subjects-shape",
+    "onProperties-subjects-shape",
+    "oneOf-subjects-shape",
+    "ontologyIRI-versionIRI-prerequisite-shape",
+    "propertyChainAxiom-subjects-shape",
+    "unionOf-subjects-shape",
+    "versionIRI-nodeKind-shape",
+    "withRestrictions-subjects-shape",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("out_ttl")
+    parser.add_argument("in_ttl", nargs="+")
+    args = parser.parse_args()
+
+    graph = rdflib.Graph()
+
+    in_ttl: str
+    for in_ttl in args.in_ttl:
+        graph.parse(in_ttl)
+
+    ns_uco_owl = rdflib.Namespace("https://ontology.unifiedcyberontology.org/owl/")
+    n_tbox_shapes: Set[rdflib.term.Node] = {
+        ns_uco_owl[x] for x in TBOX_REVIEW_SHAPE_BASENAMES
+    }
+
+    # Each shape's typing is kept, so the shape remains a defined
+    # concept, as is any sh:path, which pySHACL requires of property
+    # shapes.  The shape is deactivated as disable_tbox_review would,
+    # so references to it (e.g. with sh:node) are evaluated as before.
+    # The shape's other statements are removed, then those of each blank
+    # node left unreferenced, e.g. the shape's SPARQL constraints and RDF
+    # lists.
+    nodes_to_remove: Set[rdflib.term.Node] = set()
+    for n_tbox_shape in n_tbox_shapes:
+        if (n_tbox_shape, None, None) not in graph:
+            continue
+        for triple in list(graph.triples((n_tbox_shape, None, None))):
+            if triple[1] in {rdflib.RDF.type, rdflib.SH.path}:
+                continue
+            graph.remove(triple)
+            if isinstance(triple[2], rdflib.BNode):
+                nodes_to_remove.add(triple[2])
+        graph.add((n_tbox_shape, rdflib.SH.deactivated, rdflib.Literal(True)))
+    while len(nodes_to_remove) > 0:
+        n_node = nodes_to_remove.pop()
+        if (None, None, n_node) in graph:
+            continue
+        for triple in list(graph.triples((n_node, None, None))):
+            graph.remove(triple)
+            if isinstance(triple[2], rdflib.BNode):
+                nodes_to_remove.add(triple[2])
+
+    graph.serialize(args.out_ttl)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+This library rewrites prepared SPARQL queries of the case_utils command line tools to follow the bundled CASE subclass hierarchy without property path traversal.
+
+A pattern such as `?x a/rdfs:subClassOf* uco-observable:ObservableObject` is evaluated by rdflib by walking the rdfs:subClassOf statements from each type of a node, or back from the class, every time the pattern is evaluated.  `rewrite_subclass_paths` replaces the pattern's property path with one backed by the class's precomputed subclass closure (see case_utils.ontology.get_subclass_closure_table).  Finding the nodes of the class is then a type lookup per member of the closure, and checking a node is a membership test of each of its types.  The rewritten query has the same results, including repeated rows for nodes with several matching types, as the original query has against the graph with the subclass hierarchy loaded.
+"""
+
+__version__ = "0.1.0"
+
+import logging
+import os
+from typing import Any, Iterator, Optional, Tuple
+
+import rdflib
+from rdflib.namespace import NamespaceManager
+from rdflib.paths import MulPath, Path, SequencePath, ZeroOrMore
+from rdflib.plugins.sparql.algebra import traverse
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.plugins.sparql.sparql import Query
+
+import case_utils.ontology
+from case_utils.namespace import NS_RDF, NS_RDFS
+from case_utils.ontology.version_info import CURRENT_CASE_VERSION
+
+_logger = logging.getLogger(os.path.basename(__file__))
+
+
+class _SubclassClosurePath(Path):
+    """
+    This property path stands in for rdf:type/rdfs:subClassOf* ending at a class, relating each node to the class once per type of the node in the class's subclass closure, as the original path does.
+    """
+
+    def __init__(
+        self,
+        path: SequencePath,
+        n_class: rdflib.term.Node,
+        n_classes: Tuple[rdflib.term.Node, ...],
+    ) -> None:
+        self._path = path
+        self._n_class = n_class
+        # The sequence gives results in the original path's order.
+        self._n_class_sequence = n_classes
+        self._n_class_set = frozenset(n_classes)
+
+    def eval(
+        self,
+        graph: rdflib.Graph,
+        subj: Optional[rdflib.term.Node] = None,
+        obj: Optional[rdflib.term.Node] = None,
+    ) -> Iterator[Tuple[rdflib.term.Node, rdflib.term.Node]]:
+        if obj is not None and obj != self._n_class:
+            return
+        if subj is None:
+            for n_type in self._n_class_sequence:
+                for n_subject in graph.subjects(NS_RDF.type, n_type):
+                    yield n_subject, self._n_class
+        else:
+            for n_type in graph.objects(subj, NS_RDF.type):
+                if n_type in self._n_class_set:
+                    yield subj, self._n_class
+
+    def __repr__(self) -> str:
+        return "_SubclassClosurePath(%r, %r)" % (self._path, self._n_class)
+
+    def n3(self, namespace_manager: Optional[NamespaceManager] = None) -> str:
+        return self._path.n3(namespace_manager)
+
+
+def _is_type_subclass_path(predicate: Any) -> bool:
+    """
+    :return: True if the predicate is the property path rdf:type/rdfs:subClassOf*.
+    """
+    if not isinstance(predicate, SequencePath) or len(predicate.args) != 2:
+        return False
+    if predicate.args[0] != NS_RDF.type:
+        return False
+    mul_path = predicate.args[1]
+    return (
+        isinstance(mul_path, MulPath)
+        and mul_path.path == NS_RDFS.subClassOf
+        and mul_path.mod == ZeroOrMore
+    )
+
+
+def rewrite_subclass_paths(
+    query: Query,
+    graph: rdflib.Graph,
+    *,
+    built_version: str = "case-" + CURRENT_CASE_VERSION,
+) -> int:
+    """
+    Rewrite each `?x rdf:type/rdfs:subClassOf* <C>` pattern of the query with an IRI object, to follow C's subclass closure in the version referred to by built_version instead of the rdfs:subClassOf statements.
+
+    The query is only rewritten if built_version is not "none", and the graph has no rdfs:subClassOf statements of its own, which the precomputed closure would not follow.  The rewritten query is to be run against the graph with the subclass hierarchy available (see case_utils.ontology.subclass_hierarchy_view), as other parts of the query may still use it.
+
+    :param query: A query prepared with rdflib.plugins.sparql.processor.prepareQuery.  It is modified in place.
+    :param graph: The graph the query will be run against, without the subclass hierarchy.
+    :return: The number of patterns rewritten.
+    """
+    if built_version == "none":
+        return 0
+    if (None, NS_RDFS.subClassOf, None) in graph:
+        _logger.debug("Not rewriting query, as graph has rdfs:subClassOf statements.")
+        return 0
+
+    closure_table = case_utils.ontology.get_subclass_closure_table(built_version)
+
+    n_rewritten = 0
+
+    def _rewrite_bgp(node: Any) -> None:
+        nonlocal n_rewritten
+        # Graph patterns of EXISTS expressions are left as parsed, in
+        # TriplesBlocks, until the query is evaluated.
+        if not isinstance(node, CompValue) or node.name not in {"BGP", "TriplesBlock"}:
+            return
+        for triple_no, triple in enumerate(node.triples):
+            (n_subject, n_predicate, n_object) = triple
+            if not isinstance(n_object, rdflib.URIRef):
+                continue
+            if not _is_type_subclass_path(n_predicate):
+                continue
+            n_classes = closure_table.get(n_object, (n_object,))
+            _logger.debug(
+                "Rewriting pattern with %d subclasses of %r.", len(n_classes), n_object
+            )
+            rewritten_triple = [
+                n_subject,
+                _SubclassClosurePath(n_predicate, n_object, n_classes),
+                n_object,
+            ]
+            node.triples[triple_no] = (
+                tuple(rewritten_triple)
+                if isinstance(triple, tuple)
+                else rewritten_triple
+            )
+            n_rewritten += 1
+
+    traverse(query.algebra, visitPost=_rewrite_bgp)
+    return n_rewritten
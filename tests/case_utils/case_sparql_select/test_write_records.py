@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+import json
+import pathlib
+
+import pytest
+import rdflib
+
+import case_utils.case_sparql_select
+
+SRCDIR = pathlib.Path(__file__).parent
+
+GRAPH = rdflib.Graph()
+GRAPH.parse(str(SRCDIR / "w3-input-2.ttl"))
+GRAPH.parse(str(SRCDIR / "w3-input-3.json"))
+assert len(GRAPH) > 0
+
+SELECT_QUERY_TEXT = (SRCDIR / "w3-input-1.sparql").read_text().strip()
+
+VARIABLES = case_utils.case_sparql_select.query_text_to_variables(SELECT_QUERY_TEXT)
+
+DATA_FRAME = case_utils.case_sparql_select.graph_and_query_to_data_frame(
+    GRAPH, SELECT_QUERY_TEXT
+)
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+@pytest.mark.parametrize("use_header", [False, True])
+@pytest.mark.parametrize("output_mode", ["csv", "tsv"])
+def test_write_records(
+    tmp_path: pathlib.Path, output_mode: str, use_header: bool, use_index: bool
+) -> None:
+    """
+    This test confirms streamed tables are the same as tables rendered from data frames.
+    """
+    expected = case_utils.case_sparql_select.data_frame_to_table_text(
+        DATA_FRAME,
+        json_orient="columns",
+        output_mode=output_mode,
+        use_header=use_header,
+        use_index=use_index,
+    )
+
+    out_path = tmp_path / ("table." + output_mode)
+    case_utils.case_sparql_select.write_records(
+        VARIABLES,
+        case_utils.case_sparql_select.graph_and_query_to_records(
+            GRAPH, SELECT_QUERY_TEXT
+        ),
+        str(out_path),
+        output_mode=output_mode,
+        use_header=use_header,
+        use_index=use_index,
+    )
+    assert out_path.read_text() == expected
+
+
+def test_write_records_jsonl(tmp_path: pathlib.Path) -> None:
+    out_path = tmp_path / "table.jsonl"
+    case_utils.case_sparql_select.write_records(
+        VARIABLES,
+        case_utils.case_sparql_select.graph_and_query_to_records(
+            GRAPH, SELECT_QUERY_TEXT
+        ),
+        str(out_path),
+        output_mode="jsonl",
+        use_header=True,
+        use_index=True,
+    )
+    with out_path.open() as in_fh:
+        computed = [json.loads(line) for line in in_fh]
+    assert computed == DATA_FRAME.to_dict(orient="records")
+
+
+def test_write_records_empty_results(tmp_path: pathlib.Path) -> None:
+    """
+    This test confirms a query disallowed from returning no results fails before the output file is written.
+    """
+    out_path = tmp_path / "table.csv"
+    with pytest.raises(ValueError):
+        case_utils.case_sparql_select.write_records(
+            VARIABLES,
+            case_utils.case_sparql_select.graph_and_query_to_records(
+                rdflib.Graph(), SELECT_QUERY_TEXT, disallow_empty_results=True
+            ),
+            str(out_path),
+            output_mode="csv",
+            use_header=True,
+            use_index=True,
+        )
+    assert not out_path.exists()
+
+
+def test_graph_and_query_to_records_stores() -> None:
+    """
+    This test confirms records are the same from graphs in rdflib's in-memory store, which are evaluated without retaining result rows, and from graphs in other stores.
+    """
+    other_graph = rdflib.Graph(store="SimpleMemory")
+    other_graph += GRAPH
+    expected = list(
+        case_utils.case_sparql_select.graph_and_query_to_records(
+            other_graph, SELECT_QUERY_TEXT
+        )
+    )
+    assert len(expected) > 0
+    computed = list(
+        case_utils.case_sparql_select.graph_and_query_to_records(
+            GRAPH, SELECT_QUERY_TEXT
+        )
+    )
+    assert expected == computed
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that validating against several CASE versions in one call gives the same results as validating against each version separately, and that the comparison finds the version-specific results.
+"""
+
+import pathlib
+
+import pytest
+import rdflib
+from rdflib.compare import isomorphic
+
+from case_utils.case_validate import validate, validate_versions
+from case_utils.case_validate.validate_comparison import VersionComparison
+
+srcdir = pathlib.Path(__file__).parent
+
+CASE_VERSIONS = ["case-0.5.0", "case-1.3.0"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_validate_versions(max_workers: int) -> None:
+    input_file = str(srcdir / "version_specific.ttl")
+
+    computed = validate_versions(
+        input_file, CASE_VERSIONS, allow_warnings=True, max_workers=max_workers
+    )
+    assert list(computed.keys()) == CASE_VERSIONS
+
+    for case_version in CASE_VERSIONS:
+        expected = validate(input_file, allow_warnings=True, case_version=case_version)
+        assert expected.conforms == computed[case_version].conforms
+        assert isinstance(expected.graph, rdflib.Graph)
+        computed_graph = computed[case_version].graph
+        assert isinstance(computed_graph, rdflib.Graph)
+        assert isomorphic(expected.graph, computed_graph)
+
+    comparison = VersionComparison(computed)
+    assert comparison.specific("case-0.5.0") == set()
+    # The earlier version has no shapes for the example's properties, so
+    # all of the later version's results are specific to it.
+    assert len(comparison.specific("case-1.3.0")) > 0
+    assert comparison.specific("case-1.3.0") == comparison.result_keys["case-1.3.0"]
+    assert "case-1.3.0: Conforms: False" in comparison.to_text()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that the term-level CDO concept review finds the concepts a review of each triple would.
+"""
+
+import typing
+
+import rdflib
+
+from case_utils.case_validate.validate_utils import (
+    concept_is_cdo_concept,
+    get_data_cdo_concepts,
+)
+from case_utils.namespace import NS_RDF, NS_UCO_CORE, NS_UCO_VOCABULARY
+
+NS_KB = rdflib.Namespace("http://example.org/kb/")
+
+
+def _expected_data_cdo_concepts(
+    data_graph: rdflib.Graph,
+) -> typing.Set[rdflib.URIRef]:
+    expected: typing.Set[rdflib.URIRef] = set()
+    for triple in data_graph.triples((None, None, None)):
+        for term in triple:
+            n_concept = term.datatype if isinstance(term, rdflib.Literal) else term
+            if isinstance(n_concept, rdflib.URIRef) and concept_is_cdo_concept(
+                n_concept
+            ):
+                expected.add(n_concept)
+    return expected
+
+
+def _data_graph() -> rdflib.Graph:
+    graph = rdflib.Graph()
+    for x in range(10):
+        graph.add((NS_KB["thing-%d" % x], NS_RDF.type, NS_UCO_CORE.UCOObject))
+        graph.add(
+            (
+                NS_KB["thing-%d" % x],
+                NS_UCO_CORE.name,
+                rdflib.Literal("thing-%d" % x, datatype=NS_UCO_VOCABULARY.NameVocab),
+            )
+        )
+    return graph
+
+
+def test_get_data_cdo_concepts_removed() -> None:
+    graph = _data_graph()
+    graph.add((NS_KB["thing-0"], NS_UCO_CORE.removed, NS_UCO_CORE.Removed))
+    graph.add(
+        (
+            NS_KB["thing-0"],
+            NS_UCO_CORE.description,
+            rdflib.Literal("x", datatype=NS_UCO_VOCABULARY.RemovedVocab),
+        )
+    )
+    graph.remove((NS_KB["thing-0"], NS_UCO_CORE.removed, None))
+    graph.remove((NS_KB["thing-0"], NS_UCO_CORE.description, None))
+
+    computed = get_data_cdo_concepts(graph)
+    assert computed == _expected_data_cdo_concepts(graph)
+    assert NS_UCO_CORE.Removed not in computed
+    assert NS_UCO_VOCABULARY.RemovedVocab not in computed
+
+
+def test_get_data_cdo_concepts_dataset_graph() -> None:
+    dataset = rdflib.Dataset()
+    graph = dataset.graph(NS_KB["graph-1"])
+    graph += _data_graph()
+    dataset.graph(NS_KB["graph-2"]).add(
+        (NS_KB["thing-0"], NS_UCO_CORE.other, NS_UCO_CORE.Other)
+    )
+
+    computed = get_data_cdo_concepts(graph)
+    assert computed == _expected_data_cdo_concepts(graph)
+    assert NS_UCO_CORE.Other not in computed
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that pre-checking simple constraints does not change validation results.
+"""
+
+import pathlib
+import typing
+import warnings
+
+import pyshacl
+import pytest
+import rdflib
+
+from case_utils.case_validate import Validator
+from case_utils.case_validate.validate_precheck import _datatype_conforms
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+INPUT_FILES = [
+    str(case_validate_srcdir / "built_versions" / "version_specific.ttl"),
+    str(case_validate_srcdir / "cli" / "errant_cdo_concept.ttl"),
+    str(case_validate_srcdir / "type_materialization" / "blank_node.ttl"),
+    str(case_validate_srcdir / "type_materialization" / "example.ttl"),
+]
+
+NS_EX = rdflib.Namespace("http://example.org/ontology/")
+NS_RDF = rdflib.RDF
+NS_SH = rdflib.SH
+NS_XSD = rdflib.XSD
+
+
+@pytest.mark.parametrize(
+    "value, datatype, expected",
+    [
+        (rdflib.Literal("a"), NS_XSD.string, True),
+        (rdflib.Literal("a", lang="en"), NS_RDF.langString, True),
+        (rdflib.Literal("a", lang="en"), NS_XSD.string, False),
+        (rdflib.Literal("a"), NS_RDF.langString, False),
+        (rdflib.Literal("1", datatype=NS_XSD.integer), NS_XSD.integer, True),
+        (rdflib.Literal("a", datatype=NS_XSD.integer), NS_XSD.integer, False),
+        (rdflib.Literal("1", datatype=NS_XSD.integer), NS_XSD.string, False),
+        (rdflib.Literal("1.5", datatype=NS_XSD.decimal), NS_XSD.decimal, True),
+        (rdflib.Literal("true", datatype=NS_XSD.boolean), NS_XSD.boolean, True),
+        (rdflib.Literal("2020-01-01", datatype=NS_XSD.date), NS_XSD.date, True),
+        (rdflib.Literal("2020-13-01", datatype=NS_XSD.date), NS_XSD.date, False),
+        (
+            rdflib.Literal("2020-01-01T00:00:00Z", datatype=NS_XSD.dateTime),
+            NS_XSD.dateTime,
+            True,
+        ),
+        (rdflib.Literal("a", datatype=NS_EX.Datatype), NS_EX.Datatype, True),
+        (NS_EX["thing-1"], NS_XSD.string, False),
+    ],
+)
+def test_datatype_conforms(
+    value: rdflib.term.Node, datatype: rdflib.URIRef, expected: bool
+) -> None:
+    """
+    This test confirms the datatype pre-check agrees with pySHACL's sh:datatype constraint.
+    """
+    assert _datatype_conforms(value, datatype) is expected
+
+    data_graph = rdflib.Graph()
+    data_graph.add((NS_EX["thing-1"], NS_EX.property, value))
+    shapes_graph = rdflib.Graph()
+    n_shape = rdflib.BNode()
+    n_property_shape = rdflib.BNode()
+    shapes_graph.add((n_shape, NS_RDF.type, NS_SH.NodeShape))
+    shapes_graph.add((n_shape, NS_SH.targetNode, NS_EX["thing-1"]))
+    shapes_graph.add((n_shape, NS_SH.property, n_property_shape))
+    shapes_graph.add((n_property_shape, NS_SH.path, NS_EX.property))
+    shapes_graph.add((n_property_shape, NS_SH.datatype, datatype))
+    conforms, _, _ = pyshacl.validate(data_graph, shacl_graph=shapes_graph)
+    assert conforms is expected
+
+
+@pytest.mark.parametrize(
+    "validator_kwargs",
+    [
+        {"allow_infos": True},
+        {"materialize_types": True},
+        {"allow_warnings": True, "prune_shapes": True},
+    ],
+)
+def test_constraint_precheck(validator_kwargs: typing.Dict[str, typing.Any]) -> None:
+    expected_validator = Validator(**validator_kwargs)
+    computed_validator = Validator(precheck_constraints=True, **validator_kwargs)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for input_file in INPUT_FILES:
+            expected = expected_validator.validate(input_file)
+            computed = computed_validator.validate(input_file)
+            assert expected.conforms == computed.conforms
+            assert expected.text == computed.text
+
+            expected = expected_validator.validate(input_file, max_results=2)
+            computed = computed_validator.validate(input_file, max_results=2)
+            assert expected.text == computed.text
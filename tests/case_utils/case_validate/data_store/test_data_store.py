@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that validating with a disk-backed data graph store gives the same results as validating in memory, and that the store round-trips graphs.
+"""
+
+import pathlib
+import warnings
+
+import pytest
+import rdflib
+from rdflib.compare import isomorphic
+
+from case_utils.case_validate import validate
+from case_utils.case_validate.validate_store import disk_backed_graph
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+INPUT_FILES = [
+    str(case_validate_srcdir / "cli" / "errant_cdo_concept.ttl"),
+    str(case_validate_srcdir / "cli" / "split_data_graph_1.json"),
+    str(case_validate_srcdir / "type_materialization" / "example.ttl"),
+]
+
+
+@pytest.mark.parametrize("input_file", INPUT_FILES)
+@pytest.mark.parametrize("materialize_types", [False, True])
+def test_data_store_validate(
+    tmp_path: pathlib.Path, input_file: str, materialize_types: bool
+) -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = validate(
+            input_file, allow_infos=True, materialize_types=materialize_types
+        )
+        computed = validate(
+            input_file,
+            allow_infos=True,
+            data_store_dir=str(tmp_path),
+            materialize_types=materialize_types,
+        )
+    assert expected.conforms == computed.conforms
+    assert isinstance(expected.graph, rdflib.Graph)
+    assert isinstance(computed.graph, rdflib.Graph)
+    assert isomorphic(expected.graph, computed.graph)
+    assert expected.undefined_concepts == computed.undefined_concepts
+    # The scratch database is removed after validation.
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_data_store_round_trip(tmp_path: pathlib.Path) -> None:
+    expected = rdflib.Graph()
+    expected.parse(INPUT_FILES[2])
+
+    with disk_backed_graph(str(tmp_path), cache_size=8) as computed:
+        computed.parse(INPUT_FILES[2])
+        assert len(expected) == len(computed)
+        assert isomorphic(expected, computed)
+
+        subject = next(iter(expected.subjects(unique=True)))
+        expected.remove((subject, None, None))
+        computed.remove((subject, None, None))
+        assert len(expected) == len(computed)
+        assert isomorphic(expected, computed)
+    assert list(tmp_path.iterdir()) == []
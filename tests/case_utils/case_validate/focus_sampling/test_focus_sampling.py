@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that sampling focus nodes is repeatable, and that a sample of every focus node gives the same validation results as an unsampled run.
+"""
+
+import typing
+
+import pytest
+import rdflib
+
+from case_utils.case_validate import Validator
+from case_utils.case_validate.validate_sampling import confidence_interval
+from case_utils.case_validate.validate_types import ValidationResult
+from case_utils.namespace import NS_RDF, NS_UCO_CORE, NS_UCO_OBSERVABLE
+
+NS_SH = rdflib.SH
+
+N_FILES = 40
+
+
+def _data_graph() -> rdflib.Graph:
+    """
+    :return: A graph of files, every fourth of which has a name of the wrong datatype.
+    """
+    graph = rdflib.Graph()
+    for x in range(N_FILES):
+        n_file = rdflib.URIRef("http://example.org/kb/file-%d" % x)
+        graph.add((n_file, NS_RDF.type, NS_UCO_OBSERVABLE.File))
+        if x % 4 == 0:
+            graph.add((n_file, NS_UCO_CORE.name, rdflib.Literal(x)))
+    return graph
+
+
+def _result_focus_nodes(validation_result: ValidationResult) -> typing.Set[str]:
+    assert isinstance(validation_result.graph, rdflib.Graph)
+    return {
+        str(n_focus_node)
+        for n_focus_node in validation_result.graph.objects(None, NS_SH.focusNode)
+    }
+
+
+@pytest.fixture(scope="module")
+def validator() -> Validator:
+    return Validator()
+
+
+def test_focus_sampling_exhaustive(validator: Validator) -> None:
+    data_graph = _data_graph()
+    expected = validator.validate(data_graph)
+    computed = validator.validate(data_graph, sample_size=N_FILES)
+
+    assert expected.shape_samples is None
+    assert computed.shape_samples is not None
+    assert expected.conforms == computed.conforms
+    assert _result_focus_nodes(expected) == _result_focus_nodes(computed)
+
+    for shape_sample in computed.shape_samples:
+        assert shape_sample.n_sampled == shape_sample.n_focus_nodes
+        low, high = confidence_interval(
+            shape_sample.n_focus_nodes_with_results,
+            shape_sample.n_sampled,
+            shape_sample.n_focus_nodes,
+        )
+        assert low == high == shape_sample.rate
+        if shape_sample.shape == NS_UCO_CORE.UcoObject:
+            # The shape of uco-core:name.
+            assert shape_sample.n_focus_nodes_with_results == N_FILES // 4
+
+
+@pytest.mark.parametrize(
+    "sampling, n_expected_sampled",
+    [
+        (dict(sample_size=8), 8),
+        (dict(sample_fraction=0.1), 4),
+    ],
+)
+def test_focus_sampling_repeatable(
+    validator: Validator,
+    sampling: typing.Dict[str, typing.Any],
+    n_expected_sampled: int,
+) -> None:
+    data_graph = _data_graph()
+    expected = validator.validate(data_graph, sample_seed=1, **sampling)
+    computed = validator.validate(data_graph, sample_seed=1, **sampling)
+
+    assert expected.shape_samples is not None
+    assert computed.shape_samples is not None
+    assert expected.text == computed.text
+    assert _result_focus_nodes(computed) <= _result_focus_nodes(
+        validator.validate(data_graph)
+    )
+    for expected_sample, computed_sample in zip(
+        expected.shape_samples, computed.shape_samples
+    ):
+        assert expected_sample.shape == computed_sample.shape
+        assert (
+            expected_sample.n_focus_nodes_with_results
+            == computed_sample.n_focus_nodes_with_results
+        )
+
+    file_samples = [x for x in computed.shape_samples if x.n_focus_nodes == N_FILES]
+    assert len(file_samples) > 0
+    for shape_sample in file_samples:
+        assert shape_sample.n_sampled == n_expected_sampled
+        low, high = confidence_interval(
+            shape_sample.n_focus_nodes_with_results,
+            shape_sample.n_sampled,
+            shape_sample.n_focus_nodes,
+        )
+        assert 0 <= low <= shape_sample.rate <= high <= 1
+        assert low < high
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(sample_size=0),
+        dict(sample_fraction=1.5),
+        dict(sample_size=1, sample_fraction=0.5),
+        dict(sample_size=1, max_results=1),
+    ],
+)
+def test_focus_sampling_invalid(
+    validator: Validator, kwargs: typing.Dict[str, typing.Any]
+) -> None:
+    with pytest.raises(ValueError):
+        validator.validate(_data_graph(), **kwargs)
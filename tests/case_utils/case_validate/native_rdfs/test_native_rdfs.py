@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that native RDFS inference entails the same triples as pySHACL's RDFS inference, and does not change validation results.
+"""
+
+import pathlib
+import warnings
+
+import owlrl
+import rdflib
+from pyshacl.inference import CustomRDFSSemantics
+from rdflib.compare import isomorphic
+
+from case_utils.case_validate import Validator
+from case_utils.case_validate.validate_rdfs import RDFSClosure
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+INPUT_FILES = [
+    str(case_validate_srcdir / "cli" / "errant_cdo_concept.ttl"),
+    str(case_validate_srcdir / "type_materialization" / "blank_node.ttl"),
+    str(srcdir / "schema_extension.ttl"),
+]
+
+ONTOLOGY_TTL = """\
+@prefix ex: <http://example.org/kb/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix uco-core: <https://ontology.unifiedcyberontology.org/uco/core/> .
+
+ex:ExtensionDomain rdfs:subClassOf uco-core:UcoObject .
+uco-core:UcoObject rdfs:subClassOf uco-core:UcoThing .
+uco-core:description rdfs:domain uco-core:UcoThing .
+[] rdfs:subClassOf ex:ExtensionClass .
+"""
+
+
+def test_rdfs_closure() -> None:
+    ontology_graph = rdflib.Graph()
+    ontology_graph.parse(data=ONTOLOGY_TTL, format="turtle")
+    data_graph = rdflib.Graph()
+    data_graph.parse(str(srcdir / "schema_extension.ttl"))
+
+    expected = rdflib.Graph()
+    for triple in data_graph:
+        expected.add(triple)
+    for triple in ontology_graph:
+        expected.add(triple)
+    owlrl.DeductiveClosure(CustomRDFSSemantics).expand(expected)
+
+    computed = rdflib.Graph()
+    for triple in data_graph:
+        computed.add(triple)
+    RDFSClosure(ontology_graph).expand(computed)
+
+    assert isomorphic(expected, computed)
+
+
+def test_native_rdfs() -> None:
+    expected_validator = Validator(inference="rdfs")
+    computed_validator = Validator(inference="rdfs", native_rdfs=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for input_file in INPUT_FILES:
+            expected = expected_validator.validate(input_file)
+            computed = computed_validator.validate(input_file)
+            assert expected.conforms == computed.conforms
+            assert expected.text == computed.text
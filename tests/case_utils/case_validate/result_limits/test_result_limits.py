@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that capping validation results does not change conformance, and only reports results an uncapped run would report.
+"""
+
+import pathlib
+import typing
+
+import pytest
+import rdflib
+
+from case_utils.case_validate import validate
+from case_utils.case_validate.validate_types import ValidationResult
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+NS_SH = rdflib.SH
+
+input_file = str(case_validate_srcdir / "type_materialization" / "example.ttl")
+
+
+def _result_messages(validation_result: ValidationResult) -> typing.List[str]:
+    assert isinstance(validation_result.graph, rdflib.Graph)
+    return sorted(
+        str(n_message)
+        for n_message in validation_result.graph.objects(None, NS_SH.resultMessage)
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(),
+        dict(allow_infos=True),
+    ],
+)
+@pytest.mark.parametrize(
+    "limits, n_expected_results",
+    [
+        (dict(max_results=1), 1),
+        (dict(max_results=2), 2),
+        (dict(max_results_per_shape=1), 2),
+        (dict(max_results=1, max_results_per_shape=1), 1),
+    ],
+)
+def test_result_limits(
+    kwargs: typing.Dict[str, typing.Any],
+    limits: typing.Dict[str, typing.Any],
+    n_expected_results: int,
+) -> None:
+    expected = validate(input_file, **kwargs)
+    computed = validate(input_file, **kwargs, **limits)
+
+    assert expected.conforms == computed.conforms
+    assert not expected.results_capped
+    assert computed.results_capped
+
+    expected_messages = _result_messages(expected)
+    computed_messages = _result_messages(computed)
+    assert len(computed_messages) == n_expected_results
+    assert set(computed_messages) <= set(expected_messages)
+
+
+def test_result_limits_not_reached() -> None:
+    expected = validate(input_file)
+    computed = validate(input_file, max_results=10, max_results_per_shape=10)
+    assert not computed.results_capped
+    assert expected.text == computed.text
+
+
+def test_result_limits_invalid() -> None:
+    with pytest.raises(ValueError):
+        validate(input_file, max_results=0)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that streamed and summarized validation results match the report pySHACL builds in memory.
+"""
+
+import io
+import json
+import pathlib
+import re
+from typing import List
+
+import pytest
+import rdflib
+import rdflib.compare
+
+import case_utils.case_validate.validate_hooks
+from case_utils.case_validate import validate
+from case_utils.case_validate.validate_reporting import (
+    JSONLinesResultWriter,
+    NTriplesResultWriter,
+    ResultSummarizer,
+)
+from case_utils.case_validate.validate_types import UnsupportedPySHACLWarning
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+NS_RDF = rdflib.RDF
+NS_SH = rdflib.SH
+
+input_file = str(case_validate_srcdir / "type_materialization" / "example.ttl")
+
+
+def test_result_streaming() -> None:
+    expected = validate(input_file, allow_infos=True)
+    assert isinstance(expected.graph, rdflib.Graph)
+    n_expected_results = len(
+        list(expected.graph.subjects(NS_RDF.type, NS_SH.ValidationResult))
+    )
+    assert n_expected_results > 1
+
+    nt_fh = io.StringIO()
+    jsonl_fh = io.StringIO()
+    result_summarizer = ResultSummarizer()
+    computed = validate(
+        input_file,
+        allow_infos=True,
+        result_writers=[
+            NTriplesResultWriter(nt_fh),
+            JSONLinesResultWriter(jsonl_fh),
+            result_summarizer,
+        ],
+    )
+    assert expected.conforms == computed.conforms
+
+    # pySHACL only retains one result while results are streamed.
+    assert isinstance(computed.graph, rdflib.Graph)
+    assert len(list(computed.graph.subjects(NS_RDF.type, NS_SH.ValidationResult))) == 1
+
+    nt_graph = rdflib.Graph()
+    nt_graph.parse(data=nt_fh.getvalue(), format="nt")
+    assert rdflib.compare.isomorphic(expected.graph, nt_graph)
+
+    records = [json.loads(line) for line in jsonl_fh.getvalue().splitlines()]
+    assert len(records) == n_expected_results
+    for record in records:
+        assert "focusNode" in record
+        assert "sourceShape" in record
+        assert len(record["resultMessage"]) > 0
+
+    assert result_summarizer.n_results == n_expected_results
+    assert result_summarizer.conforms == computed.conforms
+    assert n_expected_results == sum(
+        result_group.count for result_group in result_summarizer.groups
+    )
+    assert result_summarizer.to_text().startswith(
+        "Validation Report Summary\nConforms: False\n"
+    )
+
+
+def test_result_streaming_with_limits() -> None:
+    jsonl_fh = io.StringIO()
+    computed = validate(
+        input_file,
+        allow_infos=True,
+        max_results=1,
+        result_writers=[JSONLinesResultWriter(jsonl_fh)],
+    )
+    assert not computed.conforms
+    assert computed.results_capped
+    assert len(jsonl_fh.getvalue().splitlines()) == 1
+
+
+def test_result_streaming_unsupported_pyshacl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    This test confirms that if the installed pySHACL does not support shape validation hooks, writers are passed the results of pySHACL's report after validation, as they would have been streamed.
+    """
+    expected = validate(input_file, allow_infos=True)
+    assert isinstance(expected.graph, rdflib.Graph)
+    expected_jsonl_fh = io.StringIO()
+    validate(
+        input_file,
+        allow_infos=True,
+        result_writers=[JSONLinesResultWriter(expected_jsonl_fh)],
+    )
+
+    monkeypatch.setattr(
+        case_utils.case_validate.validate_hooks,
+        "_SHAPE_METHOD_PARAMETERS",
+        {"validate": ("self", "target_graph")},
+    )
+    nt_fh = io.StringIO()
+    jsonl_fh = io.StringIO()
+    with pytest.warns(UnsupportedPySHACLWarning):
+        computed = validate(
+            input_file,
+            allow_infos=True,
+            profile_shapes=True,
+            result_writers=[
+                NTriplesResultWriter(nt_fh),
+                JSONLinesResultWriter(jsonl_fh),
+            ],
+        )
+    assert expected.conforms == computed.conforms
+    assert isinstance(computed.graph, rdflib.Graph)
+    assert rdflib.compare.isomorphic(expected.graph, computed.graph)
+    # Shapes are not profiled without hooks.
+    assert computed.shape_profiles == []
+
+    nt_graph = rdflib.Graph()
+    nt_graph.parse(data=nt_fh.getvalue(), format="nt")
+    assert rdflib.compare.isomorphic(expected.graph, nt_graph)
+
+    # Blank node labels differ between validation runs.
+    def _records(fh: io.StringIO) -> List[str]:
+        return sorted(
+            re.sub('"_:[^"]*"', '"_:"', line) for line in fh.getvalue().splitlines()
+        )
+
+    assert _records(expected_jsonl_fh) == _records(jsonl_fh)
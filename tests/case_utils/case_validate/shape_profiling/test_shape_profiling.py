@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that per-shape profiling accounts for the validation results, and does not change them.
+"""
+
+import csv
+import json
+import pathlib
+
+import pyshacl.shape
+import rdflib
+
+from case_utils.case_validate import validate
+from case_utils.case_validate.validate_profiling import write_shape_profiles
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+NS_SH = rdflib.SH
+
+
+def test_shape_profiling() -> None:
+    original_validate = pyshacl.shape.Shape.validate
+
+    input_file = str(case_validate_srcdir / "type_materialization" / "example.ttl")
+    expected = validate(input_file, allow_infos=True)
+    computed = validate(input_file, allow_infos=True, profile_shapes=True)
+
+    assert pyshacl.shape.Shape.validate is original_validate
+
+    assert expected.shape_profiles is None
+    assert computed.shape_profiles is not None
+    assert expected.conforms == computed.conforms
+    assert expected.text == computed.text
+
+    assert isinstance(computed.graph, rdflib.Graph)
+    n_results = len(list(computed.graph.subjects(NS_SH.sourceShape, None)))
+    assert n_results > 0
+    assert n_results == sum(
+        shape_profile.results for shape_profile in computed.shape_profiles
+    )
+
+    self_seconds = [
+        shape_profile.self_seconds for shape_profile in computed.shape_profiles
+    ]
+    assert self_seconds == sorted(self_seconds, reverse=True)
+    for shape_profile in computed.shape_profiles:
+        assert shape_profile.invocations > 0
+        assert shape_profile.self_seconds <= shape_profile.total_seconds
+        assert shape_profile.is_property_shape == (shape_profile.path is not None)
+
+
+def test_write_shape_profiles(tmp_path: pathlib.Path) -> None:
+    input_file = str(case_validate_srcdir / "cli" / "thing.ttl")
+    validation_result = validate(input_file, profile_shapes=True)
+    assert validation_result.shape_profiles is not None
+
+    csv_path = tmp_path / "profile.csv"
+    json_path = tmp_path / "profile.json"
+    write_shape_profiles(validation_result.shape_profiles, str(csv_path))
+    write_shape_profiles(validation_result.shape_profiles, str(json_path))
+
+    with csv_path.open(newline="") as csv_fh:
+        csv_records = list(csv.DictReader(csv_fh))
+    with json_path.open() as json_fh:
+        json_records = json.load(json_fh)
+
+    assert len(csv_records) == len(validation_result.shape_profiles)
+    assert [record["shape"] for record in csv_records] == [
+        record["shape"] for record in json_records
+    ]
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that pruning the shapes graph to shapes that can have focus nodes does not change validation results.
+"""
+
+import pathlib
+import typing
+
+import pytest
+
+from case_utils.case_validate import validate
+from case_utils.case_validate.validate_types import ValidationResult
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+
+def _validate(input_files: typing.List[str], **kwargs: typing.Any) -> ValidationResult:
+    return validate(
+        [str(case_validate_srcdir / input_file) for input_file in input_files],
+        allow_warnings=True,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "input_files",
+    [
+        ["cli/errant_cdo_concept.ttl"],
+        ["cli/past_version_reference_XFAIL.ttl"],
+        ["cli/split_data_graph_1.json"],
+        ["cli/split_data_graph_1.json", "cli/split_data_graph_2.json"],
+        ["cli/thing.ttl"],
+        ["shape_disabling/example.ttl"],
+    ],
+)
+def test_prune_shapes_equivalence(input_files: typing.List[str]) -> None:
+    expected = _validate(input_files, allow_infos=True)
+    computed = _validate(input_files, allow_infos=True, prune_shapes=True)
+    assert expected.conforms == computed.conforms
+    assert expected.text == computed.text
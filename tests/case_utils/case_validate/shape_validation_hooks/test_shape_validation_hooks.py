@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm the shape validation hooks support the installed pySHACL, and are turned off, with a warning, rather than wrapping pySHACL methods whose parameters have changed.
+"""
+
+import inspect
+from typing import Any
+
+import pyshacl
+import pytest
+
+from case_utils.case_validate.validate_hooks import (
+    ShapeValidationHook,
+    check_shape_api,
+    shape_validation_hook,
+)
+from case_utils.case_validate.validate_types import UnsupportedPySHACLWarning
+
+
+def test_shape_api_parameters() -> None:
+    # These lists are written out, rather than taken from the module
+    # under test, so a pySHACL update is noticed here first.
+    assert list(inspect.signature(pyshacl.shape.Shape.validate).parameters) == [
+        "self",
+        "executor",
+        "target_graph",
+        "focus",
+        "_evaluation_path",
+    ]
+    assert list(inspect.signature(pyshacl.shape.Shape.focus_nodes).parameters) == [
+        "self",
+        "data_graph",
+        "debug",
+    ]
+    assert check_shape_api()
+    with shape_validation_hook(ShapeValidationHook()) as active:
+        assert active
+        assert check_shape_api()
+
+
+def test_shape_api_mismatch(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _validate(self: pyshacl.shape.Shape, target_graph: Any, focus: Any) -> Any:
+        raise NotImplementedError
+
+    monkeypatch.setattr(pyshacl.shape.Shape, "validate", _validate)
+    with pytest.warns(UnsupportedPySHACLWarning, match="Shape.validate"):
+        assert not check_shape_api()
+    with pytest.warns(UnsupportedPySHACLWarning):
+        with shape_validation_hook(ShapeValidationHook()) as active:
+            assert not active
+    assert getattr(pyshacl.shape.Shape, "validate") is _validate
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that materializing the rdf:type closure of the data graph does not change validation results.
+"""
+
+import pathlib
+import typing
+
+import pytest
+
+from case_utils.case_validate import validate
+from case_utils.case_validate.validate_types import ValidationResult
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+top_srcdir = srcdir / ".." / ".." / ".." / ".."
+
+examples_srcdir = top_srcdir / "dependencies" / "CASE" / "tests" / "examples"
+
+
+def _validate(
+    input_files: typing.List[pathlib.Path], **kwargs: typing.Any
+) -> ValidationResult:
+    return validate(
+        [str(input_file) for input_file in input_files],
+        allow_infos=True,
+        allow_warnings=True,
+        **kwargs,
+    )
+
+
+def _check_equivalence(
+    input_files: typing.List[pathlib.Path], **kwargs: typing.Any
+) -> None:
+    expected = _validate(input_files, **kwargs)
+    computed = _validate(input_files, materialize_types=True, **kwargs)
+    assert expected.conforms == computed.conforms
+    assert expected.text == computed.text
+
+
+@pytest.mark.parametrize(
+    "input_files",
+    [
+        ["cli/errant_cdo_concept.ttl"],
+        ["cli/past_version_reference_XFAIL.ttl"],
+        ["cli/split_data_graph_1.json"],
+        ["cli/split_data_graph_1.json", "cli/split_data_graph_2.json"],
+        ["cli/thing.ttl"],
+        ["shape_disabling/example.ttl"],
+        ["type_materialization/blank_node.ttl"],
+        ["type_materialization/example.ttl"],
+    ],
+)
+def test_materialize_types_equivalence(input_files: typing.List[str]) -> None:
+    _check_equivalence(
+        [case_validate_srcdir / input_file for input_file in input_files]
+    )
+
+
+def test_materialize_types_with_pruning_equivalence() -> None:
+    _check_equivalence(
+        [srcdir / "example.ttl"],
+        prune_shapes=True,
+    )
+
+
+@pytest.mark.parametrize(
+    "example_basename",
+    [
+        "investigative_action_PASS.json",
+        "investigative_action_XFAIL.json",
+    ],
+)
+def test_materialize_types_case_examples_equivalence(example_basename: str) -> None:
+    example_path = examples_srcdir / example_basename
+    if not example_path.exists():
+        pytest.skip("CASE submodule not checked out.")
+    _check_equivalence([example_path])
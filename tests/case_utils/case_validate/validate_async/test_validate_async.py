@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that the asyncio interface to case_validate gives the same results as the validate function, and recovers from timeouts and cancellation.
+"""
+
+import asyncio
+import pathlib
+import time
+import typing
+
+import pytest
+
+from case_utils.case_validate import validate
+from case_utils.case_validate.validate_async import (
+    AsyncValidator,
+    _Worker,
+    validate_async,
+    validate_batch_async,
+)
+from case_utils.case_validate.validate_types import (
+    NonExistentCDOConceptWarning,
+    ValidationResult,
+)
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+INPUT_FILES = [
+    str(case_validate_srcdir / "cli" / "errant_cdo_concept.ttl"),
+    str(case_validate_srcdir / "cli" / "thing.ttl"),
+    str(case_validate_srcdir / "type_materialization" / "example.ttl"),
+]
+
+
+def test_validate_batch_async() -> None:
+    async def _run() -> typing.Dict[int, typing.Any]:
+        computed: typing.Dict[int, typing.Any] = dict()
+        async for index, result in validate_batch_async(
+            INPUT_FILES, max_workers=2, allow_infos=True
+        ):
+            computed[index] = result
+        return computed
+
+    with pytest.warns(NonExistentCDOConceptWarning):
+        computed = asyncio.run(_run())
+    with pytest.warns(NonExistentCDOConceptWarning):
+        expected = [validate(x, allow_infos=True) for x in INPUT_FILES]
+
+    assert sorted(computed.keys()) == list(range(len(INPUT_FILES)))
+    for index, expected_result in enumerate(expected):
+        computed_result = computed[index]
+        assert isinstance(computed_result, ValidationResult)
+        assert expected_result.conforms == computed_result.conforms
+        assert expected_result.text == computed_result.text
+
+
+def test_validate_async_timeout() -> None:
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(validate_async(INPUT_FILES[1], timeout=0.01))
+
+
+def test_async_validator_cold_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    This test confirms the timeout of a validation on a new worker does not count the time the worker takes to build its Validator.
+    """
+    original_wait_ready = _Worker.wait_ready
+
+    def _wait_ready(self: _Worker) -> None:
+        time.sleep(2)
+        original_wait_ready(self)
+
+    monkeypatch.setattr(_Worker, "wait_ready", _wait_ready)
+
+    computed = asyncio.run(validate_async(INPUT_FILES[1], timeout=1))
+    assert computed.conforms
+
+
+def test_async_validator_recovery() -> None:
+    async def _run() -> ValidationResult:
+        async with AsyncValidator(max_workers=1) as validator:
+            # A timed-out validation terminates the only worker.
+            with pytest.raises(asyncio.TimeoutError):
+                await validator.validate(INPUT_FILES[1], timeout=0.01)
+
+            # So does a cancelled validation.
+            task = asyncio.ensure_future(validator.validate(INPUT_FILES[1]))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            # The pool starts a replacement worker.
+            return await validator.validate(INPUT_FILES[1])
+
+    computed = asyncio.run(_run())
+    assert computed.conforms
+
+
+def test_validate_async_sampling() -> None:
+    """
+    This test confirms sampling arguments reach the worker's Validator.validate call.
+    """
+    computed = asyncio.run(
+        validate_async(INPUT_FILES[2], allow_infos=True, sample_size=1, sample_seed=1)
+    )
+    expected = validate(INPUT_FILES[2], allow_infos=True, sample_size=1, sample_seed=1)
+    assert expected.text == computed.text
+
+    with pytest.raises(TypeError):
+        AsyncValidator(sample_size=1)
+
+
+def test_async_validator_cancel_new_worker(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    This test confirms a worker process started for a validation that was cancelled meanwhile is terminated.
+    """
+    new_workers: typing.List[_Worker] = []
+    original_new_worker = AsyncValidator._new_worker
+
+    def _new_worker(self: AsyncValidator) -> _Worker:
+        time.sleep(0.5)
+        worker = original_new_worker(self)
+        new_workers.append(worker)
+        return worker
+
+    monkeypatch.setattr(AsyncValidator, "_new_worker", _new_worker)
+
+    async def _run() -> None:
+        async with AsyncValidator(max_workers=1) as validator:
+            task = asyncio.ensure_future(validator.validate(INPUT_FILES[1]))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(_run())
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if len(new_workers) == 1 and not new_workers[0]._process.is_alive():
+            break
+        time.sleep(0.1)
+    assert len(new_workers) == 1
+    assert not new_workers[0]._process.is_alive()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that cached validation results match uncached results, and that the cache is keyed on arguments affecting results.
+"""
+
+import logging
+import os
+import pathlib
+
+import pytest
+import rdflib.compare
+
+from case_utils.case_validate import validate
+from case_utils.case_validate.validate_cache import ValidationCache
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+input_file = str(case_validate_srcdir / "cli" / "errant_cdo_concept.ttl")
+
+
+def test_validation_cache(
+    caplog: pytest.LogCaptureFixture, tmp_path: pathlib.Path
+) -> None:
+    caplog.set_level(logging.DEBUG)
+    cache_dir = str(tmp_path / "cache")
+
+    expected = validate(input_file)
+    with pytest.warns(UserWarning):
+        computed_miss = validate(input_file, cache_dir=cache_dir)
+    assert "Validation cache miss" in caplog.text
+    assert "Validation cache hit" not in caplog.text
+
+    # The nonexistent-concept warnings are replayed on a cache hit.
+    with pytest.warns(UserWarning):
+        computed_hit = validate(input_file, cache_dir=cache_dir)
+    assert "Validation cache hit" in caplog.text
+
+    for computed in [computed_miss, computed_hit]:
+        assert expected.conforms == computed.conforms
+        assert expected.text == computed.text
+        assert expected.undefined_concepts == computed.undefined_concepts
+        assert isinstance(expected.graph, rdflib.Graph)
+        assert isinstance(computed.graph, rdflib.Graph)
+        assert rdflib.compare.isomorphic(expected.graph, computed.graph)
+
+    # allow_warnings affects conformance, so must not share the entry.
+    caplog.clear()
+    computed_allowing_warnings = validate(
+        input_file, allow_warnings=True, cache_dir=cache_dir
+    )
+    assert "Validation cache miss" in caplog.text
+    assert computed_allowing_warnings.conforms != expected.conforms
+
+    # Arguments that do not affect results share the entry.
+    caplog.clear()
+    validate(input_file, cache_dir=cache_dir, debug=True, prune_shapes=True)
+    assert "Validation cache hit" in caplog.text
+
+
+def test_validation_cache_eviction(tmp_path: pathlib.Path) -> None:
+    # Each entry is 52 bytes.
+    cache = ValidationCache(str(tmp_path), max_size=120)
+    cache.put("a", {"data": "x" * 40})
+    cache.put("b", {"data": "x" * 40})
+    # Make a more recently used than b, without depending on file system
+    # timestamp resolution.
+    os.utime(tmp_path / "a.json", (1500000000, 1500000000))
+    os.utime(tmp_path / "b.json", (1000000000, 1000000000))
+    # Storing c exceeds the limit, evicting the least recently used
+    # entry, b.
+    cache.put("c", {"data": "x" * 40})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
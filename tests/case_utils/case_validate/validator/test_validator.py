@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+"""
+These tests confirm that a reused Validator gives the same results as the validate function, including when called from multiple threads.
+"""
+
+import concurrent.futures
+import pathlib
+import typing
+import warnings
+
+import pytest
+import rdflib
+
+from case_utils.case_validate import Validator, validate
+from case_utils.case_validate.validate_types import NonExistentCDOConceptWarning
+
+srcdir = pathlib.Path(__file__).parent
+
+case_validate_srcdir = srcdir / ".."
+
+INPUT_FILES = [
+    str(case_validate_srcdir / "cli" / "errant_cdo_concept.ttl"),
+    str(case_validate_srcdir / "cli" / "thing.ttl"),
+    str(case_validate_srcdir / "shape_disabling" / "example.ttl"),
+    str(case_validate_srcdir / "type_materialization" / "blank_node.ttl"),
+    str(case_validate_srcdir / "type_materialization" / "example.ttl"),
+]
+
+
+def _messages(
+    warning_messages: typing.List[warnings.WarningMessage],
+) -> typing.List[str]:
+    return [
+        str(x.message)
+        for x in warning_messages
+        if not issubclass(x.category, DeprecationWarning)
+    ]
+
+
+@pytest.mark.parametrize("materialize_types", [False, True])
+def test_validator_reuse(materialize_types: bool) -> None:
+    validator = Validator(allow_infos=True, materialize_types=materialize_types)
+    for input_file in INPUT_FILES:
+        with warnings.catch_warnings(record=True) as computed_warnings:
+            warnings.simplefilter("always")
+            computed = validator.validate(input_file)
+        with warnings.catch_warnings(record=True) as expected_warnings:
+            warnings.simplefilter("always")
+            expected = validate(
+                input_file, allow_infos=True, materialize_types=materialize_types
+            )
+        assert expected.conforms == computed.conforms
+        assert expected.text == computed.text
+        assert expected.undefined_concepts == computed.undefined_concepts
+        assert _messages(expected_warnings) == _messages(computed_warnings)
+
+
+def test_validator_threads() -> None:
+    validator = Validator(allow_infos=True, prune_shapes=True)
+    with pytest.warns(NonExistentCDOConceptWarning):
+        expected = [validator.validate(input_file) for input_file in INPUT_FILES]
+
+    def _validate(input_file: str) -> typing.Tuple[bool, str]:
+        validation_result = validator.validate(input_file, max_results=1)
+        return validation_result.conforms, validation_result.text
+
+    with pytest.warns(NonExistentCDOConceptWarning):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            computed = list(executor.map(_validate, INPUT_FILES * 3))
+    for i, (conforms, text) in enumerate(computed):
+        assert expected[i % len(INPUT_FILES)].conforms == conforms
+        if expected[i % len(INPUT_FILES)].conforms:
+            assert expected[i % len(INPUT_FILES)].text == text
+
+
+def test_validator_graph_unmodified() -> None:
+    data_graph = rdflib.Graph()
+    data_graph.parse(INPUT_FILES[-1])
+    n_triples = len(data_graph)
+
+    validator = Validator(allow_infos=True, materialize_types=True)
+    computed = validator.validate(data_graph)
+    expected = validate(INPUT_FILES[-1], allow_infos=True)
+
+    assert len(data_graph) == n_triples
+    assert expected.conforms == computed.conforms
+    assert expected.text == computed.text
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+import importlib.resources
+import typing
+
+import pytest
+import rdflib
+
+import case_utils.ontology
+from case_utils.case_validate.validate_utils import disable_tbox_review
+from case_utils.ontology.version_info import (
+    CURRENT_CASE_VERSION,
+    built_version_choices_list,
+)
+
+NS_RDF = rdflib.RDF
+NS_SH = rdflib.SH
+
+
+def _abox_versions() -> typing.List[str]:
+    return sorted(
+        x
+        for x in built_version_choices_list
+        if x != "none"
+        and importlib.resources.files(case_utils.ontology)
+        .joinpath(x + "-abox.ttl")
+        .is_file()
+    )
+
+
+def _load(ttl_filename: str) -> rdflib.Graph:
+    graph = rdflib.Graph()
+    graph.parse(
+        data=importlib.resources.files(case_utils.ontology)
+        .joinpath(ttl_filename)
+        .read_text(),
+        format="turtle",
+    )
+    return graph
+
+
+def test_abox_variants_present() -> None:
+    assert "case-" + CURRENT_CASE_VERSION in _abox_versions()
+
+
+@pytest.mark.parametrize("built_version", _abox_versions())
+def test_abox_variant_omits_tbox_review(built_version: str) -> None:
+    """
+    Each TBox-review shape in the ABox-only variant is reduced to its typing and any path, and deactivated.  All other statements of the ABox-only variant are from the full ontology.
+    """
+    deactivation_graph = rdflib.Graph()
+    disable_tbox_review(deactivation_graph)
+    n_tbox_shapes = set(deactivation_graph.subjects())
+
+    full_graph = _load(built_version + ".ttl")
+    abox_graph = _load(built_version + "-abox.ttl")
+    assert len(abox_graph) < len(full_graph)
+
+    for n_tbox_shape in n_tbox_shapes:
+        if (n_tbox_shape, None, None) not in abox_graph:
+            continue
+        assert (n_tbox_shape, NS_SH.deactivated, rdflib.Literal(True)) in abox_graph
+        assert set(abox_graph.predicates(n_tbox_shape)) <= {
+            NS_RDF.type,
+            NS_SH.deactivated,
+            NS_SH.path,
+        }
+
+    full_iri_triples = {
+        triple
+        for triple in full_graph
+        if not any(isinstance(x, rdflib.BNode) for x in triple)
+    }
+    for triple in abox_graph:
+        if any(isinstance(x, rdflib.BNode) for x in triple):
+            continue
+        if triple[0] in n_tbox_shapes and triple[1] == NS_SH.deactivated:
+            continue
+        assert triple in full_iri_triples
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+import pytest
+import rdflib
+
+import case_utils.ontology
+from case_utils.namespace import NS_RDF, NS_RDFS, NS_UCO_CORE, NS_UCO_OBSERVABLE
+
+NS_KB = rdflib.Namespace("http://example.org/kb/")
+
+QUERY_TEXT = """\
+SELECT ?nObject
+WHERE {
+  ?nObject a/rdfs:subClassOf* uco-core:UcoObject .
+}
+"""
+
+
+def test_subclass_hierarchy_view() -> None:
+    """
+    This test confirms querying the view gets the same results as querying a copy of the graph with the subclass hierarchy loaded, without modifying the graph.
+    """
+    graph = rdflib.Graph()
+    graph.bind("uco-core", NS_UCO_CORE)
+    graph.add((NS_KB["file-1"], NS_RDF.type, NS_UCO_OBSERVABLE.File))
+    graph.add((NS_KB["object-1"], NS_RDF.type, NS_UCO_OBSERVABLE.ObservableObject))
+    graph.add((NS_KB["thing-1"], NS_RDF.type, NS_KB.Thing))
+    # A statement also in the subclass hierarchy is not duplicated.
+    graph.add(
+        (NS_UCO_OBSERVABLE.ObservableObject, NS_RDFS.subClassOf, NS_UCO_CORE.Item)
+    )
+    n_triples = len(graph)
+
+    expected_graph = rdflib.Graph()
+    expected_graph += graph
+    case_utils.ontology.load_subclass_hierarchy(expected_graph)
+    expected = sorted(expected_graph.query(QUERY_TEXT, initNs=dict(graph.namespaces())))
+
+    view = case_utils.ontology.subclass_hierarchy_view(graph)
+    computed = sorted(view.query(QUERY_TEXT, initNs=dict(graph.namespaces())))
+
+    assert len(expected) == 2
+    assert expected == computed
+    assert len(expected_graph) == len(view)
+    assert len(graph) == n_triples
+
+    with pytest.raises(NotImplementedError):
+        view.add((NS_KB["thing-1"], NS_RDF.type, NS_KB.OtherThing))
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+import json
+import pathlib
+import subprocess
+import sys
+
+import pytest
+import rdflib
+from rdflib.compare import isomorphic
+
+from case_utils.case_pipeline import load_pipeline, run_pipeline
+from case_utils.case_sparql_construct import graph_and_query_to_graph
+from case_utils.case_sparql_select import (
+    data_frame_to_table_text,
+    graph_and_query_to_data_frame,
+)
+
+srcdir = pathlib.Path(__file__).parent
+
+NS_PROV = rdflib.Namespace("http://www.w3.org/ns/prov#")
+
+
+def test_run_pipeline(tmp_path: pathlib.Path) -> None:
+    """
+    This test confirms a pipeline's steps produce the same graphs and tables as the separate tools, and that steps do not modify the graphs they read.
+    """
+    construct_dir = srcdir / "case_sparql_construct"
+    select_dir = srcdir / "case_sparql_select"
+    validate_dir = srcdir / "case_validate" / "cli"
+    pipeline_path = tmp_path / "pipeline.json"
+    with pipeline_path.open("w") as out_fh:
+        json.dump(
+            {
+                "graphs": {
+                    "data": str(construct_dir / "subclass.json"),
+                    # The split data graphs only conform together.
+                    "evidence": [
+                        str(validate_dir / "split_data_graph_1.json"),
+                        str(validate_dir / "split_data_graph_2.json"),
+                    ],
+                },
+                "steps": [
+                    {
+                        "type": "construct",
+                        "graph": "data",
+                        "query": str(construct_dir / "subclass.sparql"),
+                        "name": "entities",
+                        "output": "entities.ttl",
+                    },
+                    {"type": "validate", "graph": "evidence", "output": "report.txt"},
+                    {
+                        "type": "select",
+                        "graph": "data",
+                        "query": str(select_dir / "subclass.sparql"),
+                        "output": "files.md",
+                    },
+                ],
+            },
+            out_fh,
+        )
+
+    pipeline_result = run_pipeline(
+        load_pipeline(str(pipeline_path)), base_dir=str(tmp_path)
+    )
+
+    data_graph = rdflib.Graph()
+    data_graph.parse(str(construct_dir / "subclass.json"))
+    assert isomorphic(data_graph, pipeline_result.graphs["data"])
+
+    expected_graph = graph_and_query_to_graph(
+        data_graph, (construct_dir / "subclass.sparql").read_text()
+    )
+    assert len(expected_graph) == 2
+    assert set(expected_graph.objects(None, rdflib.RDF.type)) == {NS_PROV.Entity}
+    assert isomorphic(expected_graph, pipeline_result.graphs["entities"])
+    computed_graph = rdflib.Graph()
+    computed_graph.parse(str(tmp_path / "entities.ttl"))
+    assert isomorphic(expected_graph, computed_graph)
+
+    assert pipeline_result.conforms
+    assert (
+        (tmp_path / "report.txt")
+        .read_text()
+        .startswith("Validation Report\nConforms: True\n")
+    )
+
+    expected_df = graph_and_query_to_data_frame(
+        data_graph, (select_dir / "subclass.sparql").read_text()
+    )
+    assert expected_df.equals(pipeline_result.data_frames[0])
+    expected_table_text = data_frame_to_table_text(
+        expected_df,
+        json_orient="columns",
+        output_mode="md",
+        use_header=True,
+        use_index=True,
+    )
+    assert (tmp_path / "files.md").read_text() == expected_table_text + "\n"
+
+
+def test_run_pipeline_unknown_graph(tmp_path: pathlib.Path) -> None:
+    """
+    This test confirms a step reading a graph not yet defined fails before any step runs.
+    """
+    with pytest.raises(ValueError):
+        run_pipeline(
+            {
+                "graphs": {
+                    "data": str(srcdir / "case_sparql_select" / "subclass.json")
+                },
+                "steps": [
+                    {
+                        "type": "construct",
+                        "graph": "data",
+                        "query": str(
+                            srcdir / "case_sparql_construct" / "subclass.sparql"
+                        ),
+                        "name": "entities",
+                        "output": "entities.ttl",
+                    },
+                    {"type": "validate", "graph": "entitties"},
+                ],
+            },
+            base_dir=str(tmp_path),
+        )
+    assert not (tmp_path / "entities.ttl").exists()
+
+
+def test_run_pipeline_streaming_without_pandas(tmp_path: pathlib.Path) -> None:
+    """
+    This test confirms a pipeline whose select steps are streamed runs without importing pandas.  The pipeline runs in a new interpreter, as other tests import pandas.
+    """
+    pipeline_path = tmp_path / "pipeline.json"
+    with pipeline_path.open("w") as out_fh:
+        json.dump(
+            {
+                "graphs": {
+                    "data": str(srcdir / "case_sparql_construct" / "subclass.json")
+                },
+                "steps": [
+                    {
+                        "type": "select",
+                        "graph": "data",
+                        "query": str(srcdir / "case_sparql_select" / "subclass.sparql"),
+                        "output": "files.jsonl",
+                    },
+                ],
+            },
+            out_fh,
+        )
+
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "from case_utils.case_pipeline import load_pipeline, run_pipeline\n"
+            "run_pipeline(load_pipeline(sys.argv[1]), base_dir=sys.argv[2])\n"
+            'assert "pandas" not in sys.modules\n',
+            str(pipeline_path),
+            str(tmp_path),
+        ],
+        check=True,
+    )
+    assert len((tmp_path / "files.jsonl").read_text().splitlines()) > 0
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+import argparse
+import importlib.util
+import pathlib
+import subprocess
+import sys
+
+import pytest
+import rdflib
+from rdflib.compare import isomorphic
+
+from case_utils.file_compression import FileType, open_file
+from case_utils.graph_loading import parse_graph
+from case_utils.jsonld_serialization import serialize_jsonld
+
+srcdir = pathlib.Path(__file__).parent
+
+NS_KB = rdflib.Namespace("http://example.org/kb/")
+
+ZSTD_AVAILABLE = (
+    importlib.util.find_spec("zstandard") is not None
+    or importlib.util.find_spec("compression") is not None
+)
+
+COMPRESSION_EXTENSIONS = [
+    ".bz2",
+    ".gz",
+    ".xz",
+    pytest.param(
+        ".zst",
+        marks=pytest.mark.skipif(
+            not ZSTD_AVAILABLE, reason="Zstandard support not available."
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("compression_extension", COMPRESSION_EXTENSIONS)
+@pytest.mark.parametrize(
+    "format_extension, rdf_format",
+    [(".json", "json-ld"), (".nt", "nt"), (".ttl", "turtle")],
+)
+def test_parse_graph(
+    tmp_path: pathlib.Path,
+    format_extension: str,
+    rdf_format: str,
+    compression_extension: str,
+) -> None:
+    """
+    This test confirms a compressed graph file parses to the same graph as the uncompressed file, with the format guessed from the inner extension.
+    """
+    expected = rdflib.Graph()
+    expected.parse(
+        str(srcdir / "case_validate" / "cli" / "split_data_graph_1.json"),
+        format="json-ld",
+    )
+    uncompressed_path = tmp_path / ("graph" + format_extension)
+    expected.serialize(str(uncompressed_path), format=rdf_format)
+
+    compressed_path = tmp_path / ("graph" + format_extension + compression_extension)
+    with open_file(str(compressed_path), "wb") as out_fh:
+        out_fh.write(uncompressed_path.read_bytes())
+
+    computed = parse_graph(rdflib.Graph(), str(compressed_path))
+    assert isomorphic(expected, computed)
+
+
+@pytest.mark.parametrize("compression_extension", COMPRESSION_EXTENSIONS)
+def test_serialize_jsonld(tmp_path: pathlib.Path, compression_extension: str) -> None:
+    graph = rdflib.Graph()
+    graph.add((NS_KB["thing-1"], NS_KB.name, rdflib.Literal("é")))
+    graph.add((NS_KB["thing-2"], NS_KB.name, rdflib.Literal("2")))
+    context = {"kb": str(NS_KB)}
+
+    out_path = tmp_path / ("graph.jsonld" + compression_extension)
+    serialize_jsonld(graph, str(out_path), context)
+
+    # The file is not readable without decompression.
+    with pytest.raises(UnicodeDecodeError):
+        out_path.read_text(encoding="utf-8")
+    assert isomorphic(graph, parse_graph(rdflib.Graph(), str(out_path)))
+
+
+def test_file_type(tmp_path: pathlib.Path) -> None:
+    """
+    This test confirms the argument type compresses text written to a new file, and, as argparse.FileType("x") does, fails if the file exists.
+    """
+    out_path = tmp_path / "report.txt.gz"
+    with FileType("x")(str(out_path)) as out_fh:
+        out_fh.write("Conforms: True\n")
+    with open_file(str(out_path)) as in_fh:
+        assert in_fh.read() == "Conforms: True\n"
+
+    with pytest.raises(argparse.ArgumentTypeError):
+        FileType("x")(str(out_path))
+
+
+def test_pipeline(tmp_path: pathlib.Path) -> None:
+    """
+    This test confirms a graph written to standard output by one command line tool is read from standard input by another.
+    """
+    # The split data graphs only conform together.
+    data_paths = [
+        srcdir / "case_validate" / "cli" / "split_data_graph_1.json",
+        srcdir / "case_validate" / "cli" / "split_data_graph_2.json",
+    ]
+    query_path = tmp_path / "query.sparql"
+    query_path.write_text("CONSTRUCT { ?s ?p ?o } WHERE { ?s ?p ?o }\n")
+
+    construct_process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from case_utils.case_sparql_construct import main; main()",
+            "--output-format",
+            "nt",
+            "-",
+            str(query_path),
+        ]
+        + [str(data_path) for data_path in data_paths],
+        check=True,
+        stdout=subprocess.PIPE,
+    )
+    validate_process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from case_utils.case_validate import main; main()",
+            "--input-format",
+            "nt",
+            "--format",
+            "turtle",
+            "-",
+        ],
+        check=True,
+        input=construct_process.stdout,
+        stdout=subprocess.PIPE,
+    )
+
+    expected = rdflib.Graph()
+    for data_path in data_paths:
+        expected.parse(str(data_path), format="json-ld")
+    computed = rdflib.Graph()
+    computed.parse(data=construct_process.stdout, format="nt")
+    assert isomorphic(expected, computed)
+
+    report = rdflib.Graph()
+    report.parse(data=validate_process.stdout, format="turtle")
+    assert (None, rdflib.SH.conforms, rdflib.Literal(True)) in report
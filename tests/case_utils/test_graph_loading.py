@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+import pathlib
+
+import pytest
+import rdflib
+from rdflib.compare import isomorphic
+
+import case_utils.graph_loading
+from case_utils.graph_loading import parse_graphs
+
+srcdir = pathlib.Path(__file__).parent
+
+INPUT_FILES = [
+    str(srcdir / "case_validate" / "cli" / "split_data_graph_1.json"),
+    str(srcdir / "case_validate" / "cli" / "split_data_graph_2.json"),
+    str(srcdir / "case_sparql_select" / "w3-input-2.ttl"),
+    str(srcdir / "case_sparql_select" / "w3-input-3.json"),
+]
+
+
+def test_parse_graphs_parallel(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    This test confirms that parsing in worker processes gives the same triples and prefix bindings as parsing files one after another.
+    """
+    monkeypatch.setattr(case_utils.graph_loading, "PARALLEL_MIN_BYTES", 0)
+
+    expected = rdflib.Graph()
+    for input_file in INPUT_FILES:
+        expected.parse(input_file)
+
+    computed = parse_graphs(rdflib.Graph(), INPUT_FILES, max_workers=2)
+
+    assert isomorphic(expected, computed)
+    assert sorted(expected.namespaces()) == sorted(computed.namespaces())
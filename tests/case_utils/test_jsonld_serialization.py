@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+import json
+import pathlib
+import typing
+
+import pytest
+import rdflib
+from rdflib.compare import isomorphic
+
+from case_utils.jsonld_serialization import serialize_jsonld
+from case_utils.namespace import NS_UCO_CORE, NS_UCO_TYPES, NS_UCO_VOCABULARY, NS_XSD
+
+NS_KB = rdflib.Namespace("http://example.org/kb/")
+
+
+def _sorted_json(value: typing.Any) -> typing.Any:
+    """
+    :return: The JSON value, with arrays sorted, as the order of node objects and of multiple values is not significant.
+    """
+    if isinstance(value, dict):
+        return {k: _sorted_json(v) for (k, v) in value.items()}
+    if isinstance(value, list):
+        return sorted(
+            (_sorted_json(x) for x in value),
+            key=lambda x: json.dumps(x, sort_keys=True),
+        )
+    return value
+
+
+def _graph(n_nodes: int) -> rdflib.Graph:
+    graph = rdflib.Graph()
+    graph.bind("kb", NS_KB)
+    graph.bind("types", NS_UCO_TYPES)
+    graph.bind("uco-core", NS_UCO_CORE)
+    graph.bind("vocabulary", NS_UCO_VOCABULARY)
+    for node_no in range(n_nodes):
+        n_hash = NS_KB["Hash-%d" % node_no]
+        graph.add((n_hash, rdflib.RDF.type, NS_UCO_TYPES.Hash))
+        graph.add((n_hash, rdflib.RDF.type, NS_UCO_CORE.UcoObject))
+        graph.add(
+            (
+                n_hash,
+                NS_UCO_TYPES.hashMethod,
+                rdflib.Literal("SHA256", datatype=NS_UCO_VOCABULARY.HashNameVocab),
+            )
+        )
+        graph.add(
+            (
+                n_hash,
+                NS_UCO_TYPES.hashValue,
+                rdflib.Literal("A" * 64, datatype=NS_XSD.hexBinary),
+            )
+        )
+        graph.add((n_hash, NS_UCO_CORE.description, rdflib.Literal("é", lang="fr")))
+        graph.add((n_hash, NS_UCO_CORE.description, rdflib.Literal("1")))
+        # rdflib's serializer drops values equal in Python, e.g. 1 and true.
+        graph.add((n_hash, NS_UCO_CORE.tag, rdflib.Literal(node_no + 2)))
+        graph.add((n_hash, NS_UCO_CORE.tag, rdflib.Literal(True)))
+        graph.add((n_hash, NS_UCO_CORE.tag, rdflib.Literal(1.5)))
+        n_facet = rdflib.BNode()
+        graph.add((n_hash, NS_UCO_CORE.hasFacet, n_facet))
+        graph.add((n_facet, NS_UCO_CORE.name, rdflib.Literal("x")))
+    return graph
+
+
+@pytest.mark.parametrize("n_nodes", [0, 1, 3])
+def test_serialize_jsonld(tmp_path: pathlib.Path, n_nodes: int) -> None:
+    """
+    This test confirms the JSON-LD is the same as rdflib's, with the same context, other than the order of arrays.
+    """
+    graph = _graph(n_nodes)
+    if n_nodes == 1:
+        # Leave a single node object.
+        for triple in list(graph.triples((None, NS_UCO_CORE.hasFacet, None))):
+            graph.remove(triple)
+            graph.remove((triple[2], None, None))
+    context = {k: str(v) for (k, v) in graph.namespace_manager.namespaces()}
+
+    expected_path = tmp_path / "expected.json"
+    computed_path = tmp_path / "computed.json"
+    graph.serialize(str(expected_path), format="json-ld", context=context)
+    serialize_jsonld(graph, str(computed_path), context)
+
+    with expected_path.open() as in_fh:
+        expected = json.load(in_fh)
+    with computed_path.open() as in_fh:
+        computed = json.load(in_fh)
+    assert _sorted_json(expected) == _sorted_json(computed)
+
+    computed_graph = rdflib.Graph()
+    computed_graph.parse(str(computed_path), format="json-ld")
+    assert isomorphic(graph, computed_graph)
+
+    # Output is repeatable.
+    serialize_jsonld(graph, str(tmp_path / "repeated.json"), context)
+    assert computed_path.read_text() == (tmp_path / "repeated.json").read_text()
+
+
+def test_serialize_jsonld_shared_store(tmp_path: pathlib.Path) -> None:
+    """
+    This test confirms a graph is written the same when its store also holds another graph.
+    """
+    graph = _graph(3)
+    context = {k: str(v) for (k, v) in graph.namespace_manager.namespaces()}
+
+    expected_path = tmp_path / "expected.json"
+    serialize_jsonld(graph, str(expected_path), context)
+
+    other_graph = rdflib.Graph(store=graph.store, identifier=NS_KB["graph-1"])
+    other_graph.add((NS_KB["thing-1"], NS_UCO_CORE.name, rdflib.Literal("1")))
+
+    computed_path = tmp_path / "computed.json"
+    serialize_jsonld(graph, str(computed_path), context)
+
+    assert expected_path.read_text() == computed_path.read_text()
+
+
+def test_serialize_jsonld_bnode_objects(tmp_path: pathlib.Path) -> None:
+    """
+    This test confirms blank nodes that are only objects are written as node objects, as rdflib writes them, and the JSON-LD reads back as the same graph.
+    """
+    graph = rdflib.Graph()
+    graph.bind("kb", NS_KB)
+    graph.bind("uco-core", NS_UCO_CORE)
+    graph.add((NS_KB["thing-1"], NS_UCO_CORE.hasFacet, rdflib.BNode()))
+    graph.add((NS_KB["thing-1"], rdflib.RDF.type, rdflib.BNode()))
+    graph.add((rdflib.BNode(), NS_UCO_CORE.hasFacet, rdflib.BNode()))
+    context = {k: str(v) for (k, v) in graph.namespace_manager.namespaces()}
+
+    expected_path = tmp_path / "expected.json"
+    computed_path = tmp_path / "computed.json"
+    graph.serialize(str(expected_path), format="json-ld", context=context)
+    serialize_jsonld(graph, str(computed_path), context)
+
+    with expected_path.open() as in_fh:
+        expected = json.load(in_fh)
+    with computed_path.open() as in_fh:
+        computed = json.load(in_fh)
+    assert _sorted_json(expected) == _sorted_json(computed)
+
+    computed_graph = rdflib.Graph()
+    computed_graph.parse(str(computed_path), format="json-ld")
+    assert isomorphic(graph, computed_graph)
+
+
+def test_serialize_jsonld_list(tmp_path: pathlib.Path) -> None:
+    """
+    This test confirms graphs with RDF lists are written by rdflib.
+    """
+    graph = rdflib.Graph()
+    graph.bind("kb", NS_KB)
+    rdflib.collection.Collection(
+        graph, rdflib.BNode(), [rdflib.Literal(1), rdflib.Literal(2)]
+    )
+    graph.add((NS_KB["thing-1"], NS_KB.items, next(iter(graph.subjects()))))
+    context = {k: str(v) for (k, v) in graph.namespace_manager.namespaces()}
+
+    expected_path = tmp_path / "expected.json"
+    computed_path = tmp_path / "computed.json"
+    graph.serialize(str(expected_path), format="json-ld", context=context)
+    serialize_jsonld(graph, str(computed_path), context)
+
+    assert expected_path.read_text() == computed_path.read_text()
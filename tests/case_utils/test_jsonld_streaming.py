@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+import json
+import pathlib
+import typing
+
+import pytest
+import rdflib
+from rdflib.compare import isomorphic
+from rdflib.plugins.stores.memory import Memory
+
+import case_utils.jsonld_streaming
+from case_utils.jsonld_streaming import parse_jsonld
+
+srcdir = pathlib.Path(__file__).parent
+
+NS_KB = rdflib.Namespace("http://example.org/kb/")
+
+CONTEXT = {
+    "kb": "http://example.org/kb/",
+    "uco-core": "https://ontology.unifiedcyberontology.org/uco/core/",
+}
+
+
+@pytest.mark.parametrize(
+    "input_file",
+    [
+        srcdir / "case_validate" / "cli" / "split_data_graph_1.json",
+        srcdir / "case_sparql_select" / "w3-input-3.json",
+    ],
+)
+def test_parse_jsonld_files(
+    monkeypatch: pytest.MonkeyPatch, input_file: pathlib.Path
+) -> None:
+    """
+    This test confirms that reading a file in small steps gives the same triples and prefix bindings as rdflib's parser.
+    """
+    monkeypatch.setattr(case_utils.jsonld_streaming, "CHUNK_SIZE", 7)
+
+    expected = rdflib.Graph()
+    expected.parse(str(input_file), format="json-ld")
+
+    computed = parse_jsonld(rdflib.Graph(), str(input_file))
+
+    assert isomorphic(expected, computed)
+    assert sorted(expected.namespaces()) == sorted(computed.namespaces())
+
+
+def _named_graphs(
+    graph: rdflib.Graph,
+) -> typing.Dict[rdflib.term.Node, typing.Set[typing.Any]]:
+    """
+    :return: The triples of the IRI-named graphs in the graph's store.
+    """
+    return {
+        context.identifier: set(context)
+        for context in graph.store.contexts()
+        if isinstance(context.identifier, rdflib.URIRef)
+    }
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        # Top-level array.
+        [
+            {"@context": CONTEXT, "@id": "kb:thing-1", "uco-core:name": "1"},
+            {"@id": "http://example.org/kb/thing-2", "@type": "uco-core:UcoObject"},
+        ],
+        # @graph with nested nodes and typed values.
+        {
+            "@context": CONTEXT,
+            "@graph": [
+                {
+                    "@id": "kb:thing-1",
+                    "uco-core:hasFacet": {"uco-core:name": 1.5},
+                    "uco-core:description": {"@value": "1", "@language": "en"},
+                },
+                {"@id": "_:b1", "uco-core:object": {"@id": "kb:thing-1"}},
+            ],
+        },
+        # A node object naming a graph.
+        {
+            "@context": CONTEXT,
+            "@graph": [
+                {"@id": "kb:thing-1", "uco-core:name": "1"},
+                {
+                    "@id": "kb:named-graph",
+                    "@graph": [{"@id": "kb:thing-2", "uco-core:name": "2"}],
+                },
+            ],
+        },
+        {"@context": CONTEXT, "@graph": []},
+        # Layouts read with rdflib, which still keep triples already in
+        # the graph.
+        {"@graph": [{"@id": "kb:thing-1", "uco-core:name": "1"}], "@context": CONTEXT},
+        {
+            "@context": CONTEXT,
+            "@graph": [
+                {"@id": "kb:thing-0", "uco-core:name": "0"},
+                {"@id": "kb:thing-1", "uco-core:name": "1"},
+            ],
+            "@id": "kb:named-graph",
+        },
+        {"@context": CONTEXT, "@id": "kb:thing-1", "uco-core:name": "1"},
+    ],
+)
+def test_parse_jsonld_layouts(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, document: typing.Any
+) -> None:
+    monkeypatch.setattr(case_utils.jsonld_streaming, "CHUNK_SIZE", 7)
+    monkeypatch.setattr(case_utils.jsonld_streaming, "NODES_PER_PARSE", 1)
+    input_file = str(tmp_path / "input.json")
+    with open(input_file, "w") as out_fh:
+        json.dump(document, out_fh, indent=4)
+
+    for initial_triples in [
+        [],
+        [
+            (
+                NS_KB["thing-0"],
+                rdflib.URIRef(CONTEXT["uco-core"] + "name"),
+                rdflib.Literal("0"),
+            )
+        ],
+    ]:
+        expected = rdflib.Graph()
+        computed = rdflib.Graph()
+        for triple in initial_triples:
+            expected.add(triple)
+            computed.add(triple)
+        expected.parse(input_file, format="json-ld")
+        parse_jsonld(computed, input_file)
+        assert isomorphic(expected, computed)
+        assert sorted(expected.namespaces()) == sorted(computed.namespaces())
+        assert _named_graphs(expected) == _named_graphs(computed)
+
+
+class _GraphUnawareMemory(Memory):
+    graph_aware = False
+
+
+def test_parse_jsonld_graph_unaware_store() -> None:
+    """
+    This test confirms that a store that rdflib.Dataset cannot use is loaded with rdflib's parser.
+    """
+    input_file = str(srcdir / "case_validate" / "cli" / "split_data_graph_1.json")
+
+    expected = rdflib.Graph()
+    expected.parse(input_file, format="json-ld")
+
+    computed = parse_jsonld(rdflib.Graph(store=_GraphUnawareMemory()), input_file)
+
+    assert isomorphic(expected, computed)
+
+
+class _FixedDefaultGraphDataset(rdflib.Dataset):
+    default_graph = None
+
+
+def test_parse_jsonld_fixed_default_graph(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    This test confirms that with an rdflib release whose Dataset default graph cannot be set, documents are loaded with rdflib's parser.
+    """
+    input_file = str(srcdir / "case_validate" / "cli" / "split_data_graph_1.json")
+
+    expected = rdflib.Graph()
+    expected.parse(input_file, format="json-ld")
+
+    monkeypatch.setattr(rdflib, "Dataset", _FixedDefaultGraphDataset)
+    computed = parse_jsonld(rdflib.Graph(), input_file)
+
+    assert isomorphic(expected, computed)
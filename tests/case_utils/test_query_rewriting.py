@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+# Portions of this file contributed by NIST are governed by the following
+# statement:
+#
+# This software was developed at the National Institute of Standards
+# and Technology by employees of the Federal Government in the course
+# of their official duties. Pursuant to Title 17 Section 105 of the
+# United States Code, this software is not subject to copyright
+# protection within the United States. NIST assumes no responsibility
+# whatsoever for its use by other parties, and makes no guarantees,
+# expressed or implied, about its quality, reliability, or any other
+# characteristic.
+#
+# We would appreciate acknowledgement if the software is used.
+
+from typing import List, Tuple
+
+import pytest
+import rdflib
+from rdflib.plugins.sparql.processor import prepareQuery
+
+import case_utils.ontology
+from case_utils.namespace import NS_RDF, NS_RDFS, NS_UCO_CORE, NS_UCO_OBSERVABLE
+from case_utils.query_rewriting import rewrite_subclass_paths
+
+NS_KB = rdflib.Namespace("http://example.org/kb/")
+
+INIT_NS = {
+    "kb": NS_KB,
+    "uco-core": NS_UCO_CORE,
+    "uco-observable": NS_UCO_OBSERVABLE,
+}
+
+
+def _graph() -> rdflib.Graph:
+    graph = rdflib.Graph()
+    graph.add((NS_KB["file-1"], NS_RDF.type, NS_UCO_OBSERVABLE.File))
+    graph.add((NS_KB["file-1"], NS_RDF.type, NS_UCO_OBSERVABLE.ObservableObject))
+    graph.add((NS_KB["object-1"], NS_RDF.type, NS_UCO_OBSERVABLE.ObservableObject))
+    graph.add((NS_KB["thing-1"], NS_RDF.type, NS_KB.Thing))
+    graph.add((NS_KB["file-1"], NS_KB.name, rdflib.Literal("file-1")))
+    return graph
+
+
+def _query(
+    graph: rdflib.Graph, query_text: str, rewrite: bool
+) -> List[Tuple[str, ...]]:
+    query = prepareQuery(query_text, initNs=INIT_NS)
+    n_rewritten = rewrite_subclass_paths(query, graph) if rewrite else 0
+    assert n_rewritten == (1 if rewrite else 0)
+    view = case_utils.ontology.subclass_hierarchy_view(graph)
+    rows = []
+    for row in view.query(query):
+        assert isinstance(row, tuple)
+        rows.append(tuple(str(value) for value in row))
+    return rows
+
+
+@pytest.mark.parametrize(
+    "query_text",
+    [
+        # The file has two matching types, so it is in two rows.
+        "SELECT ?x WHERE { ?x a/rdfs:subClassOf* uco-core:UcoObject . }",
+        "SELECT * WHERE { ?x kb:name ?name . ?x a/rdfs:subClassOf* uco-observable:File . }",
+        "SELECT ?x WHERE { ?x a/rdfs:subClassOf* kb:Thing . }",
+        "SELECT ?name WHERE { kb:file-1 kb:name ?name ; a/rdfs:subClassOf* uco-core:UcoObject . }",
+        "SELECT (COUNT(*) AS ?n) WHERE { ?x a/rdfs:subClassOf* uco-core:Item . }",
+    ],
+)
+def test_rewrite_subclass_paths(query_text: str) -> None:
+    """
+    This test confirms rewritten queries get the same results, in the same order, as queries following the subclass hierarchy.
+    """
+    graph = _graph()
+    expected = _query(graph, query_text, False)
+    assert len(expected) > 0
+    assert expected == _query(graph, query_text, True)
+
+
+def test_rewrite_subclass_paths_graph_hierarchy() -> None:
+    """
+    This test confirms a query is not rewritten for a graph with its own subclass statements, which the bundled closure does not follow.
+    """
+    graph = _graph()
+    graph.add((NS_KB.Thing, NS_RDFS.subClassOf, NS_UCO_CORE.UcoObject))
+    query = prepareQuery(
+        "SELECT ?x WHERE { ?x a/rdfs:subClassOf* uco-core:UcoObject . }",
+        initNs=INIT_NS,
+    )
+    assert rewrite_subclass_paths(query, graph) == 0
+    assert rewrite_subclass_paths(query, _graph(), built_version="none") == 0